@@ -5,17 +5,31 @@
 
     :license: MIT, see LICENSE for more details.
 """
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import time
 
 from .consts import API_PUBLIC_ENDPOINT, API_PRIVATE_ENDPOINT, USER_AGENT
-from .transports import make_xml_rpc_api_call
+from .transports import (
+    make_session, Request, TRANSPORTS, DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE)
+# Kept importable from SoftLayer.API for backwards compatibility
+from .transports import make_xml_rpc_api_call  # NOQA
 from .auth import TokenAuthentication
 from .config import get_client_settings
+from .masks import format_mask
+from .paging import get_paging
+from .records import compact
+from .utils import Filter
 
 
-__all__ = ['Client', 'TimedClient', 'API_PUBLIC_ENDPOINT',
+__all__ = ['Client', 'TimedClient', 'Batch', 'API_PUBLIC_ENDPOINT',
            'API_PRIVATE_ENDPOINT']
 
+FALSE_VALUES = ['0', 'false', 'no', 'off']
+
+DEFAULT_BATCH_WORKERS = 10
+
 VALID_CALL_ARGS = set([
     'id',
     'mask',
@@ -25,6 +39,11 @@ VALID_CALL_ARGS = set([
     'raw_headers',
     'limit',
     'offset',
+    'stream',
+    'compact',
+    'instrumentation',
+    'deadline',
+    'cache',
 ])
 
 
@@ -43,6 +62,31 @@ class Client(object):
     :param auth: an object which responds to get_headers() to be inserted into
         the xml-rpc headers. Example: `BasicAuthentication`
     :param config_file: A path to a configuration file used to load settings
+    :param integer pool_connections: number of per-host connection pools the
+        client keeps open
+    :param integer pool_maxsize: maximum number of connections kept open to
+        a single host. Raise this when sharing a client between many threads.
+    :param bool keep_alive: set to False to close the connection after each
+        API call instead of reusing it
+    :param transport: how API calls are made. Either 'xmlrpc' (the default),
+        'rest' or a callable that takes a :class:`SoftLayer.transports.Request`
+        and returns the result, like
+        :class:`SoftLayer.transports.XmlRpcTransport`.
+    :param cache: an optional :class:`SoftLayer.cache.ResponseCache` that
+        answers repeated read-only calls without going to the API
+    :param rate_limiter: an optional
+        :class:`SoftLayer.ratelimit.RateLimiter` that limits the rate and
+        concurrency of the calls made. It can be shared between clients.
+    :param retry_policy: an optional :class:`SoftLayer.retry.RetryPolicy`
+        that retries calls failing with transient errors
+    :param singleflight: an optional :class:`SoftLayer.cache.SingleFlight`
+        that lets identical concurrent calls share a single request
+    :param instrumentation: an optional
+        :class:`SoftLayer.instrumentation.Instrumentation` whose hooks are
+        called during each phase of every call
+    :param deadline: an optional :class:`SoftLayer.deadline.Deadline`. No
+        calls are made once it expires and request timeouts are shrunk to
+        the time left.
 
     Usage:
 
@@ -56,7 +100,11 @@ class Client(object):
     _prefix = "SoftLayer_"
 
     def __init__(self, username=None, api_key=None, endpoint_url=None,
-                 timeout=None, auth=None, config_file=None, proxy=None):
+                 timeout=None, auth=None, config_file=None, proxy=None,
+                 pool_connections=None, pool_maxsize=None, keep_alive=None,
+                 transport=None, cache=None, rate_limiter=None,
+                 retry_policy=None, singleflight=None, instrumentation=None,
+                 deadline=None):
 
         settings = get_client_settings(username=username,
                                        api_key=api_key,
@@ -64,10 +112,25 @@ class Client(object):
                                        timeout=timeout,
                                        auth=auth,
                                        proxy=proxy,
-                                       config_file=config_file)
+                                       config_file=config_file,
+                                       pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       keep_alive=keep_alive,
+                                       transport=transport)
         self.auth = settings.get('auth')
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.singleflight = singleflight
+        self.instrumentation = instrumentation
+        self.deadline = deadline
+        self.transport = settings.get('transport') or 'xmlrpc'
+        if self.transport in TRANSPORTS:
+            self.transport = TRANSPORTS[self.transport]()
         self.endpoint_url = (
-            settings.get('endpoint_url') or API_PUBLIC_ENDPOINT).rstrip('/')
+            settings.get('endpoint_url')
+            or getattr(self.transport, 'default_endpoint_url', None)
+            or API_PUBLIC_ENDPOINT).rstrip('/')
         self.timeout = None
         if settings.get('timeout'):
             self.timeout = float(settings.get('timeout'))
@@ -75,6 +138,18 @@ class Client(object):
         if settings.get('proxy'):
             self.proxy = settings.get('proxy')
 
+        # An explicit keep_alive=False would be dropped while merging settings
+        if keep_alive is None:
+            keep_alive = settings.get('keep_alive')
+        if keep_alive is None or keep_alive == '':
+            keep_alive = True
+        self.session = make_session(
+            pool_connections=int(settings.get('pool_connections')
+                                 or DEFAULT_POOL_CONNECTIONS),
+            pool_maxsize=int(settings.get('pool_maxsize')
+                             or DEFAULT_POOL_MAXSIZE),
+            keep_alive=str(keep_alive).lower() not in FALSE_VALUES)
+
     def authenticate_with_password(self, username, password,
                                    security_question_id=None,
                                    security_question_answer=None):
@@ -111,6 +186,21 @@ class Client(object):
         """
         return Service(self, name)
 
+    def batch(self, max_workers=DEFAULT_BATCH_WORKERS):
+        """ Returns a :class:`Batch` that makes many calls concurrently.
+
+        :param integer max_workers: the maximum number of calls in flight
+
+        Usage:
+            >>> with client.batch() as batch:
+            ...     for guest_id in [1234, 4321]:
+            ...         batch['Virtual_Guest'].getObject(id=guest_id)
+            >>> batch.results
+            [{...}, {...}]
+
+        """
+        return Batch(self, max_workers=max_workers)
+
     def call(self, service, method, *args, **kwargs):
         """ Make a SoftLayer API call
 
@@ -140,31 +230,26 @@ class Client(object):
         if not service.startswith(self._prefix):
             service = self._prefix + service
 
-        headers = kwargs.get('headers', {})
-
-        if self.auth:
-            headers.update(self.auth.get_headers())
-
-        if kwargs.get('id') is not None:
-            headers[service + 'InitParameters'] = {'id': kwargs.get('id')}
+        request = Request()
+        request.service = service
+        request.method = method
+        request.args = args
+        request.identifier = kwargs.get('id')
+        request.filter = kwargs.get('filter')
+        if isinstance(request.filter, Filter):
+            request.filter = request.filter.to_dict()
+        request.limit = kwargs.get('limit')
+        request.offset = kwargs.get('offset')
+        request.stream = kwargs.get('stream', False)
 
         if kwargs.get('mask') is not None:
-            headers.update(self.__format_object_mask(kwargs.get('mask'),
-                                                     service))
+            request.mask = self.__format_object_mask(kwargs.get('mask'))
 
-        if kwargs.get('filter') is not None:
-            headers['%sObjectFilter' % service] = kwargs.get('filter')
-
-        if kwargs.get('limit'):
-            headers['resultLimit'] = {
-                'limit': kwargs.get('limit'),
-                'offset': kwargs.get('offset', 0),
-            }
+        request.headers = kwargs.get('headers', {})
+        if self.auth:
+            request.headers.update(self.auth.get_headers())
 
-        http_headers = {
-            'User-Agent': USER_AGENT,
-            'Content-Type': 'application/xml',
-        }
+        http_headers = {'User-Agent': USER_AGENT}
 
         if kwargs.get('compress', True):
             http_headers['Accept'] = '*/*'
@@ -172,16 +257,60 @@ class Client(object):
 
         if kwargs.get('raw_headers'):
             http_headers.update(kwargs.get('raw_headers'))
-
-        uri = '/'.join([self.endpoint_url, service])
-        return make_xml_rpc_api_call(uri, method, args,
-                                     headers=headers,
-                                     http_headers=http_headers,
-                                     timeout=self.timeout,
-                                     proxy=self.proxy)
+        request.transport_headers = http_headers
+
+        request.endpoint_url = self.endpoint_url
+        request.timeout = self.timeout
+        request.proxy = self.proxy
+        request.session = self.session
+        request.instrumentation = kwargs.get('instrumentation',
+                                             self.instrumentation)
+        request.deadline = kwargs.get('deadline', self.deadline)
+        request.cache = kwargs.get('cache', True)
+        result = self._make_request(request)
+        if kwargs.get('compact'):
+            if request.stream:
+                return (compact(item) for item in result)
+            return compact(result)
+        return result
 
     __call__ = call
 
+    def _make_request(self, request):
+        """ Sends a request through the cache, singleflight, retry policy and
+            rate limiter of the client, when they are set, and then the
+            transport, with its timeout shrunk to fit the request's deadline.
+            Calls the hooks of the request's instrumentation around it.
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        """
+        call = self.transport
+        if request.deadline is not None:
+            call = functools.partial(request.deadline.run, call=call)
+        if self.rate_limiter is not None:
+            call = functools.partial(self.rate_limiter.run, call=call)
+        if self.retry_policy is not None:
+            call = functools.partial(self.retry_policy.run, call=call)
+        if self.singleflight is not None:
+            call = functools.partial(self.singleflight.run, call=call)
+        if self.cache is not None:
+            call = functools.partial(self.cache.fetch, call=call)
+
+        instrumentation = request.instrumentation
+        if instrumentation is None:
+            return call(request)
+
+        start_time = time.time()
+        instrumentation.before_request(request)
+        try:
+            return call(request)
+        except Exception as ex:
+            instrumentation.on_error(request, ex)
+            raise
+        finally:
+            request.elapsed = time.time() - start_time
+            instrumentation.after_request(request)
+
     def iter_call(self, service, method,
                   chunk=100, limit=None, offset=0, *args, **kwargs):
         """ A generator that deals with paginating through results.
@@ -189,6 +318,16 @@ class Client(object):
         :param service: the name of the SoftLayer API service
         :param method: the method to call on the service
         :param integer chunk: result size for each API call
+        :param integer prefetch: (optional) keep this many pages in flight on
+                                 a pool of worker threads. Results are still
+                                 yielded in order.
+        :param string cursor: (optional) page in order of this key, asking
+                              for the results after the last key seen
+                              instead of using an offset. See
+                              :class:`SoftLayer.paging.KeysetPaging`.
+        :param paging: (optional) the paging strategy to use, like
+                       :class:`SoftLayer.paging.KeysetPaging`. Managers use
+                       this to pick the strategy that suits each method.
         :param \\*args: same optional arguments that ``Service.call`` takes
         :param \\*\\*kwargs: same optional keyword arguments that
                            ``Service.call`` takes
@@ -200,57 +339,26 @@ class Client(object):
         if limit:
             chunk = min(chunk, limit)
 
-        result_count = 0
+        paging = get_paging(kwargs.pop('paging', None),
+                            kwargs.pop('cursor', None),
+                            kwargs.pop('prefetch', None))
         kwargs['iter'] = False
-        while True:
-            if limit:
-                # We've reached the end of the results
-                if result_count >= limit:
-                    break
-
-                # Don't over-fetch past the given limit
-                if chunk + result_count > limit:
-                    chunk = limit - result_count
-            results = self.call(service, method,
-                                offset=offset, limit=chunk, *args, **kwargs)
-
-            # It looks like we ran out results
-            if not results:
-                break
+        for item in paging.iter_call(self, service, method, chunk, limit,
+                                     offset, args, kwargs):
+            yield item
 
-            # Apparently this method doesn't return a list.
-            # Why are you even iterating over this?
-            if not isinstance(results, list):
-                yield results
-                break
+    def __format_object_mask(self, objectmask):
+        """ Format new style object masks. String masks and
+            :class:`SoftLayer.masks.Mask` objects are sent in their canonical
+            form, which is cached. Old style (dict) masks are passed through
+            unchanged.
 
-            for item in results:
-                yield item
-                result_count += 1
-
-            offset += chunk
-
-            if len(results) < chunk:
-                break
-
-    def __format_object_mask(self, objectmask, service):
-        """ Format new and old style object masks into proper headers.
-
-        :param objectmask: a string- or dict-based object mask
-        :param service: a SoftLayer API service name
+        :param objectmask: a string- or dict-based object mask, or a Mask
 
         """
         if isinstance(objectmask, dict):
-            mheader = '%sObjectMask' % service
-        else:
-            mheader = self._prefix + 'ObjectMask'
-
-            objectmask = objectmask.strip()
-            if not objectmask.startswith('mask') \
-                    and not objectmask.startswith('['):
-                objectmask = "mask[%s]" % objectmask
-
-        return {mheader: {'mask': objectmask}}
+            return objectmask
+        return format_mask(objectmask)
 
     def __repr__(self):
         return "<Client: endpoint=%s, user=%r>" \
@@ -267,34 +375,145 @@ class TimedClient(Client):
 
     Using this class will time every call to the API and store it in an
     internal list. This will have a slight impact on your client's memory
-    usage and performance. You should only use this for debugging.
+    usage and performance. You should only use this for debugging. To keep
+    track of calls in production, use
+    :class:`SoftLayer.instrumentation.MetricsCollector` instead.
     """
 
     def __init__(self, *args, **kwargs):
         self.last_calls = []
         super(TimedClient, self).__init__(*args, **kwargs)
 
-    def call(self, service, method, *args, **kwargs):
-        """ See Client.call for documentation. """
+    def _make_request(self, request):
+        """ Times the request. See Client._make_request. """
         start_time = time.time()
-        result = super(TimedClient, self).call(service, method, *args,
-                                               **kwargs)
-        end_time = time.time()
-        diff = end_time - start_time
-        self.last_calls.append((service + '.' + method, start_time, diff))
-        return result
+        try:
+            return super(TimedClient, self)._make_request(request)
+        finally:
+            end_time = time.time()
+            diff = end_time - start_time
+            service = request.service[len(self._prefix):]
+            self.last_calls.append((service + '.' + request.method,
+                                    start_time, diff, request.retries))
 
     def get_last_calls(self):
         """ Retrieves the last_calls property.
 
         This property will contain a list of tuples in the form
-        ('SERVICE.METHOD', initiated_utc_timestamp, execution_time)
+        ('SERVICE.METHOD', initiated_utc_timestamp, execution_time, retries)
         """
         last_calls = self.last_calls
         self.last_calls = []
         return last_calls
 
 
+class Batch(object):
+    """ Queues independent API calls and runs them concurrently on a pool of
+    worker threads. Results are kept in the order the calls were queued. A
+    call that fails doesn't stop the others; its exception takes the place of
+    its result.
+
+    Calls are queued with :func:`call` or through services, like on a
+    client. Used as a context manager, the batch runs when the block exits.
+
+    :param client: the client to make the calls with
+    :param integer max_workers: the maximum number of calls in flight
+
+    Usage:
+
+        >>> batch = client.batch(max_workers=20)
+        >>> batch['Account'].getObject()
+        0
+        >>> batch.call('Virtual_Guest', 'getObject', id=1234)
+        1
+        >>> account, guest = batch.run()
+
+    """
+    def __init__(self, client, max_workers=DEFAULT_BATCH_WORKERS):
+        self.client = client
+        self.max_workers = max_workers
+        #: Queued calls as (service, method, args, kwargs) tuples
+        self.calls = []
+        #: Result, or exception, of each call once the batch has run
+        self.results = []
+        #: Number of seconds each call took
+        self.durations = []
+        #: Number of seconds the whole batch took
+        self.elapsed = None
+
+    def __getitem__(self, name):
+        return Service(self, name)
+
+    def call(self, service, method, *args, **kwargs):
+        """ Queues an API call. Takes the same arguments as
+        :func:`Client.call` and returns the index of the call's result.
+
+        """
+        self.calls.append((service, method, args, kwargs))
+        return len(self.calls) - 1
+
+    __call__ = call
+
+    def _run_call(self, index):
+        """ Makes one of the queued calls, capturing its exception """
+        service, method, args, kwargs = self.calls[index]
+        start_time = time.time()
+        try:
+            self.results[index] = getattr(self.client[service], method)(
+                *args, **kwargs)
+        except Exception as ex:  # pylint: disable=W0703
+            self.results[index] = ex
+        self.durations[index] = time.time() - start_time
+
+    def run(self):
+        """ Makes every queued call and returns the results in order """
+        self.results = [None] * len(self.calls)
+        self.durations = [None] * len(self.calls)
+        start_time = time.time()
+        if self.calls:
+            workers = min(self.max_workers, len(self.calls))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._run_call, range(len(self.calls))))
+        self.elapsed = time.time() - start_time
+        return self.results
+
+    @property
+    def errors(self):
+        """ A list of (index, exception) tuples of the calls that failed """
+        return [(index, result) for index, result in enumerate(self.results)
+                if isinstance(result, Exception)]
+
+    @property
+    def timing(self):
+        """ Aggregate timing of the last run: the number of calls and
+        errors, the wall-clock time of the batch and the total, average and
+        slowest time of the calls. """
+        durations = [duration for duration in self.durations
+                     if duration is not None]
+        total = sum(durations)
+        return {
+            'calls': len(durations),
+            'errors': len(self.errors),
+            'elapsed': self.elapsed,
+            'total': total,
+            'average': total / (len(durations) or 1),
+            'max': max(durations or [0]),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+
+    def __len__(self):
+        return len(self.calls)
+
+    def __repr__(self):
+        return "<Batch: %d calls>" % len(self.calls)
+
+
 class Service(object):
     """ A SoftLayer Service.
         :param client: A SoftLayer.API.Client instance
@@ -312,14 +531,35 @@ class Service(object):
         :param \\*args: (optional) arguments for the remote call
         :param id: (optional) id for the resource
         :param mask: (optional) object mask
-        :param dict filter: (optional) filter dict
+        :param filter: (optional) filter dict or
+                       :class:`SoftLayer.utils.Filter`
         :param dict headers: (optional) optional XML-RPC headers
         :param boolean compress: (optional) Enable/Disable HTTP compression
         :param dict raw_headers: (optional) HTTP transport headers
         :param int limit: (optional) return at most this many results
         :param int offset: (optional) offset results by this many
+        :param boolean stream: (optional) if True, returns a generator that
+                               yields each item of the resulting list while
+                               the response is still downloading, keeping
+                               only one item in memory at a time
+        :param boolean compact: (optional) if True, dictionaries in the
+                                result are returned as read-only
+                                :class:`SoftLayer.records.Record` rows,
+                                which take much less memory
         :param boolean iter: (optional) if True, returns a generator with the
                              results
+        :param int prefetch: (optional) with iter=True, the number of pages
+                             to request ahead of the one being iterated
+        :param string cursor: (optional) with iter=True, page in order of
+                              this key instead of using offsets
+        :param paging: (optional) with iter=True, the paging strategy. See
+                       :mod:`SoftLayer.paging`.
+        :param instrumentation: (optional) hooks to call for this call in
+                                place of the client's
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`
+                         for this call, in place of the client's
+        :param boolean cache: (optional) if False, the call skips the
+                              client's response cache
 
         Usage:
             >>> import SoftLayer
@@ -99,6 +99,19 @@ Prompt Options:
   -y, --really  Confirm all prompt actions
 """
 
+        if 'bulk' in command.options:
+            arg_doc += """
+Bulk Options:
+  --tags=TAGS        Act on everything with one of these comma-separated tags
+  --datacenter=DC    Act on everything in this datacenter
+  --concurrency=N    The most actions in flight at once [Default: 10]
+  --rate=N           The most actions started per second
+  --batch=N          Act on N at a time, waiting for each batch to finish
+  --percent=PERCENT  Act on PERCENT percent at a time, waiting for each
+                       batch to finish
+  --max-failures=N   Stop starting batches once more than N actions failed
+"""
+
         if '[options]' in arg_doc:
             arg_doc += """
 Standard Options:
@@ -200,10 +213,10 @@ def main(args=sys.argv[1:], env=Environment()):
         if command_args.get('--timings'):
             out_format = command_args.get('--format', 'table')
             api_calls = client.get_last_calls()
-            timing_table = KeyValueTable(['call', 'time'])
+            timing_table = KeyValueTable(['call', 'time', 'retries'])
 
-            for call, _, duration in api_calls:
-                timing_table.add_row([call, duration])
+            for call, _, duration, retries in api_calls:
+                timing_table.add_row([call, duration, retries])
 
             env.err(format_output(timing_table, fmt=out_format))
 
@@ -13,6 +13,7 @@ import os.path
 import sys
 
 from SoftLayer.CLI.modules import get_module_list
+from SoftLayer.cache import CatalogCache
 from SoftLayer.utils import console_input
 from SoftLayer import SoftLayerError
 
@@ -50,6 +51,7 @@ class Environment(object):
     }
     stdout = sys.stdout
     stderr = sys.stderr
+    catalog_cache = CatalogCache()
 
     def get_command(self, module_name, command_name):
         """ Based on the loaded modules, return a command """
@@ -6,6 +6,8 @@
     :license: MIT, see LICENSE for more details.
 """
 
+from SoftLayer.API import DEFAULT_BATCH_WORKERS
+from SoftLayer.bulk import BulkRunner
 from SoftLayer.utils import NestedDict
 from SoftLayer.CLI.environment import CLIRunnable
 from .exceptions import CLIHalt, CLIAbort, ArgumentError
@@ -13,11 +15,16 @@ from .formatting import (
     Table, KeyValueTable, FormattedItem, SequentialOutput, confirm,
     no_going_back, mb_to_gb, gb, listing, blank, format_output,
     active_txn, valid_response, transaction_status)
-from .template import update_with_template_args, export_to_template
+from .template import (
+    update_with_template_args, export_to_template, load_hosts_template)
 
 __all__ = [
     # Core/Misc
     'CLIRunnable', 'NestedDict', 'FALSE_VALUES', 'resolve_id',
+    'get_catalog_cache', 'get_identifier', 'is_bulk', 'resolve_bulk_ids',
+    'confirm_bulk_ids', 'get_bulk_runner', 'bulk_report_table',
+    'run_bulk_command', 'get_reboot_mode',
+    'split_list_args', 'create_many',
     # Exceptions
     'CLIAbort', 'CLIHalt', 'ArgumentError',
     # Formatting
@@ -25,7 +32,7 @@ __all__ = [
     'valid_response', 'confirm', 'no_going_back', 'mb_to_gb', 'gb',
     'listing', 'format_output', 'blank', 'active_txn', 'transaction_status',
     # Template
-    'update_with_template_args', 'export_to_template',
+    'update_with_template_args', 'export_to_template', 'load_hosts_template',
 ]
 
 FALSE_VALUES = ['0', 'false', 'FALSE', 'no', 'False']
@@ -52,3 +59,237 @@ def resolve_id(resolver, identifier, name='object'):
             (name, identifier, ', '.join([str(_id) for _id in ids])))
 
     return ids[0]
+
+
+def get_catalog_cache(env):
+    """ Returns the product catalog cache of the CLI environment, or None when
+        there isn't one.
+
+    :param env: the Environment the command runs in
+    """
+    return getattr(env, 'catalog_cache', None)
+
+
+def get_identifier(args):
+    """ Returns the one identifier given to a command that takes many
+
+    :param dict args: command-line arguments
+    """
+    identifier = args.get('<identifier>')
+    if isinstance(identifier, list):
+        return identifier[0]
+    return identifier
+
+
+def is_bulk(args):
+    """ Whether a command that takes the bulk options should act on many
+        objects: it was given other than one identifier, --tags or
+        --datacenter.
+
+    :param dict args: command-line arguments
+    """
+    identifiers = args.get('<identifier>')
+    if isinstance(identifiers, list) and len(identifiers) != 1:
+        return True
+    return bool(args.get('--tags') or args.get('--datacenter'))
+
+
+def resolve_bulk_ids(args, resolver, select, name='object'):
+    """ Returns the IDs a bulk command acts on: the resolved identifiers, or
+        the IDs of the objects with the --tags and in the --datacenter given.
+
+    :param dict args: command-line arguments
+    :param resolver: function that resolves ids. Should return None or a list
+                     of ids.
+    :param select: a listing function that takes tags, datacenter and mask
+    :param string name: the object type, to be used in error messages
+    """
+    identifiers = args.get('<identifier>') or []
+    if not isinstance(identifiers, list):
+        identifiers = [identifiers]
+
+    filters = {}
+    if args.get('--tags'):
+        filters['tags'] = [tag.strip() for tag in args['--tags'].split(',')]
+    if args.get('--datacenter'):
+        filters['datacenter'] = args['--datacenter']
+
+    if identifiers and filters:
+        raise ArgumentError(
+            '<identifier> not allowed with [--tags | --datacenter]')
+    if identifiers:
+        return [resolve_id(resolver, identifier, name)
+                for identifier in identifiers]
+    if not filters:
+        raise ArgumentError(
+            'One of <identifier>, [--tags] or [--datacenter] is required')
+    return [item['id'] for item in select(mask='id', **filters)]
+
+
+def confirm_bulk_ids(args, resolver, select, action, name='object'):
+    """ Returns the IDs a bulk command acts on, see :func:`resolve_bulk_ids`,
+        once the action is confirmed. Raises CLIAbort when it isn't.
+
+    :param dict args: command-line arguments
+    :param resolver: function that resolves ids
+    :param select: a listing function that takes tags, datacenter and mask
+    :param string action: the action, to be used in the prompt
+    :param string name: the object type, to be used in the prompt
+    """
+    ids = resolve_bulk_ids(args, resolver, select, name)
+    if not (args.get('--really') or confirm(
+            'This will %s %s %s(s). Continue?' % (action, len(ids), name))):
+        raise CLIAbort('Aborted.')
+    return ids
+
+
+def get_bulk_runner(args):
+    """ Returns a BulkRunner for the --concurrency, --rate, --batch, --percent
+        and --max-failures options.
+
+    :param dict args: command-line arguments
+    """
+    def number(option, convert=int):
+        """ Converts an option's value, or returns None when it's not set """
+        value = args.get(option)
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except ValueError:
+            raise ArgumentError('Invalid number [%s] = %s' % (option, value))
+
+    if args.get('--batch') and args.get('--percent'):
+        raise ArgumentError('[--batch] not allowed with [--percent]')
+
+    return BulkRunner(
+        max_workers=number('--concurrency') or DEFAULT_BATCH_WORKERS,
+        rate=number('--rate', float),
+        batch_size=number('--batch'),
+        percent=number('--percent', float),
+        max_failures=number('--max-failures'))
+
+
+def bulk_report_table(report):
+    """ Returns a table with the outcome for each ID of a bulk operation
+
+    :param report: the BulkReport of the operation
+    """
+    table = Table(['id', 'result'])
+    table.align['result'] = 'l'
+    for key, result in report.results.items():
+        if isinstance(result, Exception):
+            table.add_row([key, 'error: %s' % result])
+        else:
+            table.add_row([key, 'ok'])
+    for key in report.skipped:
+        table.add_row([key, 'skipped'])
+    return table
+
+
+def run_bulk_command(args, resolver, select, action, name, operation,
+                     **kwargs):
+    """ Runs the bulk operation of a command on the IDs it acts on, see
+        :func:`confirm_bulk_ids`, with the runner its options describe, see
+        :func:`get_bulk_runner`. Returns a table of the outcome for each ID.
+
+    :param dict args: command-line arguments
+    :param resolver: function that resolves ids
+    :param select: a listing function that takes tags, datacenter and mask
+    :param string action: the action, to be used in the prompt
+    :param string name: the object type, to be used in the prompt
+    :param operation: a manager method, like
+                      :func:`SoftLayer.CCIManager.cancel_many`, that takes
+                      the IDs and a runner
+    :param \\*\\*kwargs: other arguments of the operation
+    """
+    ids = confirm_bulk_ids(args, resolver, select, action, name)
+    return bulk_report_table(
+        operation(ids, runner=get_bulk_runner(args), **kwargs))
+
+
+def get_reboot_mode(args):
+    """ Returns the reboot mode, 'hard', 'soft' or 'default', of the --hard
+        and --soft options
+
+    :param dict args: command-line arguments
+    """
+    if args.get('--hard'):
+        return 'hard'
+    if args.get('--soft'):
+        return 'soft'
+    return 'default'
+
+
+def split_list_args(args, options=('--disk', '--key')):
+    """ Turns options given as comma-separated lists into real lists
+
+    :param dict args: command-line arguments
+    :param tuple options: the options that take comma-separated lists
+    """
+    for option in options:
+        if isinstance(args.get(option), str):
+            args[option] = args[option].split(',')
+
+
+def create_many(env, manager, args, validate, parse):
+    """ Verifies, with --test, or creates every CCI listed in the --hosts
+        file and returns the command's output. The progress of each CCI is
+        printed as it's made.
+
+    :param env: the Environment the command runs in
+    :param manager: the CCIManager to create the CCIs with
+    :param dict args: command-line arguments. The options of each host
+                      override them.
+    :param validate: function that validates the arguments of one host
+    :param parse: function that returns the create options of one host
+    """
+    if args.get('--export'):
+        raise ArgumentError('[--export] not allowed with [--hosts]')
+
+    specs = []
+    for host in load_hosts_template(args.pop('--hosts')):
+        host_args = dict(args)
+        host_args.update(host)
+        split_list_args(host_args)
+        validate(host_args)
+        specs.append(parse(host_args))
+
+    if args.get('--test'):
+        table = Table(['hostname', 'domain', 'billing', 'cost'])
+        table.align['cost'] = 'r'
+        for spec, result in zip(specs,
+                                manager.verify_create_instances(specs)):
+            fee = 'hourlyRecurringFee' if spec['hourly'] else 'recurringFee'
+            total = sum(float(price.get(fee, 0.0))
+                        for price in result['prices'])
+            table.add_row([spec['hostname'], spec['domain'],
+                           'hourly' if spec['hourly'] else 'monthly',
+                           "%.2f" % total])
+        return [table, FormattedItem(
+            None,
+            ' -- ! Prices reflected here are retail and do not '
+            'take account level discounts and are not guaranteed.')]
+
+    if not (args.get('--really') or confirm(
+            "This action will incur charges on your account for %s CCIs. "
+            "Continue?" % len(specs))):
+        raise CLIAbort('Aborting CCI order.')
+
+    statuses = {}
+    instances = []
+    for status, instance in manager.iter_create_instances(
+            specs, wait=int(args.get('--wait') or 0)):
+        env.err('%s.%s: %s' % (instance.get('hostname'),
+                               instance.get('domain'), status))
+        if status == 'ordered':
+            instances.append(instance)
+        statuses[instance['id']] = status
+
+    table = Table(['id', 'hostname', 'domain', 'created', 'guid', 'status'])
+    for instance in instances:
+        table.add_row([instance['id'], instance.get('hostname'),
+                       instance.get('domain'), instance.get('createDate'),
+                       instance.get('globalIdentifier'),
+                       statuses[instance['id']]])
+    return table
@@ -20,7 +20,7 @@ from SoftLayer.CLI import (
     FormattedItem)
 from SoftLayer.CLI.helpers import (
     ArgumentError, CLIAbort, SequentialOutput, update_with_template_args,
-    FALSE_VALUES, resolve_id)
+    FALSE_VALUES, resolve_id, get_catalog_cache)
 from SoftLayer import HardwareManager, SshKeyManager
 
 
@@ -38,6 +38,8 @@ Options:
   --memory      Show memory size options
   --nic         Show NIC speed options
   --os          Show operating system options
+  --refresh-catalog  Fetch the options from the API instead of the local
+                       cache
 """
     action = 'create-options'
     options = ['datacenter', 'cpu', 'memory', 'os', 'disk', 'nic']
@@ -53,9 +55,11 @@ Options:
                 show_all = False
                 break
 
-        mgr = HardwareManager(self.client)
+        mgr = HardwareManager(self.client,
+                              catalog_cache=get_catalog_cache(self.env))
 
-        bmi_options = mgr.get_bare_metal_create_options()
+        bmi_options = mgr.get_bare_metal_create_options(
+            refresh=args.get('--refresh-catalog'))
 
         if args['--all']:
             show_all = True
@@ -294,6 +298,8 @@ Optional:
   -k KEY, --key=KEY        SSH keys to assign to the root user. Can be
                              specified multiple times.
   -n MBPS, --network=MBPS  Network port speed in Mbps. Defaults to 100 Mbps.
+  --refresh-catalog        Fetch the create options from the API instead of
+                             the local cache
   --vlan_public=VLAN       The ID of the public VLAN on which you want the
                              hardware placed.
   --vlan_private=VLAN      The ID of the private VLAN on which you want the
@@ -308,7 +314,8 @@ Optional:
 
     def execute(self, args):
         update_with_template_args(args)
-        mgr = HardwareManager(self.client)
+        mgr = HardwareManager(self.client,
+                              catalog_cache=get_catalog_cache(self.env))
 
         # Disks will be a comma-separated list. Let's make it a real list.
         if isinstance(args.get('--disk'), str):
@@ -320,7 +327,8 @@ Optional:
 
         self._validate_args(args)
 
-        bmi_options = mgr.get_bare_metal_create_options()
+        bmi_options = mgr.get_bare_metal_create_options(
+            refresh=args.get('--refresh-catalog'))
 
         order = {
             'hostname': args['--hostname'],
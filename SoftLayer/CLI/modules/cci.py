@@ -38,7 +38,8 @@ from SoftLayer.CLI import (
 from SoftLayer.CLI.helpers import (
     CLIAbort, ArgumentError, NestedDict, blank, resolve_id, KeyValueTable,
     update_with_template_args, FALSE_VALUES, export_to_template,
-    active_txn, transaction_status)
+    split_list_args, create_many, get_identifier, is_bulk, run_bulk_command,
+    get_reboot_mode, active_txn, transaction_status)
 
 
 class ListCCIs(CLIRunnable):
@@ -357,6 +358,8 @@ Optional:
   --dry-run, --test      Do not create CCI, just get a quote
   --export=FILE          Exports options to a template file
   -F, --userfile=FILE    Read userdata from file
+  --hosts=FILE           Create many CCIs from a CSV or INI file of options
+                           for each CCI, which override the ones given here
   -i, --postinstall=URI  Post-install script to download
                            (Only HTTPS executes, HTTP leaves file in /root)
   -k, --key=KEY          SSH keys to add to the root user. Can be specified
@@ -385,14 +388,11 @@ Optional:
         cci = CCIManager(self.client)
         self._update_with_like_args(args)
 
-        # Disks will be a comma-separated list. Let's make it a real list.
-        if isinstance(args.get('--disk'), str):
-            args['--disk'] = args.get('--disk').split(',')
-
-        # SSH keys may be a comma-separated list. Let's make it a real list.
-        if isinstance(args.get('--key'), str):
-            args['--key'] = args.get('--key').split(',')
+        if args.get('--hosts'):
+            return create_many(self.env, cci, args, self._validate_args,
+                               self._parse_create_args)
 
+        split_list_args(args)
         self._validate_args(args)
 
         # Do not create CCI with --test or --export
@@ -628,9 +628,9 @@ Optional:
 
 class ReadyCCI(CLIRunnable):
     """
-usage: sl cci ready <identifier> [options]
+usage: sl cci ready <identifier>... [options]
 
-Check if a CCI is ready.
+Check if one or more CCIs are ready.
 
 Optional:
   --wait=SECONDS  Block until CCI is finished provisioning for up to X seconds
@@ -641,20 +641,29 @@ Optional:
     def execute(self, args):
         cci = CCIManager(self.client)
 
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
-        ready = cci.wait_for_ready(cci_id, int(args.get('--wait') or 0))
+        cci_ids = [resolve_id(cci.resolve_ids, identifier, 'CCI')
+                   for identifier in args.get('<identifier>')]
+        if len(cci_ids) == 1:
+            ready = cci.wait_for_ready(cci_ids[0],
+                                       int(args.get('--wait') or 0))
+            if ready:
+                return "READY"
+            else:
+                raise CLIAbort("Instance %s not ready" % cci_ids[0])
 
-        if ready:
-            return "READY"
-        else:
-            raise CLIAbort("Instance %s not ready" % cci_id)
+        ready = cci.wait_for_ready_many(cci_ids, int(args.get('--wait') or 0))
+        not_ready = [cci_id for cci_id in cci_ids if not ready[cci_id]]
+        if not_ready:
+            raise CLIAbort("Instances %s not ready"
+                           % ', '.join(str(cci_id) for cci_id in not_ready))
+        return "READY"
 
 
 class ReloadCCI(CLIRunnable):
     """
-usage: sl cci reload <identifier> [--key=KEY...] [options]
+usage: sl cci reload [<identifier>...] [--key=KEY...] [options]
 
-Reload the OS on a CCI based on its current configuration
+Reload the OS on one or more CCIs based on their current configuration
 
 Optional:
   -i, --postinstall=URI  Post-install script to download
@@ -664,17 +673,23 @@ Optional:
 """
 
     action = 'reload'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         cci = CCIManager(self.client)
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
         keys = []
         if args.get('--key'):
             for key in args.get('--key'):
                 key_id = resolve_id(SshKeyManager(self.client).resolve_ids,
                                     key, 'SshKey')
                 keys.append(key_id)
+        if is_bulk(args):
+            return run_bulk_command(
+                args, cci.resolve_ids, cci.list_instances, 'reload the OS on',
+                'CCI', cci.reload_many, post_uri=args['--postinstall'],
+                ssh_keys=keys)
+
+        cci_id = resolve_id(cci.resolve_ids, get_identifier(args), 'CCI')
         if args['--really'] or no_going_back(cci_id):
             cci.reload_instance(cci_id, args['--postinstall'], keys)
         else:
@@ -683,17 +698,21 @@ Optional:
 
 class CancelCCI(CLIRunnable):
     """
-usage: sl cci cancel <identifier> [options]
+usage: sl cci cancel [<identifier>...] [options]
 
-Cancel a CCI
+Cancel one or more CCIs
 """
 
     action = 'cancel'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         cci = CCIManager(self.client)
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
+        if is_bulk(args):
+            return run_bulk_command(args, cci.resolve_ids, cci.list_instances,
+                                    'cancel', 'CCI', cci.cancel_many)
+
+        cci_id = resolve_id(cci.resolve_ids, get_identifier(args), 'CCI')
         if args['--really'] or no_going_back(cci_id):
             cci.cancel_instance(cci_id)
         else:
@@ -702,20 +721,25 @@ Cancel a CCI
 
 class CCIPowerOff(CLIRunnable):
     """
-usage: sl cci power-off <identifier> [--hard] [options]
+usage: sl cci power-off [<identifier>...] [--hard] [options]
 
-Power off an active CCI
+Power off one or more active CCIs
 
 Optional:
     --hard  Perform a hard shutdown
 """
     action = 'power-off'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         virtual_guest = self.client['Virtual_Guest']
         cci = CCIManager(self.client)
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
+        if is_bulk(args):
+            return run_bulk_command(
+                args, cci.resolve_ids, cci.list_instances, 'power off', 'CCI',
+                cci.power_off_many, hard=args['--hard'])
+
+        cci_id = resolve_id(cci.resolve_ids, get_identifier(args), 'CCI')
         if args['--really'] or confirm('This will power off the CCI with id '
                                        '%s. Continue?' % cci_id):
             if args['--hard']:
@@ -728,45 +752,51 @@ Optional:
 
 class CCIReboot(CLIRunnable):
     """
-usage: sl cci reboot <identifier> [--hard | --soft] [options]
+usage: sl cci reboot [<identifier>...] [--hard | --soft] [options]
 
-Reboot an active CCI
+Reboot one or more active CCIs
 
 Optional:
     --hard  Perform an abrupt reboot
     --soft  Perform a graceful reboot
 """
     action = 'reboot'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         virtual_guest = self.client['Virtual_Guest']
         cci = CCIManager(self.client)
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
+        if is_bulk(args):
+            return run_bulk_command(
+                args, cci.resolve_ids, cci.list_instances, 'reboot', 'CCI',
+                cci.reboot_many, mode=get_reboot_mode(args))
+
+        cci_id = resolve_id(cci.resolve_ids, get_identifier(args), 'CCI')
         if args['--really'] or confirm('This will reboot the CCI with id '
                                        '%s. Continue?' % cci_id):
-            if args['--hard']:
-                virtual_guest.rebootHard(id=cci_id)
-            elif args['--soft']:
-                virtual_guest.rebootSoft(id=cci_id)
-            else:
-                virtual_guest.rebootDefault(id=cci_id)
+            mode = get_reboot_mode(args)
+            getattr(virtual_guest, 'reboot%s' % mode.title())(id=cci_id)
         else:
             raise CLIAbort('Aborted.')
 
 
 class CCIPowerOn(CLIRunnable):
     """
-usage: sl cci power-on <identifier> [options]
+usage: sl cci power-on [<identifier>...] [options]
 
-Power on a CCI
+Power on one or more CCIs
 """
     action = 'power-on'
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         virtual_guest = self.client['Virtual_Guest']
         cci = CCIManager(self.client)
-        cci_id = resolve_id(cci.resolve_ids, args.get('<identifier>'), 'CCI')
+        if is_bulk(args):
+            return run_bulk_command(args, cci.resolve_ids, cci.list_instances,
+                                    'power on', 'CCI', cci.power_on_many)
+
+        cci_id = resolve_id(cci.resolve_ids, get_identifier(args), 'CCI')
         virtual_guest.powerOn(id=cci_id)
 
 
@@ -29,7 +29,9 @@ from os import linesep
 from SoftLayer.CLI.helpers import (
     CLIRunnable, Table, KeyValueTable, FormattedItem, NestedDict, CLIAbort,
     blank, listing, gb, active_txn, no_going_back, resolve_id, confirm,
-    ArgumentError, update_with_template_args, export_to_template)
+    ArgumentError, update_with_template_args, export_to_template,
+    get_catalog_cache, get_identifier, is_bulk, run_bulk_command,
+    get_reboot_mode)
 from SoftLayer import HardwareManager, SshKeyManager
 
 
@@ -191,9 +193,10 @@ Options:
 
 class ServerReload(CLIRunnable):
     """
-usage: sl server reload <identifier> [--key=KEY...] [options]
+usage: sl server reload [<identifier>...] [--key=KEY...] [options]
 
-Reload the OS on a hardware server based on its current configuration
+Reload the OS on one or more hardware servers based on their current
+configuration
 
 Optional:
   -i, --postinstall=URI  Post-install script to download
@@ -203,18 +206,25 @@ Optional:
 """
 
     action = 'reload'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         hardware = HardwareManager(self.client)
-        hardware_id = resolve_id(
-            hardware.resolve_ids, args.get('<identifier>'), 'hardware')
         keys = []
         if args.get('--key'):
             for key in args.get('--key'):
                 key_id = resolve_id(SshKeyManager(self.client).resolve_ids,
                                     key, 'SshKey')
                 keys.append(key_id)
+
+        if is_bulk(args):
+            return run_bulk_command(
+                args, hardware.resolve_ids, hardware.list_hardware,
+                'reload the OS on', 'server', hardware.reload_many,
+                post_uri=args['--postinstall'], ssh_keys=keys)
+
+        hardware_id = resolve_id(
+            hardware.resolve_ids, get_identifier(args), 'hardware')
         if args['--really'] or no_going_back(hardware_id):
             hardware.reload(hardware_id, args['--postinstall'], keys)
         else:
@@ -223,9 +233,9 @@ Optional:
 
 class CancelServer(CLIRunnable):
     """
-usage: sl server cancel <identifier> [options]
+usage: sl server cancel [<identifier>...] [options]
 
-Cancel a dedicated server
+Cancel one or more dedicated servers
 
 Options:
   --comment=COMMENT  An optional comment to add to the cancellation ticket
@@ -234,12 +244,18 @@ Options:
 """
 
     action = 'cancel'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         mgr = HardwareManager(self.client)
+        if is_bulk(args):
+            return run_bulk_command(
+                args, mgr.resolve_ids, mgr.list_hardware, 'cancel', 'server',
+                mgr.cancel_many, reason=args.get('--reason') or 'unneeded',
+                comment=args.get('--comment') or '')
+
         hw_id = resolve_id(
-            mgr.resolve_ids, args.get('<identifier>'), 'hardware')
+            mgr.resolve_ids, get_identifier(args), 'hardware')
 
         comment = args.get('--comment')
 
@@ -278,16 +294,20 @@ Display a list of cancellation reasons
 
 class ServerPowerOff(CLIRunnable):
     """
-usage: sl server power-off <identifier> [options]
+usage: sl server power-off [<identifier>...] [options]
 
-Power off an active server
+Power off one or more active servers
 """
     action = 'power-off'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         mgr = HardwareManager(self.client)
-        hw_id = resolve_id(mgr.resolve_ids, args.get('<identifier>'),
+        if is_bulk(args):
+            return run_bulk_command(args, mgr.resolve_ids, mgr.list_hardware,
+                                    'power off', 'server', mgr.power_off_many)
+
+        hw_id = resolve_id(mgr.resolve_ids, get_identifier(args),
                            'hardware')
         if args['--really'] or confirm('This will power off the server with '
                                        'id %s. Continue?' % hw_id):
@@ -298,61 +318,72 @@ Power off an active server
 
 class ServerReboot(CLIRunnable):
     """
-usage: sl server reboot <identifier> [--hard | --soft] [options]
+usage: sl server reboot [<identifier>...] [--hard | --soft] [options]
 
-Reboot an active server
+Reboot one or more active servers
 
 Optional:
     --hard  Perform an abrupt reboot
     --soft  Perform a graceful reboot
 """
     action = 'reboot'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         hardware_server = self.client['Hardware_Server']
         mgr = HardwareManager(self.client)
-        hw_id = resolve_id(mgr.resolve_ids, args.get('<identifier>'),
+        if is_bulk(args):
+            return run_bulk_command(
+                args, mgr.resolve_ids, mgr.list_hardware, 'reboot', 'server',
+                mgr.reboot_many, mode=get_reboot_mode(args))
+
+        hw_id = resolve_id(mgr.resolve_ids, get_identifier(args),
                            'hardware')
         if args['--really'] or confirm('This will power off the server with '
                                        'id %s. Continue?' % hw_id):
-            if args['--hard']:
-                hardware_server.rebootHard(id=hw_id)
-            elif args['--soft']:
-                hardware_server.rebootSoft(id=hw_id)
-            else:
-                hardware_server.rebootDefault(id=hw_id)
+            mode = get_reboot_mode(args)
+            getattr(hardware_server, 'reboot%s' % mode.title())(id=hw_id)
         else:
             raise CLIAbort('Aborted.')
 
 
 class ServerPowerOn(CLIRunnable):
     """
-usage: sl server power-on <identifier> [options]
+usage: sl server power-on [<identifier>...] [options]
 
-Power on a server
+Power on one or more servers
 """
     action = 'power-on'
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         mgr = HardwareManager(self.client)
-        hw_id = resolve_id(mgr.resolve_ids, args.get('<identifier>'),
+        if is_bulk(args):
+            return run_bulk_command(args, mgr.resolve_ids, mgr.list_hardware,
+                                    'power on', 'server', mgr.power_on_many)
+
+        hw_id = resolve_id(mgr.resolve_ids, get_identifier(args),
                            'hardware')
         self.client['Hardware_Server'].powerOn(id=hw_id)
 
 
 class ServerPowerCycle(CLIRunnable):
     """
-usage: sl server power-cycle <identifier> [options]
+usage: sl server power-cycle [<identifier>...] [options]
 
-Issues power cycle to server via the power strip
+Issues power cycle to one or more servers via the power strip
 """
     action = 'power-cycle'
-    options = ['confirm']
+    options = ['confirm', 'bulk']
 
     def execute(self, args):
         mgr = HardwareManager(self.client)
-        hw_id = resolve_id(mgr.resolve_ids, args.get('<identifier>'),
+        if is_bulk(args):
+            return run_bulk_command(
+                args, mgr.resolve_ids, mgr.list_hardware, 'power cycle',
+                'server', mgr.power_cycle_many)
+
+        hw_id = resolve_id(mgr.resolve_ids, get_identifier(args),
                            'hardware')
 
         if args['--really'] or confirm('This will power off the server with '
@@ -423,6 +454,8 @@ Options:
   --memory      Show memory size options
   --nic         Show NIC speed options
   --os          Show operating system options
+  --refresh-catalog  Fetch the options from the API instead of the local
+                       cache
 """
 
     action = 'create-options'
@@ -430,7 +463,8 @@ Options:
                'controller']
 
     def execute(self, args):
-        mgr = HardwareManager(self.client)
+        mgr = HardwareManager(self.client,
+                              catalog_cache=get_catalog_cache(self.env))
 
         table = KeyValueTable(['Name', 'Value'])
         table.align['Name'] = 'r'
@@ -438,7 +472,8 @@ Options:
 
         chassis_id = args.get('<chassis_id>')
 
-        ds_options = mgr.get_dedicated_server_create_options(chassis_id)
+        ds_options = mgr.get_dedicated_server_create_options(
+            chassis_id, refresh=args.get('--refresh-catalog'))
 
         show_all = True
         for opt_name in self.options:
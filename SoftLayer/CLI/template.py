@@ -7,6 +7,7 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import csv
 import os.path
 
 from .exceptions import ArgumentError
@@ -38,6 +39,42 @@ def update_with_template_args(args):
                 args[option_key] = value
 
 
+def load_hosts_template(path):
+    """ Loads the options of many hosts from a CSV file, with a header row of
+        long option names and a row for each host, or from an INI file, with
+        a section for each host. A section's name is the host's hostname
+        unless the section sets one. Empty values are left out.
+
+    :param path: the path of the file
+    :returns: a list of dicts of command-line options, one for each host
+    """
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        raise ArgumentError('File does not exist [--hosts] = %s' % path)
+
+    hosts = []
+    if path.lower().endswith('.csv'):
+        with open(path, 'r') as hosts_file:
+            for row in csv.DictReader(hosts_file):
+                hosts.append(row)
+    else:
+        config = configparser.ConfigParser()
+        with open(path, 'r') as hosts_file:
+            config.readfp(hosts_file)
+        for section in config.sections():
+            host = {'hostname': section}
+            host.update(config.items(section))
+            hosts.append(host)
+
+    if not hosts:
+        raise ArgumentError('No hosts found in [--hosts] = %s' % path)
+
+    return [dict(('--%s' % key.strip().lstrip('-'), value.strip())
+                 for key, value in host.items() if key and value and
+                 value.strip())
+            for host in hosts]
+
+
 def export_to_template(filename, args, exclude=None):
     """ Exports given options to the given filename in INI format
 
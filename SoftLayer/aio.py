@@ -0,0 +1,228 @@
+"""
+    SoftLayer.aio
+    ~~~~~~~~~~~~~
+    asyncio bindings for the SoftLayer API. Requires Python 3.6 or newer.
+
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import itertools
+import weakref
+
+from .API import Client, VALID_CALL_ARGS
+
+__all__ = ['AsyncClient', 'AsyncService']
+
+DEFAULT_CONCURRENCY = 20
+
+# iter_call options that are handled by the blocking client's pagers
+PAGER_ARGS = ('paging', 'cursor', 'prefetch')
+
+
+class AsyncClient(object):
+    """ An asyncio SoftLayer API client.
+
+    Calls are encoded, sent and decoded by a regular :class:`SoftLayer.Client`
+    on a worker thread, so masks, filters, limits, authentication and the
+    mapping of XML-RPC faults to exceptions behave exactly like the blocking
+    client. Any number of calls can be awaited at once on one event loop;
+    at most ``concurrency`` of them are sent to the API at the same time.
+
+    :param client: an optional SoftLayer.Client to make the calls with. One
+        is created from \\*\\*kwargs when this isn't given.
+    :param integer concurrency: the maximum number of API calls in flight
+    :param \\*\\*kwargs: same keyword arguments that ``SoftLayer.Client``
+        takes
+
+    Usage:
+
+        >>> import asyncio
+        >>> from SoftLayer.aio import AsyncClient
+        >>> client = AsyncClient(username="username", api_key="api_key")
+        >>> async def main():
+        ...     return await client['Account'].getObject()
+        >>> asyncio.get_event_loop().run_until_complete(main())['companyName']
+        'Your Company'
+
+    """
+
+    def __init__(self, client=None, concurrency=DEFAULT_CONCURRENCY,
+                 **kwargs):
+        if client is None:
+            # Every worker thread should be able to keep its connection open
+            kwargs.setdefault('pool_maxsize', concurrency)
+            client = Client(**kwargs)
+        self.client = client
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def __getitem__(self, name):
+        """ Get a SoftLayer Service.
+
+        :param name: The name of the service. E.G. Account
+
+        """
+        return AsyncService(self, name)
+
+    def _get_semaphore(self):
+        """ Returns the semaphore bounding calls made on the running loop """
+        loop = asyncio.get_event_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                self.concurrency)
+        return semaphore
+
+    def call(self, service, method, *args, **kwargs):
+        """ Make a SoftLayer API call. Takes the same arguments as
+        :func:`SoftLayer.Client.call` and returns a coroutine with the result.
+        With ``iter=True`` an asynchronous generator is returned instead.
+
+        Usage:
+            >>> await client['Account'].getVirtualGuests(mask="id", limit=10)
+            [...]
+
+        """
+        if kwargs.pop('iter', False):
+            return self.iter_call(service, method, *args, **kwargs)
+
+        invalid_kwargs = set(kwargs.keys()) - VALID_CALL_ARGS
+        if invalid_kwargs:
+            raise TypeError(
+                'Invalid keyword arguments: %s' % ','.join(invalid_kwargs))
+
+        return self._call(functools.partial(
+            self.client.call, service, method, *args, **kwargs))
+
+    __call__ = call
+
+    async def _call(self, func):
+        """ Runs a blocking call on the worker pool once a slot is free """
+        async with self._get_semaphore():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, func)
+
+    async def iter_call(self, service, method,
+                        chunk=100, limit=None, offset=0, *args, **kwargs):
+        """ An asynchronous generator that deals with paginating through
+        results. See :func:`SoftLayer.Client.iter_call`.
+
+        Usage:
+            >>> async for guest in client['Account'].getVirtualGuests(
+            ...         iter=True):
+            ...     guest['id']
+
+        """
+        if chunk <= 0:
+            raise AttributeError("Chunk size should be greater than zero.")
+
+        if limit:
+            chunk = min(chunk, limit)
+
+        if any(arg in kwargs for arg in PAGER_ARGS):
+            # The blocking pager is run on the worker pool a page at a time,
+            # since strategies work out each page from the one before
+            pages = self.client.iter_call(service, method, chunk, limit,
+                                          offset, *args, **kwargs)
+            while True:
+                items = await self._call(functools.partial(
+                    list, itertools.islice(pages, chunk)))
+                for item in items:
+                    yield item
+                if len(items) < chunk:
+                    break
+            return
+
+        result_count = 0
+        while True:
+            if limit:
+                # We've reached the end of the results
+                if result_count >= limit:
+                    break
+
+                # Don't over-fetch past the given limit
+                if chunk + result_count > limit:
+                    chunk = limit - result_count
+            results = await self.call(service, method,
+                                      offset=offset, limit=chunk,
+                                      *args, **kwargs)
+
+            # It looks like we ran out results
+            if not results:
+                break
+
+            # Apparently this method doesn't return a list.
+            if not isinstance(results, list):
+                yield results
+                break
+
+            for item in results:
+                yield item
+                result_count += 1
+
+            offset += chunk
+
+            if len(results) < chunk:
+                break
+
+    def close(self):
+        """ Shuts down the worker threads """
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
+
+    def __repr__(self):
+        return "<AsyncClient: endpoint=%s, user=%r>" \
+            % (self.client.endpoint_url, self.client.auth)
+
+    __str__ = __repr__
+
+
+class AsyncService(object):
+    """ A SoftLayer Service for the asyncio client.
+
+        :param client: A SoftLayer.aio.AsyncClient instance
+        :param name str: The service name
+
+    """
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def call(self, name, *args, **kwargs):
+        """ Make a SoftLayer API call. See :func:`SoftLayer.API.Service.call`
+        for the available arguments. Returns a coroutine, or an asynchronous
+        generator when ``iter=True`` is given.
+
+        """
+        return self.client.call(self.name, name, *args, **kwargs)
+
+    __call__ = call
+
+    def iter_call(self, name, *args, **kwargs):
+        """ An asynchronous generator that deals with paginating through
+        results. See :func:`SoftLayer.API.Service.iter_call`.
+
+        """
+        return self.client.iter_call(self.name, name, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name in ["__name__", "__bases__"]:
+            raise AttributeError("'Obj' object has no attribute '%s'" % name)
+
+        def call_handler(*args, **kwargs):
+            " Handler that actually makes the API call "
+            return self(name, *args, **kwargs)
+        return call_handler
+
+    def __repr__(self):
+        return "<AsyncService: %s>" % (self.name,)
+
+    __str__ = __repr__
@@ -0,0 +1,227 @@
+"""
+    SoftLayer.bulk
+    ~~~~~~~~~~~~~~
+    Runs one operation on many objects in concurrent, rate-limited waves
+
+    :license: MIT, see LICENSE for more details.
+"""
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import math
+import time
+
+from .API import DEFAULT_BATCH_WORKERS
+from .ratelimit import TokenBucket
+
+__all__ = ['BulkRunner', 'BulkReport', 'run_bulk']
+
+
+class BulkReport(object):
+    """ The outcome of a bulk operation for each object it was given """
+
+    def __init__(self):
+        #: Result, or exception, of each object the operation ran on, keyed
+        #: by the object's ID in the order the IDs were given
+        self.results = OrderedDict()
+        #: IDs the operation wasn't run on because the run was stopped
+        self.skipped = []
+
+    @property
+    def succeeded(self):
+        """ The IDs the operation succeeded on """
+        return [key for key, result in self.results.items()
+                if not isinstance(result, Exception)]
+
+    @property
+    def errors(self):
+        """ A list of (ID, exception) tuples of the operations that failed """
+        return [(key, result) for key, result in self.results.items()
+                if isinstance(result, Exception)]
+
+    @property
+    def ok(self):
+        """ Whether the operation ran, and succeeded, on every object """
+        return not self.skipped and not self.errors
+
+    def __repr__(self):
+        return "BulkReport(succeeded=%s, failed=%s, skipped=%s)" % (
+            len(self.succeeded), len(self.errors), len(self.skipped))
+
+
+class BulkRunner(object):
+    """ Runs an operation on many objects. The objects are split into waves
+        of ``batch_size`` objects, or of ``percent`` percent of them, for a
+        rolling change. A wave runs on up to ``max_workers`` threads and the
+        next one starts once it has finished. Once more than
+        ``max_failures`` operations have failed, or the deadline has expired,
+        no more operations are started, even within a wave. The ones that
+        weren't started are reported as skipped.
+
+    :param integer max_workers: the maximum number of operations in flight
+    :param float rate: the most operations started per second. None means no
+                       limit.
+    :param integer batch_size: the number of objects in each wave
+    :param float percent: the percentage of the objects in each wave. Cannot
+                          be given with batch_size.
+    :param float pause: the number of seconds to wait between waves
+    :param integer max_failures: the number of failures that stops the run.
+                                 None never stops it.
+    :param deadline: a :class:`SoftLayer.deadline.Deadline` that stops the run
+
+    Usage:
+
+        >>> runner = BulkRunner(max_workers=20, rate=5, percent=10,
+        ...                     max_failures=0)
+        >>> report = runner.run(cci.cancel_instance, [1234, 1235, 1236])
+        >>> report.errors
+        []
+
+    """
+
+    def __init__(self, max_workers=DEFAULT_BATCH_WORKERS, rate=None,
+                 batch_size=None, percent=None, pause=0, max_failures=None,
+                 deadline=None):
+        if batch_size and percent:
+            raise ValueError('Can only specify one of: batch_size,percent')
+        self.max_workers = max_workers
+        self.rate = rate
+        self.batch_size = batch_size
+        self.percent = percent
+        self.pause = pause
+        self.max_failures = max_failures
+        self.deadline = deadline
+
+    def get_waves(self, ids):
+        """ Splits the IDs into the waves they're run in
+
+        :param list ids: the object IDs
+        """
+        size = len(ids)
+        if self.batch_size:
+            size = int(self.batch_size)
+        elif self.percent:
+            size = int(math.ceil(len(ids) * self.percent / 100.0))
+        size = max(1, size)
+        return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+    def run(self, operation, ids, callback=None):
+        """ Runs the operation on every ID and returns a :class:`BulkReport`
+
+        :param operation: a function called with each ID
+        :param list ids: the object IDs. Duplicates are only run once.
+        :param callback: a function called with the ID and the result, or
+                         exception, of each operation as it finishes
+        """
+        unique, seen = [], set()
+        for key in ids:
+            if key not in seen:
+                seen.add(key)
+                unique.append(key)
+
+        bucket = None
+        if self.rate:
+            bucket = TokenBucket(self.rate)
+
+        results = {}
+        failures = 0
+        for number, wave in enumerate(self.get_waves(unique)):
+            if self._should_stop(failures):
+                break
+
+            if number and self.pause:
+                if self.deadline is not None:
+                    self.deadline.sleep(self.pause)
+                else:
+                    time.sleep(self.pause)
+
+            # Operations are only submitted while there is a free worker,
+            # so the run can stop in the middle of a wave
+            pending = deque(wave)
+            in_flight = {}
+            workers = min(self.max_workers, len(wave))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                while pending or in_flight:
+                    while pending and len(in_flight) < workers \
+                            and not self._should_stop(failures):
+                        key = pending.popleft()
+                        future = executor.submit(_run_one, operation, key,
+                                                 bucket)
+                        in_flight[future] = key
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(list(in_flight),
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key = in_flight.pop(future)
+                        results[key] = future.result()
+                        if isinstance(results[key], Exception):
+                            failures += 1
+                        if callback is not None:
+                            callback(key, results[key])
+
+        report = BulkReport()
+        for key in unique:
+            if key in results:
+                report.results[key] = results[key]
+            else:
+                report.skipped.append(key)
+        return report
+
+    def _should_stop(self, failures):
+        """ Whether operations that haven't started yet should be skipped """
+        if self.deadline is not None and self.deadline.expired:
+            return True
+        return self.max_failures is not None and failures > self.max_failures
+
+    def __repr__(self):
+        return ("BulkRunner(max_workers=%r, rate=%r, batch_size=%r, "
+                "percent=%r)" % (self.max_workers, self.rate,
+                                 self.batch_size, self.percent))
+
+
+def run_bulk(operation, ids=None, select=None, runner=None, callback=None,
+             **filters):
+    """ Runs an operation on the given IDs, or on the IDs of the objects a
+        listing function returns for the filters, and returns a
+        :class:`BulkReport`. Either IDs or a filter with a value, like tags
+        or a datacenter, are required, so an operation is never run on
+        everything by accident. Empty filters, which listing functions
+        ignore, don't count.
+
+    :param operation: a function called with each ID
+    :param list ids: the object IDs
+    :param select: a listing function, like
+                   :func:`SoftLayer.CCIManager.list_instances`, that takes
+                   the filters and a mask
+    :param runner: the :class:`BulkRunner` to run the operation with
+    :param callback: a function called with the ID and the result, or
+                     exception, of each operation as it finishes
+    :param \\*\\*filters: the filters to select the objects with
+    """
+    if ids is None:
+        filters = dict((key, value) for key, value in filters.items()
+                       if value is not None and value != ''
+                       and not (isinstance(value, (list, tuple, set, dict))
+                                and not value))
+        # Flags like hourly=True don't narrow the listing on their own
+        if select is None or not [value for value in filters.values()
+                                  if not isinstance(value, bool)]:
+            raise ValueError('IDs or filters are required')
+        ids = [item['id'] for item in select(mask='id', **filters)]
+
+    if runner is None:
+        runner = BulkRunner()
+    return runner.run(operation, ids, callback=callback)
+
+
+def _run_one(operation, key, bucket):
+    """ Runs the operation on one ID, capturing its exception """
+    if bucket is not None:
+        wait = bucket.reserve()
+        if wait:
+            time.sleep(wait)
+    try:
+        return operation(key)
+    except Exception as ex:  # pylint: disable=W0703
+        return ex
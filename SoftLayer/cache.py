@@ -0,0 +1,411 @@
+"""
+    SoftLayer.cache
+    ~~~~~~~~~~~~~~~
+    Caching of API responses
+
+    :license: MIT, see LICENSE for more details.
+"""
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import os.path
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from collections import OrderedDict
+except ImportError:  # pragma: no cover
+    from ordereddict import OrderedDict  # pylint: disable=F0401
+
+__all__ = ['ResponseCache', 'SingleFlight', 'CatalogCache',
+           'CATALOG_METHODS', 'catalog_key', 'user_cache_dir']
+
+PREFIX = 'SoftLayer_'
+#: The methods :class:`ResponseCache` caches unless told otherwise: the
+#: product catalog, which rarely changes
+CATALOG_METHODS = ['Product_Package.get*']
+DEFAULT_CATALOG_TTL = 24 * 60 * 60
+
+
+def _short_service(service):
+    """ Strips the SoftLayer_ prefix from a service name """
+    if service.startswith(PREFIX):
+        return service[len(PREFIX):]
+    return service
+
+
+def freeze(value):
+    """ Converts nested dicts and lists into hashable tuples """
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def make_key(request):
+    """ Returns a hashable key identifying the call a
+        :class:`SoftLayer.transports.Request` makes """
+    return (_short_service(request.service), request.method,
+            freeze(request.args), request.identifier,
+            freeze(request.mask), freeze(request.filter),
+            request.limit, request.offset, freeze(request.headers))
+
+
+def matches(service, method, patterns):
+    """ Returns True if the method is matched by one of the 'Service.method'
+        patterns. Only methods starting with 'get' ever match. """
+    name = '%s.%s' % (_short_service(service), method)
+    return method.startswith('get') and any(
+        fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+class ResponseCache(object):
+    """ A read-through, in-memory cache for idempotent API calls. Entries
+        expire after a TTL and the least recently used entries are evicted
+        once the cache is full. Only the methods asked for are cached, the
+        product catalog by default, since most other data changes under
+        the client. Calls made with ``cache=False``, like the checks of
+        :func:`SoftLayer.CCIManager.wait_for_ready` and the listings of
+        :class:`SoftLayer.inventory.Inventory`, always go to the API.
+
+        Every call to a method that doesn't start with 'get' (createObject,
+        editObject, deleteObject, ...) removes the cached entries of its
+        service and of the related services, once it has been made. Only
+        those services are known to be affected: a call that changes data
+        other services return too has to be followed by :func:`invalidate`.
+
+    :param int max_size: maximum number of responses to keep
+    :param int ttl: default number of seconds a response stays valid
+    :param dict ttls: TTLs for specific methods, keyed by 'Service.method'.
+                      E.G.: {'Product_Package.getCategories': 3600}
+    :param list methods: the methods that may be cached, as 'Service.method'
+                         patterns. Only methods starting with 'get' are ever
+                         cached. Defaults to :data:`CATALOG_METHODS`
+    :param list related: the services whose cached entries every call that
+                         changes data also removes. Defaults to ['Account'],
+                         which lists the objects of most other services.
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.cache import ResponseCache
+        >>> client = SoftLayer.Client()
+        >>> client.cache = ResponseCache(ttl=60,
+        ...                              methods=['Account.getSshKeys'])
+        >>> client['Account'].getSshKeys()  # calls the API
+        >>> client['Account'].getSshKeys()  # served from the cache
+        >>> client['Security_Ssh_Key'].createObject(key)  # drops Account
+        >>> client.cache.stats
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'invalidations': 1}
+
+    """
+
+    def __init__(self, max_size=1000, ttl=300, ttls=None, methods=None,
+                 related=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        if methods is None:
+            methods = CATALOG_METHODS
+        self.methods = list(methods)
+        if related is None:
+            related = ['Account']
+        self.related = list(related)
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                      'invalidations': 0}
+        self._entries = OrderedDict()
+        self._cacheable = {}
+        # Bumped by every invalidation, so a response that was requested
+        # before one isn't stored after it
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, service, method):
+        """ Returns True if calls to the given method may be cached
+
+        :param string service: the service name. E.G. Account
+        :param string method: the method name. E.G. getSshKeys
+        """
+        cacheable = self._cacheable.get((service, method))
+        if cacheable is None:
+            cacheable = matches(service, method, self.methods)
+            self._cacheable[(service, method)] = cacheable
+        return cacheable
+
+    def get_ttl(self, service, method):
+        """ Returns the TTL in seconds for the given method """
+        return self.ttls.get('%s.%s' % (_short_service(service), method),
+                             self.ttl)
+
+    make_key = staticmethod(make_key)
+
+    def fetch(self, request, call):
+        """ Returns the response for the request from the cache when it's
+            there, or makes the call and caches the response.
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        :param call: callable that makes the request (usually the transport)
+        """
+        if not request.method.startswith('get'):
+            try:
+                return call(request)
+            finally:
+                # Even a failed call may have changed something
+                for service in [request.service] + self.related:
+                    self.invalidate(service)
+
+        if request.stream or not request.cache \
+                or not self.is_cacheable(request.service, request.method):
+            return call(request)
+
+        key = self.make_key(request)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.pop(key)
+                self._entries[key] = entry
+                self.stats['hits'] += 1
+                request.cache_hit = True
+                return copy.deepcopy(entry[1])
+            self.stats['misses'] += 1
+            generation = self._generation
+
+        result = call(request)
+
+        expires = now + self.get_ttl(request.service, request.method)
+        with self._lock:
+            if self._generation != generation:
+                # The data may have changed while the call was made
+                return result
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, copy.deepcopy(result))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return result
+
+    def invalidate(self, service=None, method=None):
+        """ Removes cached responses. Without arguments, everything is
+            removed.
+
+        :param string service: only remove responses from this service
+        :param string method: only remove responses from this method
+        """
+        if service is not None:
+            service = _short_service(service)
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries.keys()):
+                if service is not None and key[0] != service:
+                    continue
+                if method is not None and key[1] != method:
+                    continue
+                del self._entries[key]
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        """ Removes every cached response """
+        self.invalidate()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "<ResponseCache: %d entries, %r>" % (len(self), self.stats)
+
+
+class _Flight(object):
+    """ A call in flight and the callers waiting for it """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """ Coalesces identical concurrent calls: while a call is in flight,
+        other threads making the same call wait for it and receive a copy of
+        its result, or its exception, instead of sending another request.
+
+    :param list methods: the methods that may be coalesced, as
+                         'Service.method' patterns. Only methods starting
+                         with 'get' are ever coalesced. Defaults to all of
+                         them: ['*.get*']
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.cache import SingleFlight
+        >>> client = SoftLayer.Client()
+        >>> client.singleflight = SingleFlight()
+        >>> client.singleflight.stats
+        {'calls': 0, 'deduplicated': 0}
+
+    """
+
+    def __init__(self, methods=None):
+        self.methods = methods or ['*.get*']
+        self.stats = {'calls': 0, 'deduplicated': 0}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def run(self, request, call):
+        """ Makes the call, or waits for an identical call already in flight
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        :param call: callable that makes the request (usually the transport)
+        """
+        if request.stream \
+                or not matches(request.service, request.method, self.methods):
+            return call(request)
+
+        key = make_key(request)
+        with self._lock:
+            self.stats['calls'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats['deduplicated'] += 1
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = call(request)
+            with self._lock:
+                del self._flights[key]
+            if flight.waiters:
+                # The caller may change the result it gets back
+                flight.result = copy.deepcopy(result)
+            return result
+        except BaseException as ex:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.error = ex
+            raise
+        finally:
+            flight.done.set()
+
+    def __repr__(self):
+        return "<SingleFlight: %r>" % (self.stats,)
+
+
+def user_cache_dir():
+    """ Returns the directory SoftLayer caches files in for this user """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = (os.environ.get('XDG_CACHE_HOME')
+                or os.path.expanduser('~/.cache'))
+    return os.path.join(base, 'softlayer')
+
+
+def catalog_key(client, key):
+    """ Returns a :class:`CatalogCache` key scoped to the endpoint and user
+        of a client, so catalogs of different accounts or endpoints sharing
+        a cache directory are never mixed up.
+
+    :param client: the :class:`SoftLayer.API.Client` the data comes from
+    :param string key: the key. E.G. package-50
+    """
+    auth = getattr(client, 'auth', None)
+    user = getattr(auth, 'username', None) or getattr(auth, 'user_id', None)
+    scope = '%s %s' % (getattr(client, 'endpoint_url', None), user)
+    digest = hashlib.sha1(scope.encode('utf-8')).hexdigest()
+    return '%s-%s' % (digest[:16], key)
+
+
+class CatalogCache(object):
+    """ Keeps product catalog data in files on disk so it can be reused
+        across processes. Every key is stored as a compact JSON file that is
+        replaced atomically, so concurrent readers always see either the old
+        or the new data. Entries expire ``ttl`` seconds after they were
+        written. Errors reading or writing the files are ignored; the data is
+        simply fetched from the API again. Keys for the data of an account
+        are scoped with :func:`catalog_key`.
+
+    :param string path: the directory to store the files in. Defaults to
+                        :func:`user_cache_dir`
+    :param int ttl: number of seconds an entry stays valid
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.cache import CatalogCache
+        >>> client = SoftLayer.Client()
+        >>> mgr = SoftLayer.HardwareManager(client,
+        ...                                 catalog_cache=CatalogCache())
+        >>> mgr.get_bare_metal_create_options()  # calls the API
+        >>> mgr.get_bare_metal_create_options()  # read from disk
+
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_CATALOG_TTL):
+        self.path = path or user_cache_dir()
+        self.ttl = ttl
+
+    def _filename(self, key):
+        """ Returns the file a key is stored in """
+        return os.path.join(self.path, '%s.json' % key)
+
+    def get(self, key):
+        """ Returns the data stored for the key, or None if there is none or
+            it expired.
+
+        :param string key: the key. E.G. package-50
+        """
+        filename = self._filename(key)
+        try:
+            if os.path.getmtime(filename) + self.ttl <= time.time():
+                return None
+            with open(filename) as cache_file:
+                return json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        """ Stores the data for the key
+
+        :param string key: the key. E.G. package-50
+        :param value: any JSON-serializable data
+        """
+        tmp_name = None
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+            handle, tmp_name = tempfile.mkstemp(dir=self.path, prefix='.tmp-')
+            with os.fdopen(handle, 'w') as cache_file:
+                json.dump(value, cache_file, separators=(',', ':'))
+            getattr(os, 'replace', os.rename)(tmp_name, self._filename(key))
+        except (IOError, OSError):
+            if tmp_name and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def delete(self, key):
+        """ Removes the data stored for the key
+
+        :param string key: the key. E.G. package-50
+        """
+        try:
+            os.remove(self._filename(key))
+        except (IOError, OSError):
+            pass
+
+    def __repr__(self):
+        return "<CatalogCache: %s>" % self.path
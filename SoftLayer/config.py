@@ -22,6 +22,10 @@ def get_client_settings_args(**kwargs):
         'timeout': kwargs.get('timeout'),
         'auth': kwargs.get('auth'),
         'proxy': kwargs.get('proxy'),
+        'pool_connections': kwargs.get('pool_connections'),
+        'pool_maxsize': kwargs.get('pool_maxsize'),
+        'keep_alive': kwargs.get('keep_alive'),
+        'transport': kwargs.get('transport'),
     }
     username = kwargs.get('username')
     api_key = kwargs.get('api_key')
@@ -60,6 +64,10 @@ def get_client_settings_config_file(**kwargs):
         'endpoint_url': '',
         'timeout': '',
         'proxy': '',
+        'pool_connections': '',
+        'pool_maxsize': '',
+        'keep_alive': '',
+        'transport': '',
     })
     config.read(config_files)
 
@@ -70,6 +78,10 @@ def get_client_settings_config_file(**kwargs):
         'endpoint_url': config.get('softlayer', 'endpoint_url'),
         'timeout': config.get('softlayer', 'timeout'),
         'proxy': config.get('softlayer', 'proxy'),
+        'pool_connections': config.get('softlayer', 'pool_connections'),
+        'pool_maxsize': config.get('softlayer', 'pool_maxsize'),
+        'keep_alive': config.get('softlayer', 'keep_alive'),
+        'transport': config.get('softlayer', 'transport'),
     }
     username = config.get('softlayer', 'username')
     api_key = config.get('softlayer', 'api_key')
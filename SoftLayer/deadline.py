@@ -0,0 +1,123 @@
+"""
+    SoftLayer.deadline
+    ~~~~~~~~~~~~~~~~~~
+    Time budgets and cancellation for API calls and manager operations
+
+    :license: MIT, see LICENSE for more details.
+"""
+import threading
+import time
+
+from .exceptions import DeadlineExceeded, TransportTimeout
+
+__all__ = ['Deadline']
+
+
+class Deadline(object):
+    """ A time budget for an operation that may make many API calls, like
+        paging through a large result or waiting for an instance to be
+        ready. It can also be cancelled, from any thread, before it runs
+        out.
+
+        A deadline can be set on a client, where it applies to every call,
+        or passed to a single call or manager method with ``deadline=``.
+        The timeout of each request is shrunk to the time that is left, and
+        once the budget runs out no more requests are sent: calls raise
+        :class:`SoftLayer.exceptions.DeadlineExceeded`, which also stops
+        ``iter_call``, and polling manager methods stop waiting.
+
+    :param float timeout: (optional) seconds from now until the deadline.
+                          Without one, the deadline only ends when it is
+                          cancelled.
+
+    Usage:
+
+        >>> from SoftLayer.deadline import Deadline
+        >>> deadline = Deadline(300)
+        >>> for guest in client['Account'].getVirtualGuests(
+        ...         iter=True, deadline=deadline):
+        ...     guest['id']
+        >>> mgr.wait_for_ready(12345, 600, deadline=deadline)
+
+    """
+
+    def __init__(self, timeout=None):
+        self.expires = None
+        if timeout is not None:
+            self.expires = time.time() + timeout
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """ Ends the deadline now. Waits in :func:`sleep` return at once. """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        """ True when the deadline was cancelled """
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """ Returns the number of seconds left, or None when the deadline
+            has no time limit and wasn't cancelled """
+        if self.cancelled:
+            return 0.0
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.time())
+
+    @property
+    def expired(self):
+        """ True when the time ran out or the deadline was cancelled """
+        return self.remaining() == 0
+
+    def check(self):
+        """ Raises DeadlineExceeded when the deadline expired """
+        if self.expired:
+            if self.cancelled:
+                raise DeadlineExceeded('Operation cancelled')
+            raise DeadlineExceeded('Deadline exceeded')
+
+    def get_timeout(self, timeout=None):
+        """ Returns the timeout for a request that fits in the time left.
+            Raises DeadlineExceeded when there is no time left.
+
+        :param float timeout: (optional) the timeout the request would have
+                              otherwise
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def sleep(self, seconds):
+        """ Waits for the given number of seconds, or until the deadline
+            expires or is cancelled. Returns False if it expired.
+
+        :param float seconds: the number of seconds to wait
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= seconds:
+            self._cancelled.wait(remaining)
+            return False
+        return not self._cancelled.wait(seconds)
+
+    def run(self, request, call):
+        """ Makes the call with its timeout shrunk to the time left
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        :param call: callable that makes the request (usually the transport)
+        """
+        request.timeout = self.get_timeout(request.timeout)
+        try:
+            return call(request)
+        except TransportTimeout:
+            # The request timed out because the time ran out
+            self.check()
+            raise
+
+    def __repr__(self):
+        return "<Deadline: remaining=%r, cancelled=%r>" \
+            % (self.remaining(), self.cancelled)
@@ -55,6 +55,10 @@ class TransportError(SoftLayerAPIError):
     """ Transport Error """
 
 
+class TransportTimeout(TransportError):
+    """ The API didn't respond within the timeout """
+
+
 # XMLRPC Errors
 class NotWellFormed(ParseError):
     """ Request was not well formed """
@@ -94,3 +98,13 @@ class InternalError(ServerError):
 class DNSZoneNotFound(SoftLayerError):
     """ DNS Zone was not found """
     pass
+
+
+class RateLimitExceeded(SoftLayerError):
+    """ A call would have to wait longer than allowed by the rate limiter """
+    pass
+
+
+class DeadlineExceeded(SoftLayerError):
+    """ The time budget of an operation ran out, or it was cancelled """
+    pass
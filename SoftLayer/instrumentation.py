@@ -0,0 +1,242 @@
+"""
+    SoftLayer.instrumentation
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Hooks into each phase of an API call and aggregated call metrics
+
+    :license: MIT, see LICENSE for more details.
+"""
+import math
+import threading
+
+__all__ = ['Instrumentation', 'Histogram', 'MetricsCollector']
+
+PREFIX = 'SoftLayer_'
+
+# Request attributes aggregated by MetricsCollector
+METRICS = ['elapsed', 'serialize_time', 'network_time', 'ttfb', 'parse_time',
+           'request_bytes', 'response_bytes']
+
+PERCENTILES = [50, 95, 99]
+
+
+class Instrumentation(object):
+    """ Hooks called while a client makes an API call. Each hook receives the
+        :class:`SoftLayer.transports.Request` being made, on which the time
+        spent in each phase, sizes, retry count and cache hit are recorded as
+        they become known.
+
+        Hooks can be given as callables or by overriding the methods in a
+        subclass. The default hooks do nothing.
+
+        - before_request: the call is about to be made
+        - after_serialize: the request was encoded. ``serialize_time`` and
+          ``request_bytes`` are set.
+        - after_response: the response arrived. ``network_time``, ``ttfb``
+          and ``response_bytes`` are set.
+        - after_parse: the response was decoded. ``parse_time`` is set.
+        - on_error: the call failed. Also receives the exception.
+        - after_request: the call is over, whether it failed or not.
+          ``elapsed``, ``retries`` and ``cache_hit`` are final.
+        - after_page: a page of an ``iter_call`` was fetched by
+          :class:`SoftLayer.paging.AdaptivePaging`. Also receives the page
+          size it chose for the next page.
+
+        The serialize, response and parse hooks are called once per attempt
+        and aren't called for cache hits.
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.instrumentation import Instrumentation
+        >>> def log_slow_calls(request):
+        ...     if request.elapsed > 5:
+        ...         print(request, request.elapsed, request.ttfb)
+        >>> client = SoftLayer.Client()
+        >>> client.instrumentation = Instrumentation(
+        ...     after_request=log_slow_calls)
+
+    """
+    HOOKS = ['before_request', 'after_serialize', 'after_response',
+             'after_parse', 'on_error', 'after_request', 'after_page']
+
+    def __init__(self, **hooks):
+        invalid_hooks = set(hooks) - set(self.HOOKS)
+        if invalid_hooks:
+            raise TypeError('Invalid hooks: %s' % ','.join(invalid_hooks))
+        for name, hook in hooks.items():
+            setattr(self, name, hook)
+
+    def before_request(self, request):
+        """ Called before the call is made """
+
+    def after_serialize(self, request):
+        """ Called once the request is encoded """
+
+    def after_response(self, request):
+        """ Called once the response arrived """
+
+    def after_parse(self, request):
+        """ Called once the response is decoded """
+
+    def on_error(self, request, error):
+        """ Called when the call failed """
+
+    def after_request(self, request):
+        """ Called when the call is over """
+
+    def after_page(self, request, size):
+        """ Called when an adaptive pager chose the size of the next page """
+
+
+class Histogram(object):
+    """ A histogram using a fixed amount of memory, no matter how many values
+        it records. Values are counted in buckets whose bounds grow
+        geometrically, so percentiles are accurate to within ``growth``.
+
+    :param float minimum: values up to this one share the first bucket
+    :param float maximum: values from this one share the last bucket
+    :param float growth: ratio between the bounds of two buckets
+    """
+
+    def __init__(self, minimum=1e-6, maximum=1e9, growth=1.05):
+        self.minimum = minimum
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts = [0] * (
+            int(math.ceil(math.log(maximum / minimum) / self._log_growth)) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = None
+
+    def record(self, value):
+        """ Adds a value to the histogram """
+        index = 0
+        if value > self.minimum:
+            index = min(len(self.counts) - 1, int(math.ceil(
+                math.log(value / self.minimum) / self._log_growth)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """ Returns the value below which the given percent of the recorded
+            values fall, or None when nothing was recorded.
+
+        :param float percent: E.G. 99
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.max, self.minimum * self.growth ** index)
+
+    @property
+    def mean(self):
+        """ The average of the recorded values """
+        if not self.count:
+            return None
+        return self.total / float(self.count)
+
+    def summary(self):
+        """ Returns the count, mean, maximum and percentiles as a dict """
+        summary = {'count': self.count, 'mean': self.mean, 'max': self.max}
+        for percent in PERCENTILES:
+            summary['p%d' % percent] = self.percentile(percent)
+        return summary
+
+
+class _MethodMetrics(object):
+    """ Metrics of a single service method """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.histograms = dict((metric, Histogram()) for metric in METRICS)
+        self.histograms['page_size'] = Histogram()
+
+
+class MetricsCollector(Instrumentation):
+    """ Aggregates the time spent in each phase of a call, sizes, retries and
+        cache hits for every service method. Timings and sizes are kept in
+        fixed-memory histograms, so it can stay enabled in production.
+
+    Usage:
+
+        >>> from SoftLayer.instrumentation import MetricsCollector
+        >>> client.instrumentation = MetricsCollector()
+        >>> client['Account'].getObject()
+        >>> client.instrumentation.summary()['Account.getObject']['elapsed']
+        {'count': 1, 'mean': 0.43, 'max': 0.43, 'p50': 0.43, ...}
+
+    """
+
+    def __init__(self):
+        super(MetricsCollector, self).__init__()
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def on_error(self, request, error):
+        """ Counts the error """
+        with self._lock:
+            self._get_metrics(request).errors += 1
+
+    def after_request(self, request):
+        """ Records the metrics of the call """
+        with self._lock:
+            metrics = self._get_metrics(request)
+            metrics.calls += 1
+            metrics.retries += request.retries
+            if request.cache_hit:
+                metrics.cache_hits += 1
+            for metric in METRICS:
+                value = getattr(request, metric)
+                if value is not None:
+                    metrics.histograms[metric].record(value)
+
+    def after_page(self, request, size):
+        """ Records the page size chosen by an adaptive pager """
+        with self._lock:
+            self._get_metrics(request).histograms['page_size'].record(size)
+
+    def _get_metrics(self, request):
+        """ Returns the metrics of the request's service method """
+        service = request.service
+        if service.startswith(PREFIX):
+            service = service[len(PREFIX):]
+        name = '%s.%s' % (service, request.method)
+        metrics = self._methods.get(name)
+        if metrics is None:
+            metrics = self._methods[name] = _MethodMetrics()
+        return metrics
+
+    def summary(self):
+        """ Returns the metrics of each method, keyed by 'Service.method'. For
+            every method, the number of calls, errors, retries and cache hits
+            are given along with the count, mean, maximum, p50, p95 and p99
+            of each timing (in seconds) and size (in bytes), and of the page
+            sizes chosen by adaptive pagers. """
+        summary = {}
+        with self._lock:
+            for name, metrics in self._methods.items():
+                method_summary = {
+                    'calls': metrics.calls,
+                    'errors': metrics.errors,
+                    'retries': metrics.retries,
+                    'cache_hits': metrics.cache_hits,
+                }
+                for metric, histogram in metrics.histograms.items():
+                    method_summary[metric] = histogram.summary()
+                summary[name] = method_summary
+        return summary
+
+    def reset(self):
+        """ Forgets all the recorded metrics """
+        with self._lock:
+            self._methods = {}
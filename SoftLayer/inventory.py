@@ -0,0 +1,277 @@
+"""
+    SoftLayer.inventory
+    ~~~~~~~~~~~~~~~~~~~
+    An in-memory, indexed copy of the account's guests and hardware
+
+    :license: MIT, see LICENSE for more details.
+"""
+from datetime import datetime, timedelta
+import threading
+import time
+
+from .masks import Mask
+from .paging import KeysetPaging
+from .utils import Filter, lookup
+
+__all__ = ['Inventory', 'INVENTORY_MASK', 'INDEXES']
+
+# Just enough of each object to build the indexes
+INVENTORY_MASK = Mask(
+    'id',
+    'hostname',
+    'domain',
+    'fullyQualifiedDomainName',
+    'primaryIpAddress',
+    'primaryBackendIpAddress',
+    'datacenter.name',
+    'tagReferences.tag.name',
+    'modifyDate',
+)
+
+# The kinds of objects, with the Account method and filter property that
+# lists them
+KINDS = {
+    'virtual': ('getVirtualGuests', 'virtualGuests'),
+    'hardware': ('getHardware', 'hardware'),
+}
+
+# The values each object is indexed by. Names are indexed in lower case.
+INDEXES = {
+    'id': lambda obj: [obj.get('id')],
+    'hostname': lambda obj: [_lower(obj.get('hostname'))],
+    'fqdn': lambda obj: [_lower(obj.get('fullyQualifiedDomainName'))],
+    'public_ip': lambda obj: [obj.get('primaryIpAddress')],
+    'private_ip': lambda obj: [obj.get('primaryBackendIpAddress')],
+    'datacenter': lambda obj: [_lower(lookup(obj, 'datacenter', 'name'))],
+    'tag': lambda obj: [_lower(lookup(ref, 'tag', 'name'))
+                        for ref in obj.get('tagReferences') or []],
+}
+
+# Format of the modifyDate property, without the UTC offset
+MODIFY_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class Inventory(object):
+    """ An in-memory copy of the guests and hardware on the account, indexed
+        by id, hostname, FQDN, public IP, private IP, datacenter and tag.
+        Everything is loaded once, a page at a time, and later refreshes
+        only ask for the objects modified since the newest one seen. Lookups
+        don't make any API calls once the inventory is loaded.
+
+        An inventory can be passed to :class:`SoftLayer.CCIManager` and
+        :class:`SoftLayer.HardwareManager` to resolve hostnames and IP
+        addresses locally. It can be shared between threads.
+
+    :param client: the client to load the inventory with
+    :param tuple kinds: the kinds of objects to load: 'virtual' for guests,
+                        'hardware' for servers
+    :param mask: the object mask of the loaded objects. The properties the
+                 indexes need are always added.
+    :param integer chunk: the number of objects in each page
+
+    Usage:
+
+        >>> inventory = Inventory(client)
+        >>> [guest['id'] for guest in inventory.find('hostname', 'web1')]
+        [1234]
+        >>> len(inventory.find('tag', 'production', kind='hardware'))
+        12
+        >>> inventory.refresh()
+
+    """
+
+    def __init__(self, client, kinds=('virtual', 'hardware'), mask=None,
+                 chunk=100):
+        for kind in kinds:
+            if kind not in KINDS:
+                raise ValueError('Invalid inventory kind: %s' % kind)
+        self.client = client
+        self.kinds = tuple(kinds)
+        self.mask = INVENTORY_MASK
+        if mask is not None:
+            self.mask = Mask(mask, INVENTORY_MASK)
+        self.chunk = chunk
+        #: When each kind was last loaded or refreshed, as a UNIX timestamp
+        self.updated = {}
+        self._objects = dict((kind, {}) for kind in self.kinds)
+        self._indexes = dict(
+            (kind, dict((name, {}) for name in INDEXES))
+            for kind in self.kinds)
+        self._modified = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self):
+        """ Whether every kind of object has been loaded """
+        return all(kind in self.updated for kind in self.kinds)
+
+    def load(self):
+        """ Loads every object, replacing anything loaded before """
+        for kind in self.kinds:
+            objects = list(self._iter_objects(kind))
+            with self._lock:
+                self._objects[kind] = {}
+                self._indexes[kind] = dict((name, {}) for name in INDEXES)
+                self._modified.pop(kind, None)
+                for obj in objects:
+                    self._add(kind, obj)
+                self.updated[kind] = time.time()
+
+    def refresh(self, prune=False):
+        """ Loads the objects modified since the last load or refresh. Loads
+            everything when nothing has been loaded yet.
+
+        :param bool prune: also drop the objects that are no longer on the
+                           account, which costs a listing of every ID
+        :returns: the number of objects added, changed or dropped
+        """
+        if not self.loaded:
+            self.load()
+            return sum(len(self._objects[kind]) for kind in self.kinds)
+
+        changed = 0
+        for kind in self.kinds:
+            _filter = None
+            modified = self._modified.get(kind)
+            if modified is not None:
+                # Dates are only precise to the second, so the newest second
+                # seen is asked for again
+                _filter = Filter().after(
+                    '%s.modifyDate' % KINDS[kind][1],
+                    modified - timedelta(seconds=1))
+            objects = list(self._iter_objects(kind, _filter))
+
+            live = None
+            if prune:
+                live = set(obj['id'] for obj in self._iter_objects(
+                    kind, mask=Mask('id')))
+
+            with self._lock:
+                for obj in objects:
+                    old = self._objects[kind].get(obj['id'])
+                    if old != obj:
+                        self._remove(kind, obj['id'])
+                        self._add(kind, obj)
+                        changed += 1
+                if live is not None:
+                    for obj_id in list(self._objects[kind]):
+                        if obj_id not in live:
+                            self._remove(kind, obj_id)
+                            changed += 1
+                self.updated[kind] = time.time()
+        return changed
+
+    def get(self, obj_id, kind=None):
+        """ Returns the object with the ID, or None when there isn't one
+
+        :param integer obj_id: the object's ID
+        :param string kind: only look at this kind of object
+        """
+        objects = self.find('id', obj_id, kind=kind)
+        if objects:
+            return objects[0]
+        return None
+
+    def find(self, index, value, kind=None):
+        """ Returns the objects with the value in an index. Loads the
+            inventory first when it hasn't been loaded.
+
+        :param string index: one of id, hostname, fqdn, public_ip,
+                             private_ip, datacenter or tag
+        :param value: the value to look up. Names are matched without regard
+                      to case.
+        :param string kind: only look at this kind of object
+        """
+        if index not in INDEXES:
+            raise ValueError('Invalid inventory index: %s' % index)
+        if not self.loaded:
+            self.load()
+
+        key = _lower(value)
+        results = []
+        with self._lock:
+            for each in self._get_kinds(kind):
+                for obj_id in sorted(
+                        self._indexes[each][index].get(key, ())):
+                    results.append(self._objects[each][obj_id])
+        return results
+
+    def get_ids(self, index, value, kind=None):
+        """ Returns the IDs of the objects with the value in an index. Takes
+            the same arguments as :func:`find`. """
+        return [obj['id'] for obj in self.find(index, value, kind=kind)]
+
+    def __len__(self):
+        return sum(len(self._objects[kind]) for kind in self.kinds)
+
+    def __repr__(self):
+        return "Inventory(%s)" % ', '.join(
+            '%s=%s' % (kind, len(self._objects[kind])) for kind in self.kinds)
+
+    def _get_kinds(self, kind):
+        """ Returns the kinds a lookup looks at """
+        if kind is None:
+            return self.kinds
+        if kind not in self.kinds:
+            raise ValueError('Kind not in the inventory: %s' % kind)
+        return (kind,)
+
+    def _iter_objects(self, kind, _filter=None, mask=None):
+        """ Lists the objects of a kind a page at a time """
+        method, prop = KINDS[kind]
+        kwargs = {
+            'mask': mask or self.mask,
+            'paging': KeysetPaging('%s.id' % prop),
+            # Listings have to see the account as it is now
+            'cache': False,
+        }
+        if _filter is not None:
+            kwargs['filter'] = _filter.to_dict()
+        return self.client.iter_call('Account', method, chunk=self.chunk,
+                                     **kwargs)
+
+    def _add(self, kind, obj):
+        """ Adds an object to the objects and indexes of its kind """
+        self._objects[kind][obj['id']] = obj
+        for name, get_keys in INDEXES.items():
+            index = self._indexes[kind][name]
+            for key in get_keys(obj):
+                if key is not None:
+                    index.setdefault(key, set()).add(obj['id'])
+
+        modified = _parse_modify_date(obj.get('modifyDate'))
+        if modified is not None and (kind not in self._modified
+                                     or modified > self._modified[kind]):
+            self._modified[kind] = modified
+
+    def _remove(self, kind, obj_id):
+        """ Removes an object from the objects and indexes of its kind """
+        obj = self._objects[kind].pop(obj_id, None)
+        if obj is None:
+            return
+        for name, get_keys in INDEXES.items():
+            index = self._indexes[kind][name]
+            for key in get_keys(obj):
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(obj_id)
+                    if not ids:
+                        del index[key]
+
+
+def _lower(value):
+    """ Lower-cases strings, leaving other values alone """
+    if hasattr(value, 'lower'):
+        return value.lower()
+    return value
+
+
+def _parse_modify_date(value):
+    """ Parses a modifyDate property, ignoring its UTC offset. Dates the API
+        returns and takes are all in the API's time zone. """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], MODIFY_DATE_FORMAT)
+    except ValueError:
+        return None
@@ -6,16 +6,96 @@
     :license: MIT, see LICENSE for more details.
 """
 import socket
-from time import sleep
-from itertools import repeat
 
-from SoftLayer.utils import NestedDict, query_filter, IdentifierMixin, lookup
+from SoftLayer.API import Batch, DEFAULT_BATCH_WORKERS
+from SoftLayer.bulk import run_bulk
+from SoftLayer.exceptions import DeadlineExceeded
+from SoftLayer.masks import Mask
+from SoftLayer.paging import KeysetPaging, default_paging
+from SoftLayer.utils import Filter, IdentifierMixin, Poller, is_ready
+
+DEFAULT_INSTANCE_MASK = Mask(
+    'id',
+    'globalIdentifier',
+    'fullyQualifiedDomainName',
+    'hostname',
+    'domain',
+    'createDate',
+    'modifyDate',
+    'provisionDate',
+    'notes',
+    'dedicatedAccountHostOnlyFlag',
+    'privateNetworkOnlyFlag',
+    'primaryBackendIpAddress',
+    'primaryIpAddress',
+    'networkComponents[id, status, speed, maxSpeed, name,'
+    'macAddress, primaryIpAddress, port, primarySubnet]',
+    'lastKnownPowerState.name',
+    'powerState',
+    'status',
+    'maxCpu',
+    'maxMemory',
+    'datacenter',
+    'activeTransaction[id, transactionStatus[friendlyName,name]]',
+    'lastOperatingSystemReload.id',
+    'blockDevices',
+    'blockDeviceTemplateGroup[id, name, globalIdentifier]',
+    'postInstallScriptUri',
+    'userData',
+    'operatingSystem.softwareLicense.'
+    'softwareDescription[manufacturer,name,version,referenceCode]',
+    'operatingSystem.passwords[username,password]',
+    'hourlyBillingFlag',
+    'billingItem.recurringFee',
+    'tagReferences[id,tag[name,id]]',
+    'networkVlans[id,vlanNumber,networkSpace]',
+)
+
+LIST_INSTANCES_MASK = Mask(
+    'id',
+    'globalIdentifier',
+    'hostname',
+    'domain',
+    'fullyQualifiedDomainName',
+    'primaryBackendIpAddress',
+    'primaryIpAddress',
+    'lastKnownPowerState.name',
+    'powerState',
+    'maxCpu',
+    'maxMemory',
+    'datacenter',
+    'activeTransaction.transactionStatus[friendlyName,name]',
+    'status',
+)
+
+# Iterating over the list pages in id order
+LIST_INSTANCES_PAGING = KeysetPaging('virtualGuests.id')
+
+# Just enough to tell whether an instance is ready
+READY_MASK = Mask(
+    'id',
+    'provisionDate',
+    'activeTransaction.id',
+    'lastOperatingSystemReload.id',
+)
+
+# The most instances ordered with one Virtual_Guest::createObjects call
+MAX_CREATE_BATCH = 10
 
 
 class CCIManager(IdentifierMixin, object):
-    """ Manage CCIs """
-    def __init__(self, client):
+    """ Manage CCIs
+
+    :param SoftLayer.API.Client client: an API client instance
+    :param SoftLayer.inventory.Inventory inventory: an optional inventory
+                                                    that hostnames and IP
+                                                    addresses are resolved
+                                                    with before asking the
+                                                    API
+    """
+    def __init__(self, client, inventory=None):
         self.client = client
+        self.inventory = inventory
         self.account = client['Account']
         self.guest = client['Virtual_Guest']
         self.resolvers = [self._get_ids_from_ip, self._get_ids_from_hostname]
@@ -56,23 +136,7 @@ class CCIManager(IdentifierMixin, object):
 
         """
         if 'mask' not in kwargs:
-            items = set([
-                'id',
-                'globalIdentifier',
-                'hostname',
-                'domain',
-                'fullyQualifiedDomainName',
-                'primaryBackendIpAddress',
-                'primaryIpAddress',
-                'lastKnownPowerState.name',
-                'powerState',
-                'maxCpu',
-                'maxMemory',
-                'datacenter',
-                'activeTransaction.transactionStatus[friendlyName,name]',
-                'status',
-            ])
-            kwargs['mask'] = "mask[%s]" % ','.join(items)
+            kwargs['mask'] = LIST_INSTANCES_MASK
 
         call = 'getVirtualGuests'
         if not all([hourly, monthly]):
@@ -81,46 +145,45 @@ class CCIManager(IdentifierMixin, object):
             elif monthly:
                 call = 'getMonthlyVirtualGuests'
 
-        _filter = NestedDict(kwargs.get('filter') or {})
+        _filter = Filter(kwargs.get('filter'))
         if tags:
-            _filter['virtualGuests']['tagReferences']['tag']['name'] = {
-                'operation': 'in',
-                'options': [{'name': 'data', 'value': tags}],
-            }
+            _filter = _filter.where_in(
+                'virtualGuests.tagReferences.tag.name', tags)
 
         if cpus:
-            _filter['virtualGuests']['maxCpu'] = query_filter(cpus)
+            _filter = _filter.where('virtualGuests.maxCpu', cpus)
 
         if memory:
-            _filter['virtualGuests']['maxMemory'] = query_filter(memory)
+            _filter = _filter.where('virtualGuests.maxMemory', memory)
 
         if hostname:
-            _filter['virtualGuests']['hostname'] = query_filter(hostname)
+            _filter = _filter.where('virtualGuests.hostname', hostname)
 
         if domain:
-            _filter['virtualGuests']['domain'] = query_filter(domain)
+            _filter = _filter.where('virtualGuests.domain', domain)
 
         if local_disk is not None:
-            _filter['virtualGuests']['localDiskFlag'] = \
-                query_filter(bool(local_disk))
+            _filter = _filter.where(
+                'virtualGuests.localDiskFlag', bool(local_disk))
 
         if datacenter:
-            _filter['virtualGuests']['datacenter']['name'] = \
-                query_filter(datacenter)
+            _filter = _filter.where(
+                'virtualGuests.datacenter.name', datacenter)
 
         if nic_speed:
-            _filter['virtualGuests']['networkComponents']['maxSpeed'] = \
-                query_filter(nic_speed)
+            _filter = _filter.where(
+                'virtualGuests.networkComponents.maxSpeed', nic_speed)
 
         if public_ip:
-            _filter['virtualGuests']['primaryIpAddress'] = \
-                query_filter(public_ip)
+            _filter = _filter.where(
+                'virtualGuests.primaryIpAddress', public_ip)
 
         if private_ip:
-            _filter['virtualGuests']['primaryBackendIpAddress'] = \
-                query_filter(private_ip)
+            _filter = _filter.where(
+                'virtualGuests.primaryBackendIpAddress', private_ip)
 
         kwargs['filter'] = _filter.to_dict()
+        default_paging(kwargs, LIST_INSTANCES_PAGING, call)
         func = getattr(self.account, call)
         return func(**kwargs)
 
@@ -134,46 +197,29 @@ class CCIManager(IdentifierMixin, object):
         """
 
         if 'mask' not in kwargs:
-            items = set([
-                'id',
-                'globalIdentifier',
-                'fullyQualifiedDomainName',
-                'hostname',
-                'domain',
-                'createDate',
-                'modifyDate',
-                'provisionDate',
-                'notes',
-                'dedicatedAccountHostOnlyFlag',
-                'privateNetworkOnlyFlag',
-                'primaryBackendIpAddress',
-                'primaryIpAddress',
-                'networkComponents[id, status, speed, maxSpeed, name,'
-                'macAddress, primaryIpAddress, port, primarySubnet]',
-                'lastKnownPowerState.name',
-                'powerState',
-                'status',
-                'maxCpu',
-                'maxMemory',
-                'datacenter',
-                'activeTransaction[id, transactionStatus[friendlyName,name]]',
-                'lastOperatingSystemReload.id',
-                'blockDevices',
-                'blockDeviceTemplateGroup[id, name, globalIdentifier]',
-                'postInstallScriptUri',
-                'userData',
-                'operatingSystem.softwareLicense.'
-                'softwareDescription[manufacturer,name,version,referenceCode]',
-                'operatingSystem.passwords[username,password]',
-                'hourlyBillingFlag',
-                'billingItem.recurringFee',
-                'tagReferences[id,tag[name,id]]',
-                'networkVlans[id,vlanNumber,networkSpace]',
-            ])
-            kwargs['mask'] = "mask[%s]" % ','.join(items)
+            kwargs['mask'] = DEFAULT_INSTANCE_MASK
 
         return self.guest.getObject(id=instance_id, **kwargs)
 
+    def get_many(self, instance_ids, max_workers=DEFAULT_BATCH_WORKERS,
+                 **kwargs):
+        """ Get details about many CCI instances concurrently
+
+        :param list instance_ids: the instance IDs
+        :param integer max_workers: the maximum number of calls in flight
+        :returns: A list with the details of each instance, in the order of
+                  instance_ids. An instance that couldn't be retrieved is
+                  replaced by the exception raised for it.
+
+        """
+        if 'mask' not in kwargs:
+            kwargs['mask'] = DEFAULT_INSTANCE_MASK
+
+        batch = Batch(self.client, max_workers=max_workers)
+        for instance_id in instance_ids:
+            batch.call('Virtual_Guest', 'getObject', id=instance_id, **kwargs)
+        return batch.run()
+
     def get_create_options(self):
         """ Retrieves the available options for creating a CCI.
 
@@ -190,6 +236,88 @@ class CCIManager(IdentifierMixin, object):
         """
         return self.guest.deleteObject(id=instance_id)
 
+    def cancel_many(self, instance_ids=None, runner=None, callback=None,
+                    **filters):
+        """ Cancel many instances immediately, deleting all their data.
+
+        :param list instance_ids: the instance IDs to cancel
+        :param runner: a :class:`SoftLayer.bulk.BulkRunner` setting the
+                       concurrency, rate and batches of the cancellations
+        :param callback: a function called with the instance ID and the
+                         result, or exception, of each cancellation
+        :param \\*\\*filters: :func:`list_instances` filters, like tags and
+                            datacenter, selecting the instances when no IDs
+                            are given
+        :returns: a :class:`SoftLayer.bulk.BulkReport`
+
+        ::
+
+            # Cancel every CCI tagged 'staging' in dal05, 20 at a time
+            runner = BulkRunner(batch_size=20)
+            report = cci.cancel_many(tags=['staging'], datacenter='dal05',
+                                     runner=runner)
+            for instance_id, error in report.errors:
+                print(instance_id, error)
+
+        """
+        return run_bulk(self.cancel_instance, instance_ids,
+                        self.list_instances, runner, callback, **filters)
+
+    def reload_many(self, instance_ids=None, post_uri=None, ssh_keys=None,
+                    runner=None, callback=None, **filters):
+        """ Reload the OS of many instances. See :func:`reload_instance` for
+        the reload options and :func:`cancel_many` for the others.
+        """
+        def reload_instance(instance_id):
+            """ Reloads one instance """
+            return self.reload_instance(instance_id, post_uri, ssh_keys)
+
+        return run_bulk(reload_instance, instance_ids, self.list_instances,
+                        runner, callback, **filters)
+
+    def reboot_many(self, instance_ids=None, mode='default', runner=None,
+                    callback=None, **filters):
+        """ Reboot many instances. See :func:`cancel_many` for the other
+        options.
+
+        :param string mode: 'default', 'soft' for a graceful reboot or 'hard'
+                            for an abrupt one
+        """
+        methods = {'default': 'rebootDefault', 'soft': 'rebootSoft',
+                   'hard': 'rebootHard'}
+        if mode not in methods:
+            raise ValueError('Invalid reboot mode: %s' % mode)
+        return self._power_many(methods[mode], instance_ids, runner,
+                                callback, filters)
+
+    def power_off_many(self, instance_ids=None, hard=False, runner=None,
+                       callback=None, **filters):
+        """ Power off many instances. See :func:`cancel_many` for the other
+        options.
+
+        :param bool hard: perform a hard shutdown instead of a soft one
+        """
+        method = 'powerOff' if hard else 'powerOffSoft'
+        return self._power_many(method, instance_ids, runner, callback,
+                                filters)
+
+    def power_on_many(self, instance_ids=None, runner=None, callback=None,
+                      **filters):
+        """ Power on many instances. See :func:`cancel_many` for the
+        options.
+        """
+        return self._power_many('powerOn', instance_ids, runner, callback,
+                                filters)
+
+    def _power_many(self, method, instance_ids, runner, callback, filters):
+        """ Calls a Virtual_Guest power method for many instances """
+        def power(instance_id):
+            """ Calls the power method for one instance """
+            return getattr(self.guest, method)(id=instance_id)
+
+        return run_bulk(power, instance_ids, self.list_instances, runner,
+                        callback, **filters)
+
     def reload_instance(self, instance_id, post_uri=None, ssh_keys=None):
         """ Perform an OS reload of an instance with its current configuration.
 
@@ -293,22 +421,26 @@ class CCIManager(IdentifierMixin, object):
 
         return data
 
-    def wait_for_transaction(self, instance_id, limit, delay=1):
+    def wait_for_transaction(self, instance_id, limit, delay=1,
+                             deadline=None):
         """ Waits on a CCI transaction for the specified amount of time.
         is really just a wrapper for wait_for_ready(pending=True).
         Provided for backwards compatibility.
 
 
         :param int instance_id: The instance ID with the pending transaction
-        :param int limit: The maximum amount of time to wait.
-        :param int delay: The number of seconds to sleep before checks.
-                          Defaults to 1.
+        :param int limit: The maximum number of seconds to wait.
+        :param int delay: The number of seconds to sleep before the first
+                          checks. Defaults to 1.
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`
+                         to stop waiting at
         """
 
         return self.wait_for_ready(instance_id, limit, delay=delay,
-                                   pending=True)
+                                   pending=True, deadline=deadline)
 
-    def wait_for_ready(self, instance_id, limit, delay=1, pending=False):
+    def wait_for_ready(self, instance_id, limit, delay=1, pending=False,
+                       deadline=None, poller=None):
         """ Determine if a CCI is ready and available.  In some cases
         though, that can mean that no transactions are running. The default
         arguments imply a CCI is operational and ready for use by having
@@ -318,38 +450,114 @@ class CCIManager(IdentifierMixin, object):
         transactions such as OS Reloads and cancellations.
 
         :param int instance_id: The instance ID with the pending transaction
-        :param int limit: The maximum amount of time to wait.
-        :param int delay: The number of seconds to sleep before checks.
-                          Defaults to 1.
+        :param int limit: The maximum number of seconds to wait.
+        :param int delay: The number of seconds to sleep before the first
+                          checks. Later checks back off, up to 30 seconds
+                          apart. Defaults to 1.
         :param bool pending: Wait for pending transactions not related to
                              provisioning or reloads such as monitoring.
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`.
+                         Stops waiting, returning False, once it expires or
+                         is cancelled.
+        :param poller: (optional) a :class:`SoftLayer.utils.Poller` that
+                       schedules the checks, in place of limit and delay
         """
-        for count, new_instance in enumerate(repeat(instance_id), start=1):
-            instance = self.get_instance(new_instance)
-            last_reload = lookup(instance, 'lastOperatingSystemReload', 'id')
-            active_transaction = lookup(instance, 'activeTransaction', 'id')
-
-            reloading = all((
-                active_transaction,
-                last_reload,
-                last_reload == active_transaction
-            ))
-
-            # only check for outstanding transactions if requested
-            outstanding = False
-            if pending:
-                outstanding = active_transaction
-
-            # return True if the instance has only if the instance has
-            # finished provisioning and isn't currently reloading the OS.
-            if instance.get('provisionDate') \
-                    and not reloading and not outstanding:
+        if poller is None:
+            poller = Poller(timeout=limit, interval=delay, deadline=deadline)
+        # Every check has to see the instance as it is now
+        kwargs = {'cache': False}
+        if deadline is not None:
+            kwargs['deadline'] = deadline
+
+        for _ in poller:
+            try:
+                instance = self.get_instance(instance_id, **kwargs)
+            except DeadlineExceeded:
+                return False
+
+            if is_ready(instance, pending):
                 return True
+        return False
+
+    def wait_for_ready_many(self, instance_ids, limit, delay=1,
+                            pending=False, deadline=None, callback=None,
+                            poller=None):
+        """ Waits for many CCIs to be ready, as :func:`wait_for_ready` does
+        for one. The instances are checked together with a single listing
+        call for each check, asking only for the properties needed to tell
+        whether they are ready.
+
+        :param list instance_ids: the IDs of the instances to wait for
+        :param int limit: The maximum number of seconds to wait.
+        :param int delay: The number of seconds to sleep before the first
+                          checks. Defaults to 1.
+        :param bool pending: Wait for pending transactions not related to
+                             provisioning or reloads such as monitoring.
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`
+                         to stop waiting at
+        :param callback: (optional) called with the instance ID and whether
+                         it is ready, as soon as that is known for each
+                         instance
+        :param poller: (optional) a :class:`SoftLayer.utils.Poller` that
+                       schedules the checks, in place of limit and delay
+        :returns: A dictionary of whether each instance is ready, keyed by
+                  instance ID.
 
-            if count >= limit:
-                return False
+        ::
 
-            sleep(delay)
+           ids = [guest['id'] for guest in created_guests]
+           ready = mgr.wait_for_ready_many(ids, 600, delay=5)
+           failed = [guest_id for guest_id in ids if not ready[guest_id]]
+
+        """
+        results = {}
+        for instance_id, ready in self.iter_ready(
+                instance_ids, limit, delay=delay, pending=pending,
+                deadline=deadline, poller=poller):
+            results[instance_id] = ready
+            if callback is not None:
+                callback(instance_id, ready)
+        return results
+
+    def iter_ready(self, instance_ids, limit, delay=1, pending=False,
+                   deadline=None, poller=None):
+        """ A generator that waits for many CCIs to be ready. Takes the same
+        arguments as :func:`wait_for_ready_many`. Yields an
+        (instance ID, True) pair for each instance as soon as it is ready.
+        Once the checks run out, an (instance ID, False) pair is yielded for
+        each instance that isn't.
+        """
+        waiting = []
+        for instance_id in instance_ids:
+            if instance_id not in waiting:
+                waiting.append(instance_id)
+
+        if poller is None:
+            poller = Poller(timeout=limit, interval=delay, deadline=deadline)
+        kwargs = {'mask': READY_MASK, 'cache': False}
+        if deadline is not None:
+            kwargs['deadline'] = deadline
+
+        for _ in poller:
+            _filter = Filter().where_in('virtualGuests.id', waiting)
+            try:
+                instances = self.account.getVirtualGuests(
+                    filter=_filter.to_dict(), **kwargs)
+            except DeadlineExceeded:
+                break
+
+            ready = set(instance['id'] for instance in instances
+                        if is_ready(instance, pending))
+            for instance_id in waiting:
+                if instance_id in ready:
+                    yield instance_id, True
+            waiting = [i for i in waiting if i not in ready]
+
+            if not waiting:
+                break
+
+        for instance_id in waiting:
+            yield instance_id, False
 
     def verify_create_instance(self, **kwargs):
         """ Verifies an instance creation command without actually placing an
@@ -395,6 +603,125 @@ class CCIManager(IdentifierMixin, object):
         create_options = self._generate_create_dict(**kwargs)
         return self.guest.createObject(create_options)
 
+    def verify_create_instances(self, specs,
+                                max_workers=DEFAULT_BATCH_WORKERS):
+        """ Verifies the creation of many instances without placing an order.
+        Every spec is checked locally before any of them is sent, then the
+        order templates are generated concurrently.
+
+        :param list specs: a dict of :func:`create_instance` options for each
+                           instance
+        :param integer max_workers: the maximum number of calls in flight
+        :returns: A list with the order template of each instance, in the
+                  order of specs. Raises the error of the first spec that
+                  couldn't be verified.
+
+        """
+        return self._verify_create_dicts(self._generate_create_dicts(specs),
+                                         max_workers)
+
+    def _verify_create_dicts(self, create_options, max_workers):
+        """ Generates the order template of each createObject dict
+            concurrently, raising the first error """
+        batch = Batch(self.client, max_workers=max_workers)
+        for options in create_options:
+            batch.call('Virtual_Guest', 'generateOrderTemplate', options)
+        results = batch.run()
+        for _, error in batch.errors:
+            raise error
+        return results
+
+    def create_instances(self, specs, verify=True, batch_size=MAX_CREATE_BATCH,
+                         max_workers=DEFAULT_BATCH_WORKERS, wait=None,
+                         delay=1, callback=None, deadline=None):
+        """ Creates many CCI instances. See :func:`iter_create_instances` for
+        the arguments.
+
+        :param callback: a function called with the status and the instance
+                         for each step of every instance's progress
+        :returns: A list of the created instances, in the order of specs
+
+        """
+        instances = []
+        for status, instance in self.iter_create_instances(
+                specs, verify=verify, batch_size=batch_size,
+                max_workers=max_workers, wait=wait, delay=delay,
+                deadline=deadline):
+            if status == 'ordered':
+                instances.append(instance)
+            if callback is not None:
+                callback(status, instance)
+        return instances
+
+    def iter_create_instances(self, specs, verify=True,
+                              batch_size=MAX_CREATE_BATCH,
+                              max_workers=DEFAULT_BATCH_WORKERS, wait=None,
+                              delay=1, deadline=None):
+        """ A generator that creates many CCI instances and yields a
+        (status, instance) pair as each instance makes progress. Every spec
+        is checked before anything is ordered. The instances are then ordered
+        with as few Virtual_Guest::createObjects calls as the batch size
+        allows, spread evenly across the calls.
+
+        The statuses are 'ordered', once the instance has been created,
+        'provisioning', once waiting for it has started, and then 'ready' or
+        'not ready'. Instances are only waited for when wait is given.
+
+        :param list specs: a dict of :func:`create_instance` options for each
+                           instance
+        :param bool verify: verify the orders with
+                            :func:`verify_create_instances` first
+        :param integer batch_size: the most instances to order in one call
+        :param integer max_workers: the maximum number of verification calls
+                                    in flight
+        :param int wait: the number of seconds to wait for the instances to
+                         be ready
+        :param int delay: the number of seconds to sleep between checks
+        :param deadline: a :class:`SoftLayer.deadline.Deadline` that ends the
+                         wait early
+
+        Usage::
+
+            specs = [{'hostname': 'web%s' % i, 'domain': 'example.com',
+                      'cpus': 1, 'memory': 1024, 'os_code': 'UBUNTU_LATEST'}
+                     for i in range(1, 21)]
+            for status, instance in cci.iter_create_instances(specs, wait=600):
+                print(instance['hostname'], status)
+
+        """
+        create_options = self._generate_create_dicts(specs)
+        if verify:
+            self._verify_create_dicts(create_options, max_workers)
+
+        instances = []
+        for batch in _split_evenly(create_options, batch_size):
+            for instance in self.guest.createObjects(batch):
+                instances.append(instance)
+                yield 'ordered', instance
+
+        if not wait:
+            return
+
+        for instance in instances:
+            yield 'provisioning', instance
+
+        by_id = dict((instance['id'], instance) for instance in instances)
+        for instance_id, ready in self.iter_ready(
+                list(by_id), wait, delay=delay, deadline=deadline):
+            yield ('ready' if ready else 'not ready'), by_id[instance_id]
+
+    def _generate_create_dicts(self, specs):
+        """ Returns the createObject dict of each spec, raising a ValueError
+            that names the first spec that isn't valid. """
+        create_options = []
+        for index, spec in enumerate(specs):
+            try:
+                create_options.append(self._generate_create_dict(**spec))
+            except ValueError as ex:
+                raise ValueError('Instance %s (%s): %s' % (
+                    index + 1, spec.get('hostname'), ex))
+        return create_options
+
     def change_port_speed(self, instance_id, public, speed):
         """ Allows you to change the port speed of a CCI's NICs.
 
@@ -413,6 +740,10 @@ class CCIManager(IdentifierMixin, object):
 
     def _get_ids_from_hostname(self, hostname):
         """ List CCI ids which match the given hostname """
+        ids = self._get_ids_from_inventory(('hostname',), hostname)
+        if ids:
+            return ids
+
         results = self.list_instances(hostname=hostname, mask="id")
         return [result['id'] for result in results]
 
@@ -424,6 +755,11 @@ class CCIManager(IdentifierMixin, object):
         except socket.error:
             return []
 
+        ids = self._get_ids_from_inventory(('public_ip', 'private_ip'),
+                                           ip_address)
+        if ids:
+            return ids
+
         # Find the CCI via ip address. First try public ip, then private
         results = self.list_instances(public_ip=ip_address, mask="id")
         if results:
@@ -433,6 +769,17 @@ class CCIManager(IdentifierMixin, object):
         if results:
             return [result['id'] for result in results]
 
+    def _get_ids_from_inventory(self, indexes, value):
+        """ List CCI ids which match the value in the first of the inventory
+            indexes that has a match. Empty without an inventory. """
+        if self.inventory is None or 'virtual' not in self.inventory.kinds:
+            return []
+        for index in indexes:
+            ids = self.inventory.get_ids(index, value, kind='virtual')
+            if ids:
+                return ids
+        return []
+
     def edit(self, instance_id, userdata=None, hostname=None, domain=None,
              notes=None):
         """ Edit hostname, domain name, notes, and/or the user data of a CCI
@@ -490,3 +837,16 @@ class CCIManager(IdentifierMixin, object):
 
         return self.guest.createArchiveTransaction(
             name, disks, notes, id=instance_id)
+
+
+def _split_evenly(items, size):
+    """ Splits items into the fewest lists of at most size items, making the
+        lists as close to the same length as possible """
+    count = max(1, -(-len(items) // max(1, size)))
+    base, extra = divmod(len(items), count)
+    start = 0
+    for index in range(count):
+        end = start + base + (1 if index < extra else 0)
+        if end > start:
+            yield items[start:end]
+        start = end
@@ -7,7 +7,7 @@
 """
 from time import strftime
 
-from SoftLayer.utils import NestedDict, query_filter, IdentifierMixin
+from SoftLayer.utils import Filter, query_filter, IdentifierMixin
 
 
 class DNSManager(IdentifierMixin, object):
@@ -119,20 +119,20 @@ class DNSManager(IdentifierMixin, object):
         :returns: A list of dictionaries representing the matching records
                   within the specified zone.
         """
-        _filter = NestedDict()
+        _filter = Filter()
 
         if ttl:
-            _filter['resourceRecords']['ttl'] = query_filter(ttl)
+            _filter = _filter.where('resourceRecords.ttl', ttl)
 
         if host:
-            _filter['resourceRecords']['host'] = query_filter(host)
+            _filter = _filter.where('resourceRecords.host', host)
 
         if data:
-            _filter['resourceRecords']['data'] = query_filter(data)
+            _filter = _filter.where('resourceRecords.data', data)
 
         if record_type:
-            _filter['resourceRecords']['type'] = query_filter(
-                record_type.lower())
+            _filter = _filter.where('resourceRecords.type',
+                                    record_type.lower())
 
         results = self.service.getResourceRecords(
             id=zone_id,
@@ -5,6 +5,21 @@
 
     :license: MIT, see LICENSE for more details.
 """
+from SoftLayer.masks import Mask
+
+FIREWALLS_MASK = Mask({
+    'networkVlans': {
+        'id': None,
+        'vlanNumber': None,
+        'firewallNetworkComponents': None,
+        'networkVlanFirewall': None,
+        'dedicatedFirewallFlag': None,
+        'firewallGuestNetworkComponents': None,
+        'firewallInterfaces': {},
+        'firewallRules': None,
+        'highAvailabilityFirewallFlag': None,
+    }
+})
 
 
 def has_firewall(vlan):
@@ -37,17 +52,6 @@ class FirewallManager(object):
         :returns: A list of firewalls on the current account.
         """
         results = self.client['Account'].getObject(
-            mask={
-                'networkVlans': {
-                    'firewallNetworkComponents': None,
-                    'networkVlanFirewall': None,
-                    'dedicatedFirewallFlag': None,
-                    'firewallGuestNetworkComponents': None,
-                    'firewallInterfaces': {},
-                    'firewallRules': None,
-                    'highAvailabilityFirewallFlag': None,
-                    #'primarySubnet': None,
-                }
-            })['networkVlans']
+            mask=FIREWALLS_MASK)['networkVlans']
 
         return [result for result in results if has_firewall(result)]
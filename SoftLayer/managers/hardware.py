@@ -8,7 +8,66 @@
 # Invalid names are ignored due to long method names and short argument names
 # pylint: disable=C0103
 import socket
-from SoftLayer.utils import NestedDict, query_filter, IdentifierMixin
+from SoftLayer.API import Batch, DEFAULT_BATCH_WORKERS
+from SoftLayer.bulk import run_bulk
+from SoftLayer.cache import catalog_key
+from SoftLayer.masks import Mask
+from SoftLayer.paging import KeysetPaging, default_paging
+from SoftLayer.exceptions import DeadlineExceeded
+from SoftLayer.utils import (
+    Filter, NestedDict, query_filter, IdentifierMixin, Poller, is_ready)
+
+DEFAULT_HARDWARE_MASK = Mask(
+    'id',
+    'globalIdentifier',
+    'fullyQualifiedDomainName',
+    'hostname',
+    'domain',
+    'provisionDate',
+    'hardwareStatus',
+    'processorPhysicalCoreAmount',
+    'memoryCapacity',
+    'notes',
+    'privateNetworkOnlyFlag',
+    'primaryBackendIpAddress',
+    'primaryIpAddress',
+    'networkManagementIpAddress',
+    'userData',
+    'datacenter',
+    'networkComponents[id, status, speed, maxSpeed, name,'
+    'ipmiMacAddress, ipmiIpAddress, macAddress, primaryIpAddress,'
+    'port, primarySubnet]',
+    'networkComponents.primarySubnet[id, netmask,'
+    'broadcastAddress, networkIdentifier, gateway]',
+    'hardwareChassis[id,name]',
+    'activeTransaction[id, transactionStatus[friendlyName,name]]',
+    'operatingSystem.softwareLicense.'
+    'softwareDescription[manufacturer,name,version,referenceCode]',
+    'operatingSystem.passwords[username,password]',
+    'billingItem.recurringFee',
+    'hourlyBillingFlag',
+    'tagReferences[id,tag[name,id]]',
+    'networkVlans[id,vlanNumber,networkSpace]',
+)
+
+LIST_HARDWARE_MASK = Mask(
+    'mask[id, hostname, domain, hardwareStatusId, globalIdentifier,'
+    ' fullyQualifiedDomainName, processorPhysicalCoreAmount, memoryCapacity,'
+    ' primaryBackendIpAddress, primaryIpAddress, datacenter]',
+    'mask(SoftLayer_Hardware_Server)'
+    '[activeTransaction[id, transactionStatus[friendlyName,name]]]',
+)
+
+# Iterating over the list pages in id order
+LIST_HARDWARE_PAGING = KeysetPaging('hardware.id')
+
+# Just enough to tell whether a server is ready
+READY_MASK = Mask(
+    'id',
+    'provisionDate',
+    'activeTransaction.id',
+    'lastOperatingSystemReload.id',
+)
 
 
 class HardwareManager(IdentifierMixin, object):
@@ -16,10 +75,19 @@ class HardwareManager(IdentifierMixin, object):
     Manages hardware devices.
 
     :param SoftLayer.API.Client client: an API client instance
+    :param SoftLayer.cache.CatalogCache catalog_cache: an optional cache for
+                                                       product catalog data
+    :param SoftLayer.inventory.Inventory inventory: an optional inventory
+                                                    that hostnames and IP
+                                                    addresses are resolved
+                                                    with before asking the
+                                                    API
     """
 
-    def __init__(self, client):
+    def __init__(self, client, catalog_cache=None, inventory=None):
         self.client = client
+        self.catalog_cache = catalog_cache
+        self.inventory = inventory
         self.hardware = self.client['Hardware_Server']
         self.account = self.client['Account']
         self.resolvers = [self._get_ids_from_ip, self._get_ids_from_hostname]
@@ -52,6 +120,88 @@ class HardwareManager(IdentifierMixin, object):
                                                               True,
                                                               'HARDWARE')
 
+    def cancel_many(self, hardware_ids=None, reason='unneeded', comment='',
+                    runner=None, callback=None, **filters):
+        """ Cancels many dedicated servers. See :func:`cancel_hardware` for
+        the reason and comment.
+
+        :param list hardware_ids: the IDs of the hardware to cancel
+        :param runner: a :class:`SoftLayer.bulk.BulkRunner` setting the
+                       concurrency, rate and batches of the cancellations
+        :param callback: a function called with the hardware ID and the
+                         result, or exception, of each cancellation
+        :param \\*\\*filters: :func:`list_hardware` filters, like tags and
+                            datacenter, selecting the hardware when no IDs
+                            are given
+        :returns: a :class:`SoftLayer.bulk.BulkReport`
+        """
+        def cancel_hardware(hardware_id):
+            """ Cancels one server """
+            return self.cancel_hardware(hardware_id, reason, comment)
+
+        return run_bulk(cancel_hardware, hardware_ids, self.list_hardware,
+                        runner, callback, **filters)
+
+    def reload_many(self, hardware_ids=None, post_uri=None, ssh_keys=None,
+                    runner=None, callback=None, **filters):
+        """ Reloads the OS of many servers. See :func:`reload` for the reload
+        options and :func:`cancel_many` for the others.
+        """
+        def reload_hardware(hardware_id):
+            """ Reloads one server """
+            return self.reload(hardware_id, post_uri, ssh_keys)
+
+        return run_bulk(reload_hardware, hardware_ids, self.list_hardware,
+                        runner, callback, **filters)
+
+    def reboot_many(self, hardware_ids=None, mode='default', runner=None,
+                    callback=None, **filters):
+        """ Reboots many servers. See :func:`cancel_many` for the other
+        options.
+
+        :param string mode: 'default', 'soft' for a graceful reboot or 'hard'
+                            for an abrupt one
+        """
+        methods = {'default': 'rebootDefault', 'soft': 'rebootSoft',
+                   'hard': 'rebootHard'}
+        if mode not in methods:
+            raise ValueError('Invalid reboot mode: %s' % mode)
+        return self._power_many(methods[mode], hardware_ids, runner,
+                                callback, filters)
+
+    def power_off_many(self, hardware_ids=None, runner=None, callback=None,
+                       **filters):
+        """ Powers off many servers. See :func:`cancel_many` for the
+        options.
+        """
+        return self._power_many('powerOff', hardware_ids, runner, callback,
+                                filters)
+
+    def power_on_many(self, hardware_ids=None, runner=None, callback=None,
+                      **filters):
+        """ Powers on many servers. See :func:`cancel_many` for the
+        options.
+        """
+        return self._power_many('powerOn', hardware_ids, runner, callback,
+                                filters)
+
+    def power_cycle_many(self, hardware_ids=None, runner=None, callback=None,
+                         **filters):
+        """ Power cycles many servers. See :func:`cancel_many` for the
+        options.
+        """
+        return self._power_many('powerCycle', hardware_ids, runner, callback,
+                                filters)
+
+    def _power_many(self, method, hardware_ids, runner, callback, filters):
+        """ Calls a Hardware_Server power method for many servers """
+        def power(hardware_id):
+            """ Calls the power method for one server """
+            return getattr(self.hardware, method)(id=hardware_id)
+
+        return run_bulk(power, hardware_ids, self.list_hardware, runner,
+                        callback, **filters)
+
     def cancel_metal(self, hardware_id, immediate=False):
         """ Cancels the specified bare metal instance.
 
@@ -93,70 +243,49 @@ class HardwareManager(IdentifierMixin, object):
 
         """
         if 'mask' not in kwargs:
-            hw_items = set([
-                'id',
-                'hostname',
-                'domain',
-                'hardwareStatusId',
-                'globalIdentifier',
-                'fullyQualifiedDomainName',
-                'processorPhysicalCoreAmount',
-                'memoryCapacity',
-                'primaryBackendIpAddress',
-                'primaryIpAddress',
-                'datacenter',
-            ])
-            server_items = set([
-                'activeTransaction[id, transactionStatus[friendlyName,name]]',
-            ])
-
-            kwargs['mask'] = '[mask[%s],' \
-                             ' mask(SoftLayer_Hardware_Server)[%s]]' % \
-                             (','.join(hw_items),
-                              ','.join(server_items))
-
-        _filter = NestedDict(kwargs.get('filter') or {})
+            kwargs['mask'] = LIST_HARDWARE_MASK
+
+        _filter = Filter(kwargs.get('filter'))
         if tags:
-            _filter['hardware']['tagReferences']['tag']['name'] = {
-                'operation': 'in',
-                'options': [{'name': 'data', 'value': tags}],
-            }
+            _filter = _filter.where_in(
+                'hardware.tagReferences.tag.name', tags)
 
         if cpus:
-            _filter['hardware']['processorPhysicalCoreAmount'] = \
-                query_filter(cpus)
+            _filter = _filter.where(
+                'hardware.processorPhysicalCoreAmount', cpus)
 
         if memory:
-            _filter['hardware']['memoryCapacity'] = query_filter(memory)
+            _filter = _filter.where('hardware.memoryCapacity', memory)
 
         if hostname:
-            _filter['hardware']['hostname'] = query_filter(hostname)
+            _filter = _filter.where('hardware.hostname', hostname)
 
         if domain:
-            _filter['hardware']['domain'] = query_filter(domain)
+            _filter = _filter.where('hardware.domain', domain)
 
         if datacenter:
-            _filter['hardware']['datacenter']['name'] = \
-                query_filter(datacenter)
+            _filter = _filter.where('hardware.datacenter.name', datacenter)
 
         if nic_speed:
-            _filter['hardware']['networkComponents']['maxSpeed'] = \
-                query_filter(nic_speed)
+            _filter = _filter.where(
+                'hardware.networkComponents.maxSpeed', nic_speed)
 
         if public_ip:
-            _filter['hardware']['primaryIpAddress'] = \
-                query_filter(public_ip)
+            _filter = _filter.where('hardware.primaryIpAddress', public_ip)
 
         if private_ip:
-            _filter['hardware']['primaryBackendIpAddress'] = \
-                query_filter(private_ip)
+            _filter = _filter.where(
+                'hardware.primaryBackendIpAddress', private_ip)
 
         kwargs['filter'] = _filter.to_dict()
+        default_paging(kwargs, LIST_HARDWARE_PAGING, 'getHardware')
         return self.account.getHardware(**kwargs)
 
-    def get_bare_metal_create_options(self):
+    def get_bare_metal_create_options(self, refresh=False):
         """ Retrieves the available options for creating a bare metal server.
 
+        :param bool refresh: ignore the catalog cache and fetch the options
+                             from the API
         :returns: A dictionary of creation options. The categories to order are
                   contained within the 'categories' key. See
                   :func:`_parse_package_data` for detailed information.
@@ -166,20 +295,22 @@ class HardwareManager(IdentifierMixin, object):
            The information for ordering bare metal instances comes from
            multiple API calls. In order to make the process easier, this
            function will make those calls and reformat the results into a
-           dictionary that's easier to manage. It's recommended that you cache
-           these results with a reasonable lifetime for performance reasons.
+           dictionary that's easier to manage. Pass a catalog cache to the
+           manager to keep these results on disk between runs.
         """
-        hw_id = self._get_bare_metal_package_id()
+        hw_id = self._get_bare_metal_package_id(refresh=refresh)
 
         if not hw_id:
             return None
 
-        return self._parse_package_data(hw_id)
+        return self._parse_package_data(hw_id, refresh=refresh)
 
-    def get_available_dedicated_server_packages(self):
+    def get_available_dedicated_server_packages(self, deadline=None):
         """ Retrieves a list of packages that are available for ordering
         dedicated servers.
 
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`
+                         for the lookups
         :returns: A list of tuples of available dedicated server packages in
                   the form (id, name, description)
         """
@@ -193,10 +324,14 @@ class HardwareManager(IdentifierMixin, object):
 
         package_obj = self.client['Product_Package']
         packages = []
+        kwargs = {}
+        if deadline is not None:
+            kwargs['deadline'] = deadline
 
         for package_id in package_ids:
             package = package_obj.getObject(id=package_id,
-                                            mask='mask[id, name, description]')
+                                            mask='mask[id, name, description]',
+                                            **kwargs)
 
             if package.get('name'):
                 packages.append((package['id'], package['name'],
@@ -204,13 +339,15 @@ class HardwareManager(IdentifierMixin, object):
 
         return packages
 
-    def get_dedicated_server_create_options(self, package_id):
+    def get_dedicated_server_create_options(self, package_id, refresh=False):
         """ Retrieves the available options for creating a dedicated server in
         a specific chassis (based on package ID).
 
         :param int package_id: The package ID to retrieve the creation options
                                for. This should come from
                                :func:`get_available_dedicated_server_packages`.
+        :param bool refresh: ignore the catalog cache and fetch the options
+                             from the API
         :returns: A dictionary of creation options. The categories to order are
                   contained within the 'categories' key. See
                   :func:`_parse_package_data` for detailed information.
@@ -220,10 +357,10 @@ class HardwareManager(IdentifierMixin, object):
            The information for ordering dedicated servers comes from multiple
            API calls. In order to make the process simpler, this function will
            make those calls and reformat the results into a dictionary that's
-           easier to manage. It's recommended that you cache these results with
-           a reasonable lifetime for performance reasons.
+           easier to manage. Pass a catalog cache to the manager to keep these
+           results on disk between runs.
         """
-        return self._parse_package_data(package_id)
+        return self._parse_package_data(package_id, refresh=refresh)
 
     def get_hardware(self, hardware_id, **kwargs):
         """ Get details about a hardware device
@@ -235,42 +372,30 @@ class HardwareManager(IdentifierMixin, object):
         """
 
         if 'mask' not in kwargs:
-            items = set([
-                'id',
-                'globalIdentifier',
-                'fullyQualifiedDomainName',
-                'hostname',
-                'domain',
-                'provisionDate',
-                'hardwareStatus',
-                'processorPhysicalCoreAmount',
-                'memoryCapacity',
-                'notes',
-                'privateNetworkOnlyFlag',
-                'primaryBackendIpAddress',
-                'primaryIpAddress',
-                'networkManagementIpAddress',
-                'userData',
-                'datacenter',
-                'networkComponents[id, status, speed, maxSpeed, name,'
-                'ipmiMacAddress, ipmiIpAddress, macAddress, primaryIpAddress,'
-                'port, primarySubnet]',
-                'networkComponents.primarySubnet[id, netmask,'
-                'broadcastAddress, networkIdentifier, gateway]',
-                'hardwareChassis[id,name]',
-                'activeTransaction[id, transactionStatus[friendlyName,name]]',
-                'operatingSystem.softwareLicense.'
-                'softwareDescription[manufacturer,name,version,referenceCode]',
-                'operatingSystem.passwords[username,password]',
-                'billingItem.recurringFee',
-                'hourlyBillingFlag',
-                'tagReferences[id,tag[name,id]]',
-                'networkVlans[id,vlanNumber,networkSpace]',
-            ])
-            kwargs['mask'] = "mask[%s]" % ','.join(items)
+            kwargs['mask'] = DEFAULT_HARDWARE_MASK
 
         return self.hardware.getObject(id=hardware_id, **kwargs)
 
+    def get_many(self, hardware_ids, max_workers=DEFAULT_BATCH_WORKERS,
+                 **kwargs):
+        """ Get details about many hardware devices concurrently
+
+        :param list hardware_ids: the hardware IDs
+        :param integer max_workers: the maximum number of calls in flight
+        :returns: A list with the details of each server, in the order of
+                  hardware_ids. A server that couldn't be retrieved is
+                  replaced by the exception raised for it.
+
+        """
+        if 'mask' not in kwargs:
+            kwargs['mask'] = DEFAULT_HARDWARE_MASK
+
+        batch = Batch(self.client, max_workers=max_workers)
+        for hardware_id in hardware_ids:
+            batch.call('Hardware_Server', 'getObject', id=hardware_id,
+                       **kwargs)
+        return batch.run()
+
     def reload(self, hardware_id, post_uri=None, ssh_keys=None):
         """ Perform an OS reload of a server with its current configuration.
 
@@ -291,6 +416,39 @@ class HardwareManager(IdentifierMixin, object):
         return self.hardware.reloadOperatingSystem('FORCE', config,
                                                    id=hardware_id)
 
+    def wait_for_ready(self, hardware_id, limit, delay=10, pending=False,
+                       deadline=None, poller=None):
+        """ Waits for a server to finish provisioning or reloading its OS.
+        Checks are made every ``delay`` seconds at first and back off, up to
+        30 seconds apart.
+
+        :param int hardware_id: The ID of the server
+        :param int limit: The maximum number of seconds to wait.
+        :param int delay: The number of seconds to sleep before the first
+                          checks. Defaults to 10.
+        :param bool pending: Also wait for any other active transaction.
+        :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`
+                         to stop waiting at
+        :param poller: (optional) a :class:`SoftLayer.utils.Poller` that
+                       schedules the checks, in place of limit and delay
+        :returns: True if the server is ready, False if waiting ran out
+        """
+        if poller is None:
+            poller = Poller(timeout=limit, interval=delay, deadline=deadline)
+        kwargs = {'mask': READY_MASK, 'cache': False}
+        if deadline is not None:
+            kwargs['deadline'] = deadline
+
+        for _ in poller:
+            try:
+                server = self.hardware.getObject(id=hardware_id, **kwargs)
+            except DeadlineExceeded:
+                return False
+
+            if is_ready(server, pending):
+                return True
+        return False
+
     def change_port_speed(self, hardware_id, public, speed):
         """ Allows you to change the port speed of a server's NICs.
 
@@ -554,8 +712,14 @@ class HardwareManager(IdentifierMixin, object):
 
         return order
 
-    def _get_bare_metal_package_id(self):
+    def _get_bare_metal_package_id(self, refresh=False):
         """ Return the bare metal package id """
+        key = catalog_key(self.client, 'bare-metal-package-id')
+        if self.catalog_cache is not None and not refresh:
+            hw_id = self.catalog_cache.get(key)
+            if hw_id:
+                return hw_id
+
         packages = self.client['Product_Package'].getAllObjects(
             mask='mask[id, name]',
             filter={'name': query_filter('Bare Metal Instance')})
@@ -566,10 +730,16 @@ class HardwareManager(IdentifierMixin, object):
                 hw_id = package['id']
                 break
 
+        if self.catalog_cache is not None and hw_id:
+            self.catalog_cache.set(key, hw_id)
         return hw_id
 
     def _get_ids_from_hostname(self, hostname):
         """ Returns list of matching hardware IDs for a given hostname """
+        ids = self._get_ids_from_inventory(('hostname',), hostname)
+        if ids:
+            return ids
+
         results = self.list_hardware(hostname=hostname, mask="id")
         return [result['id'] for result in results]
 
@@ -581,6 +751,10 @@ class HardwareManager(IdentifierMixin, object):
         except socket.error:
             return []
 
+        ids = self._get_ids_from_inventory(('public_ip', 'private_ip'), ip)
+        if ids:
+            return ids
+
         # Find the server via ip address. First try public ip, then private
         results = self.list_hardware(public_ip=ip, mask="id")
         if results:
@@ -590,7 +764,19 @@ class HardwareManager(IdentifierMixin, object):
         if results:
             return [result['id'] for result in results]
 
-    def _parse_package_data(self, package_id):
+    def _get_ids_from_inventory(self, indexes, value):
+        """ Returns list of hardware IDs matching the value in the first of
+            the inventory indexes that has a match. Empty without an
+            inventory. """
+        if self.inventory is None or 'hardware' not in self.inventory.kinds:
+            return []
+        for index in indexes:
+            ids = self.inventory.get_ids(index, value, kind='hardware')
+            if ids:
+                return ids
+        return []
+
+    def _parse_package_data(self, package_id, refresh=False):
         """
         Parses data from the specified package into a consistent dictionary.
 
@@ -632,7 +818,16 @@ class HardwareManager(IdentifierMixin, object):
         Your code can rely upon each of those elements always being present.
         Each list will contain at least one entry as well, though most will
         contain more than one.
+
+        When the manager has a catalog cache, the result is read from it
+        unless ``refresh`` is True, and stored in it after being built.
         """
+        key = catalog_key(self.client, 'package-%s' % package_id)
+        if self.catalog_cache is not None and not refresh:
+            results = self.catalog_cache.get(key)
+            if results is not None:
+                return results
+
         package = self.client['Product_Package']
 
         results = {
@@ -691,6 +886,8 @@ class HardwareManager(IdentifierMixin, object):
                     })
             results['categories'][code]['items'] = items
 
+        if self.catalog_cache is not None:
+            self.catalog_cache.set(key, results)
         return results
 
     def edit(self, hardware_id, userdata=None, hostname=None, domain=None,
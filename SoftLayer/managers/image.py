@@ -6,10 +6,11 @@
     :license: MIT, see LICENSE for more details.
 """
 
-from SoftLayer.utils import query_filter, NestedDict, IdentifierMixin
+from SoftLayer.masks import Mask
+from SoftLayer.utils import Filter, IdentifierMixin
 
-IMAGE_MASK = ('id,accountId,name,globalIdentifier,blockDevices,parentId,'
-              'createDate')
+IMAGE_MASK = Mask('id,accountId,name,globalIdentifier,blockDevices,parentId,'
+                  'createDate')
 
 
 class ImageManager(IdentifierMixin, object):
@@ -53,14 +54,14 @@ class ImageManager(IdentifierMixin, object):
         if 'mask' not in kwargs:
             kwargs['mask'] = IMAGE_MASK
 
-        _filter = NestedDict(kwargs.get('filter') or {})
+        _filter = Filter(kwargs.get('filter'))
         if name:
-            _filter['privateBlockDeviceTemplateGroups']['name'] = \
-                query_filter(name)
+            _filter = _filter.where('privateBlockDeviceTemplateGroups.name',
+                                    name)
 
         if guid:
-            _filter['privateBlockDeviceTemplateGroups']['globalIdentifier'] = \
-                query_filter(guid)
+            _filter = _filter.where(
+                'privateBlockDeviceTemplateGroups.globalIdentifier', guid)
 
         kwargs['filter'] = _filter.to_dict()
 
@@ -77,12 +78,12 @@ class ImageManager(IdentifierMixin, object):
         if 'mask' not in kwargs:
             kwargs['mask'] = IMAGE_MASK
 
-        _filter = NestedDict(kwargs.get('filter') or {})
+        _filter = Filter(kwargs.get('filter'))
         if name:
-            _filter['name'] = query_filter(name)
+            _filter = _filter.where('name', name)
 
         if guid:
-            _filter['globalIdentifier'] = query_filter(guid)
+            _filter = _filter.where('globalIdentifier', guid)
 
         kwargs['filter'] = _filter.to_dict()
 
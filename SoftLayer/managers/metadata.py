@@ -5,7 +5,7 @@
 
     :license: MIT, see LICENSE for more details.
 """
-from SoftLayer.transports import make_rest_api_call
+from SoftLayer.transports import make_rest_api_call, make_session
 from SoftLayer.consts import API_PRIVATE_ENDPOINT_REST, USER_AGENT
 from SoftLayer.exceptions import SoftLayerAPIError, SoftLayerError
 
@@ -57,6 +57,8 @@ class MetadataManager(object):
         self.url = API_PRIVATE_ENDPOINT_REST.rstrip('/')
         self.timeout = timeout
         self.client = client
+        # Share the client's connection pool when there is one
+        self.session = getattr(client, 'session', None) or make_session()
 
     def make_request(self, path):
         """ Make a request against the metadata service
@@ -67,7 +69,8 @@ class MetadataManager(object):
         try:
             return make_rest_api_call('GET', url,
                                       http_headers={'User-Agent': USER_AGENT},
-                                      timeout=self.timeout)
+                                      timeout=self.timeout,
+                                      session=self.session)
         except SoftLayerAPIError as ex:
             if ex.faultCode == 404:
                 return None
@@ -6,20 +6,21 @@
     :license: MIT, see LICENSE for more details.
 """
 
-from SoftLayer.utils import NestedDict, query_filter, resolve_ids, lookup
-
-DEFAULT_SUBNET_MASK = ','.join(['hardware',
-                                'datacenter',
-                                'ipAddressCount',
-                                'virtualGuests'])
-DEFAULT_VLAN_MASK = ','.join(['firewallInterfaces',
-                              'hardware',
-                              'networkComponents',
-                              'primaryRouter'  # Lack of comma intential
-                              '[id, fullyQualifiedDomainName, datacenter]',
-                              'subnets',
-                              'totalPrimaryIpAddressCount',
-                              'virtualGuests'])
+from SoftLayer.masks import Mask
+from SoftLayer.utils import Filter, resolve_ids, lookup
+
+DEFAULT_SUBNET_MASK = Mask('hardware',
+                           'datacenter',
+                           'ipAddressCount',
+                           'virtualGuests')
+DEFAULT_VLAN_MASK = Mask('firewallInterfaces',
+                         'hardware',
+                         'networkComponents',
+                         'primaryRouter[id, fullyQualifiedDomainName,'
+                         ' datacenter]',
+                         'subnets',
+                         'totalPrimaryIpAddressCount',
+                         'virtualGuests')
 
 
 class NetworkManager(object):
@@ -213,15 +214,16 @@ class NetworkManager(object):
                     'ipAddress']
             kwargs['mask'] = ','.join(mask)
 
-        _filter = NestedDict({})
+        _filter = Filter()
 
         if version:
-            ver = query_filter(version)
-            _filter['globalIpRecords']['ipAddress']['subnet']['version'] = ver
+            _filter = _filter.where(
+                'globalIpRecords.ipAddress.subnet.version', version)
 
         if identifier:
-            subnet_filter = _filter['globalIpRecords']['ipAddress']['subnet']
-            subnet_filter['networkIdentifier'] = query_filter(identifier)
+            _filter = _filter.where(
+                'globalIpRecords.ipAddress.subnet.networkIdentifier',
+                identifier)
 
         kwargs['filter'] = _filter.to_dict()
         return self.account.getGlobalIpRecords(**kwargs)
@@ -245,20 +247,19 @@ class NetworkManager(object):
         if 'mask' not in kwargs:
             kwargs['mask'] = DEFAULT_SUBNET_MASK
 
-        _filter = NestedDict(kwargs.get('filter') or {})
+        _filter = Filter(kwargs.get('filter'))
 
         if identifier:
-            _filter['subnets']['networkIdentifier'] = query_filter(identifier)
+            _filter = _filter.where('subnets.networkIdentifier', identifier)
         if datacenter:
-            _filter['subnets']['datacenter']['name'] = \
-                query_filter(datacenter)
+            _filter = _filter.where('subnets.datacenter.name', datacenter)
         if version:
-            _filter['subnets']['version'] = query_filter(version)
+            _filter = _filter.where('subnets.version', version)
         if subnet_type:
-            _filter['subnets']['subnetType'] = query_filter(subnet_type)
+            _filter = _filter.where('subnets.subnetType', subnet_type)
         else:
             # This filters out global IPs from the subnet listing.
-            _filter['subnets']['subnetType'] = {'operation': '!= GLOBAL_IP'}
+            _filter = _filter.where_not('subnets.subnetType', 'GLOBAL_IP')
 
         kwargs['filter'] = _filter.to_dict()
 
@@ -280,17 +281,17 @@ class NetworkManager(object):
         :param dict \\*\\*kwargs: response-level options (mask, limit, etc.)
 
         """
-        _filter = NestedDict(kwargs.get('filter') or {})
+        _filter = Filter(kwargs.get('filter'))
 
         if vlan_number:
-            _filter['networkVlans']['vlanNumber'] = query_filter(vlan_number)
+            _filter = _filter.where('networkVlans.vlanNumber', vlan_number)
 
         if name:
-            _filter['networkVlans']['name'] = query_filter(name)
+            _filter = _filter.where('networkVlans.name', name)
 
         if datacenter:
-            _filter['networkVlans']['primaryRouter']['datacenter']['name'] = \
-                query_filter(datacenter)
+            _filter = _filter.where(
+                'networkVlans.primaryRouter.datacenter.name', datacenter)
 
         kwargs['filter'] = _filter.to_dict()
 
@@ -6,7 +6,7 @@
     :license: MIT, see LICENSE for more details.
 """
 
-from SoftLayer.utils import IdentifierMixin, NestedDict, query_filter
+from SoftLayer.utils import Filter, IdentifierMixin
 
 
 class SshKeyManager(IdentifierMixin, object):
@@ -76,9 +76,9 @@ class SshKeyManager(IdentifierMixin, object):
         :param string label: Filter list based on SSH key label
         :returns: A list of dictionaries with information about each key
         """
-        _filter = NestedDict({})
+        _filter = Filter()
         if label:
-            _filter['sshKeys']['label'] = query_filter(label)
+            _filter = _filter.where('sshKeys.label', label)
 
         return self.client['Account'].getSshKeys(filter=_filter.to_dict())
 
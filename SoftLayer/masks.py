@@ -0,0 +1,284 @@
+"""
+    SoftLayer.masks
+    ~~~~~~~~~~~~~~~
+    Object masks
+
+    :license: MIT, see LICENSE for more details.
+"""
+import re
+
+from .utils import string_types
+
+__all__ = ['Mask', 'format_mask']
+
+MASK_CACHE_SIZE = 1000
+
+TOKEN_RE = re.compile(r'\s*(?:(\w+)|([\[\](),.]))\s*')
+
+# Formatted string masks, keyed by the mask as given
+_FORMATTED = {}
+
+# Marks a relational property that was also named on its own, which asks for
+# all of its local properties. It can't clash with a property name.
+WHOLE = '*'
+
+
+class Mask(object):
+    """ An object mask. Masks are parsed from the string form
+        (``'mask[id,datacenter.name]'``, ``'id,datacenter[name]'`` or
+        ``'[mask[id],mask(SoftLayer_Hardware_Server)[bandwidth]]'``) or the
+        dict form (``{'datacenter': {'name': None}}``) and may be combined.
+        Property paths that are requested more than once, or that share a
+        parent, are merged, so every property is requested once. A
+        relational property that is named on its own keeps asking for all of
+        its local properties when child properties are merged into it.
+
+        ``str(mask)`` is the canonical form that is sent to the API:
+        properties are sorted and parents with a single child are written
+        as a dotted path. It is only built once for each mask.
+
+    :param \\*masks: string masks, dict masks or :class:`Mask` objects to
+                    combine
+
+    Usage:
+
+        >>> from SoftLayer.masks import Mask
+        >>> mask = Mask('id, datacenter.name', 'datacenter[longName], id')
+        >>> str(mask)
+        'mask[datacenter[longName,name],id]'
+        >>> str(mask + {'tagReferences': {'tag': None}})
+        'mask[datacenter[longName,name],id,tagReferences.tag]'
+
+    """
+
+    def __init__(self, *masks):
+        # Property trees, keyed by the type the mask applies to. None is the
+        # type of the object being requested.
+        self._scopes = {}
+        self._text = None
+        for mask in masks:
+            if isinstance(mask, Mask):
+                for scope, tree in mask._scopes.items():
+                    _merge(self._scopes.setdefault(scope, {}), tree)
+            elif isinstance(mask, dict):
+                _merge(self._scopes.setdefault(None, {}), _parse_dict(mask))
+            elif isinstance(mask, string_types):
+                for scope, tree in _Parser(mask).parse():
+                    _merge(self._scopes.setdefault(scope, {}), tree)
+            else:
+                raise TypeError("Invalid object mask: %r" % (mask,))
+
+    def __add__(self, other):
+        return Mask(self, other)
+
+    __or__ = __add__
+
+    def __radd__(self, other):
+        return Mask(other, self)
+
+    def __str__(self):
+        if self._text is None:
+            masks = []
+            for scope in sorted(self._scopes, key=lambda s: (s is not None,
+                                                             s)):
+                properties = _format(self._scopes[scope])
+                if scope is None:
+                    masks.append('mask[%s]' % properties)
+                else:
+                    masks.append('mask(%s)[%s]' % (scope, properties))
+            if list(self._scopes) in ([], [None]):
+                self._text = masks[0] if masks else 'mask[]'
+            else:
+                self._text = '[%s]' % ','.join(masks)
+        return self._text
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, Mask) + string_types):
+            try:
+                return str(self) == format_mask(other)
+            except (TypeError, ValueError):
+                return False
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return "Mask(%r)" % str(self)
+
+
+def format_mask(mask):
+    """ Returns the canonical string form of an object mask. String masks
+        are only parsed the first time they're seen. Masks using syntax that
+        :class:`Mask` doesn't know are returned as they are, wrapped in
+        ``mask[...]`` when needed.
+
+    :param mask: a string mask, dict mask or :class:`Mask`
+    """
+    if isinstance(mask, Mask):
+        return str(mask)
+    if isinstance(mask, dict):
+        return str(Mask(mask))
+
+    formatted = _FORMATTED.get(mask)
+    if formatted is None:
+        try:
+            formatted = str(Mask(mask))
+        except ValueError:
+            formatted = mask.strip()
+            if not formatted.startswith('mask') \
+                    and not formatted.startswith('['):
+                formatted = "mask[%s]" % formatted
+        if len(_FORMATTED) >= MASK_CACHE_SIZE:
+            _FORMATTED.clear()
+        _FORMATTED[mask] = formatted
+    return formatted
+
+
+def _merge(tree, other):
+    """ Adds every property path of the other tree to the tree. A property
+        that is named on its own in one tree and has children in the other
+        is marked as WHOLE, so its local properties are still asked for. """
+    for name, children in other.items():
+        node = tree.get(name)
+        if node is None:
+            tree[name] = _merge({}, children)
+            continue
+        if bool(node) != bool(children):
+            node[WHOLE] = {}
+        _merge(node, children)
+    return tree
+
+
+def _path_tree(names, children):
+    """ Returns a tree with the children at the end of a property path """
+    tree = children
+    for name in reversed(names):
+        tree = {name: tree}
+    return tree
+
+
+def _parse_dict(mask):
+    """ Converts a dict mask into a property tree """
+    tree = {}
+    for key, value in mask.items():
+        children = {}
+        if isinstance(value, dict):
+            children = _parse_dict(value)
+        _merge(tree, _path_tree(key.split('.'), children))
+    return tree
+
+
+def _format(tree):
+    """ Formats a property tree as a list of properties """
+    properties = []
+    for name in sorted(tree):
+        if name == WHOLE:
+            continue
+        path, children = name, tree[name]
+        while len(children) == 1 and WHOLE not in children:
+            child = list(children)[0]
+            path, children = '%s.%s' % (path, child), children[child]
+        if WHOLE in children:
+            # Named on its own and with children: ask for both
+            properties.append(path)
+        if [child for child in children if child != WHOLE]:
+            path = '%s[%s]' % (path, _format(children))
+        elif WHOLE in children:
+            continue
+        properties.append(path)
+    return ','.join(properties)
+
+
+class _Parser(object):
+    """ Parses string masks into (type, property tree) pairs """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = TOKEN_RE.match(text, position)
+            if match is None:
+                raise ValueError("Invalid object mask %r at %r"
+                                 % (self.text, text[position:]))
+            self.tokens.append(match.group(1) or match.group(2))
+            position = match.end()
+        self.position = 0
+
+    def peek(self, offset=0):
+        """ Returns an upcoming token, or None at the end of the mask """
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return None
+
+    def take(self, expected=None):
+        """ Consumes the next token, which must be the expected one """
+        token = self.peek()
+        if token is None or (expected is not None and token != expected) \
+                or (expected is None and not re.match(r'\w', token)):
+            raise ValueError("Invalid object mask %r: expected %s, got %r"
+                             % (self.text, expected or 'a property', token))
+        self.position += 1
+        return token
+
+    def parse(self):
+        """ Returns a list of (type, property tree) pairs """
+        if self.peek() == '[':
+            self.take('[')
+            masks = self.parse_masks()
+            self.take(']')
+        elif self.peek() == 'mask':
+            if self.peek(1) not in ('[', '('):
+                raise ValueError("Invalid object mask %r" % self.text)
+            masks = self.parse_masks()
+        else:
+            masks = [(None, self.parse_properties(None))]
+        if self.peek() is not None:
+            raise ValueError("Invalid object mask %r: unexpected %r"
+                             % (self.text, self.peek()))
+        return masks
+
+    def parse_masks(self):
+        """ Parses a list of mask[...] and mask(Type)[...] expressions """
+        masks = []
+        while True:
+            self.take('mask')
+            scope = None
+            if self.peek() == '(':
+                self.take('(')
+                scope = self.take()
+                self.take(')')
+            self.take('[')
+            masks.append((scope, self.parse_properties(']')))
+            self.take(']')
+            if self.peek() != ',':
+                return masks
+            self.take(',')
+
+    def parse_properties(self, end):
+        """ Parses a comma-separated list of properties into a tree """
+        tree = {}
+        if self.peek() == end:
+            return tree
+        while True:
+            names = [self.take()]
+            while self.peek() == '.':
+                self.take('.')
+                names.append(self.take())
+            children = {}
+            if self.peek() == '[':
+                self.take('[')
+                children = self.parse_properties(']')
+                self.take(']')
+            _merge(tree, _path_tree(names, children))
+            if self.peek() != ',':
+                return tree
+            self.take(',')
@@ -0,0 +1,452 @@
+"""
+    SoftLayer.paging
+    ~~~~~~~~~~~~~~~~
+    Strategies for paging through large results
+
+    :license: MIT, see LICENSE for more details.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from .exceptions import TransportTimeout
+from .instrumentation import Instrumentation
+from .masks import Mask
+from .utils import Filter, string_types
+
+__all__ = ['OffsetPaging', 'KeysetPaging', 'AdaptivePaging', 'get_paging',
+           'default_paging']
+
+# Call options that show the caller has chosen how to page
+PAGING_ARGS = ('paging', 'cursor', 'prefetch', 'offset')
+
+
+class OffsetPaging(object):
+    """ Pages through results with a result limit and an increasing offset.
+        This is the default strategy used by
+        :func:`SoftLayer.API.Client.iter_call`.
+
+    :param integer prefetch: (optional) keep this many pages in flight on
+                             a pool of worker threads. Results are still
+                             yielded in order.
+    """
+
+    def __init__(self, prefetch=None):
+        self.prefetch = prefetch
+
+    def iter_call(self, client, service, method, chunk, limit, offset,
+                  args, kwargs):
+        """ Yields the results of a call, one page at a time
+
+        :param client: the :class:`SoftLayer.API.Client` making the calls
+        :param service: the name of the SoftLayer API service
+        :param method: the method to call on the service
+        :param integer chunk: result size for each API call
+        :param integer limit: (optional) stop after this many results
+        :param integer offset: the offset of the first result
+        :param tuple args: arguments for each call
+        :param dict kwargs: keyword arguments for each call
+        """
+        if self.prefetch and self.prefetch > 1:
+            for item in self._iter_prefetch(client, service, method, chunk,
+                                            limit, offset, args, kwargs):
+                yield item
+            return
+
+        result_count = 0
+        while True:
+            if limit:
+                # We've reached the end of the results
+                if result_count >= limit:
+                    break
+
+                # Don't over-fetch past the given limit
+                if chunk + result_count > limit:
+                    chunk = limit - result_count
+            results = client.call(service, method,
+                                  offset=offset, limit=chunk, *args, **kwargs)
+
+            # It looks like we ran out results
+            if not results:
+                break
+
+            # Apparently this method doesn't return a list.
+            # Why are you even iterating over this?
+            if not isinstance(results, list):
+                yield results
+                break
+
+            for item in results:
+                yield item
+                result_count += 1
+
+            offset += chunk
+
+            if len(results) < chunk:
+                break
+
+    def _iter_prefetch(self, client, service, method, chunk, limit, offset,
+                       args, kwargs):
+        """ Pages like :func:`iter_call` while keeping up to `prefetch`
+            page requests in flight. No new pages are requested once a
+            short or empty page shows the end of the results.
+        """
+        end = offset + limit if limit else None
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.prefetch)
+        try:
+            while True:
+                while len(pending) < self.prefetch \
+                        and (end is None or offset < end):
+                    size = chunk if end is None else min(chunk, end - offset)
+                    pending.append((size, executor.submit(
+                        client.call, service, method,
+                        offset=offset, limit=size, *args, **kwargs)))
+                    offset += size
+
+                if not pending:
+                    break
+
+                size, future = pending.popleft()
+                results = future.result()
+
+                # It looks like we ran out results
+                if not results:
+                    break
+
+                # Apparently this method doesn't return a list.
+                if not isinstance(results, list):
+                    yield results
+                    break
+
+                for item in results:
+                    yield item
+
+                if len(results) < size:
+                    break
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class KeysetPaging(object):
+    """ Pages through results in key order, asking each page for the
+        results with a key greater than the last one seen. Unlike offset
+        paging, the API doesn't have to skip over every earlier result for
+        each page, and results added or removed while paging don't shift
+        the pages.
+
+        The key is found in the results by its last name. The object filter
+        needs its full path, which is worked out from the method name
+        (``getVirtualGuests`` pages on ``virtualGuests.id``) unless the key
+        is given as a dotted path. The key is added to the mask so it is
+        always in the results; dict masks are sent as string masks.
+
+        The only filter the key can have is a lower bound, like ``'> 1000'``,
+        which the pages after the first one narrow. Other filters on the key
+        raise a ValueError, since the pages would replace them.
+
+    :param string key: the property to page on, or its full filter path
+    """
+
+    def __init__(self, key='id'):
+        self.key = key
+
+    def get_path(self, method):
+        """ Returns the object filter path of the key for the method
+
+        :param method: the method being called
+        """
+        if '.' in self.key:
+            return self.key
+        name = method[3:] if method.startswith('get') else method
+        return '%s%s.%s' % (name[:1].lower(), name[1:], self.key)
+
+    def can_page(self, method, _filter=None):
+        """ Whether the results of the call can be paged on the key. The
+            pages would replace the filter's own conditions on the key,
+            other than a lower bound, and its sorting.
+
+        :param method: the method being called
+        :param _filter: (optional) the object filter of the call
+        """
+        query = Filter(_filter)
+        condition = query.get(self.get_path(method))
+        if condition is not None and not _is_lower_bound(condition):
+            return False
+        return not _sorts(query.to_dict())
+
+    def iter_call(self, client, service, method, chunk, limit, offset,
+                  args, kwargs):
+        """ Yields the results of a call, one page at a time. Takes the same
+            arguments as :func:`OffsetPaging.iter_call`.
+        """
+        if offset:
+            raise ValueError("Keyset paging can't start at an offset.")
+
+        path = self.get_path(method)
+        field = path.split('.')[-1]
+        kwargs = dict(kwargs)
+        query = Filter(kwargs.pop('filter', None))
+        condition = query.get(path)
+        if condition is not None and not _is_lower_bound(condition):
+            raise ValueError("Keyset paging can only page on a key with no "
+                             "filter or a '>' filter: %s" % path)
+        query = query.order_by(path)
+        mask = kwargs.get('mask')
+        if mask is not None:
+            try:
+                kwargs['mask'] = Mask(mask, field)
+            except ValueError:
+                pass
+
+        last = None
+        result_count = 0
+        while True:
+            size = chunk
+            if limit:
+                # We've reached the end of the results
+                if result_count >= limit:
+                    break
+                size = min(chunk, limit - result_count)
+
+            page_filter = query
+            if last is not None:
+                # Every result is past the caller's lower bound, so the last
+                # key is the higher of the two
+                page_filter = query.where(path, '> %s' % last)
+            results = client.call(service, method, filter=page_filter,
+                                  limit=size, *args, **kwargs)
+
+            # It looks like we ran out results
+            if not results:
+                break
+
+            # Apparently this method doesn't return a list.
+            if not isinstance(results, list):
+                yield results
+                break
+
+            for item in results:
+                yield item
+                result_count += 1
+
+            if len(results) < size:
+                break
+            last = results[-1][field]
+
+
+class AdaptivePaging(object):
+    """ Pages with offsets, like :class:`OffsetPaging`, but adapts the page
+        size to how long pages take. How many results fit in a page depends
+        on how wide the mask is, so starting from the ``chunk`` given to
+        ``iter_call``, pages grow while they come back faster than the
+        target latency and shrink while they are slower, in proportion to
+        how far off they are. Pages larger than ``max_bytes`` shrink too.
+
+        A page that times out is asked for again at half its size, and no
+        later page of the call grows back past that size. The size chosen
+        for each next page is passed to the ``after_page`` hook of the
+        instrumentation given to the call, or else the client's.
+
+    :param float min_latency: pages quicker than this many seconds grow
+    :param float max_latency: pages slower than this many seconds shrink
+    :param integer min_chunk: the smallest page size
+    :param integer max_chunk: the largest page size
+    :param integer max_bytes: (optional) pages with larger responses shrink
+    :param float growth: the most a page size changes by from one page to
+                         the next
+
+    Usage:
+
+        >>> from SoftLayer.paging import AdaptivePaging
+        >>> for guest in client['Account'].getVirtualGuests(
+        ...         iter=True, chunk=50, paging=AdaptivePaging(max_latency=3)):
+        ...     guest['id']
+
+    """
+
+    def __init__(self, min_latency=1.0, max_latency=4.0, min_chunk=10,
+                 max_chunk=1000, max_bytes=None, growth=2.0):
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.max_bytes = max_bytes
+        self.growth = growth
+
+    def next_size(self, size, elapsed, response_bytes=None):
+        """ Returns the size of the next page given how the last one went
+
+        :param integer size: the size of the last page
+        :param float elapsed: seconds the last page took
+        :param integer response_bytes: (optional) size of the last response
+        """
+        target = (self.min_latency + self.max_latency) / 2.0
+        scale = 1.0
+        if elapsed < self.min_latency:
+            scale = target / elapsed if elapsed > 0 else self.growth
+        elif elapsed > self.max_latency:
+            scale = target / elapsed
+        if self.max_bytes and response_bytes \
+                and response_bytes > self.max_bytes:
+            scale = min(scale, float(self.max_bytes) / response_bytes)
+        scale = max(1.0 / self.growth, min(self.growth, scale))
+        return max(self.min_chunk, min(self.max_chunk, int(size * scale)))
+
+    def iter_call(self, client, service, method, chunk, limit, offset,
+                  args, kwargs):
+        """ Yields the results of a call, one page at a time. Takes the same
+            arguments as :func:`OffsetPaging.iter_call`.
+        """
+        # The hooks given for the call replace the client's, as they do for
+        # any call, and still see every page
+        kwargs = dict(kwargs)
+        instrumentation = kwargs.pop(
+            'instrumentation', getattr(client, 'instrumentation', None))
+        size = chunk
+        ceiling = self.max_chunk
+        result_count = 0
+        while True:
+            page_size = size
+            if limit:
+                # We've reached the end of the results
+                if result_count >= limit:
+                    break
+                page_size = min(size, limit - result_count)
+
+            hooks = _PageHooks(instrumentation)
+            start = time.time()
+            try:
+                results = client.call(service, method,
+                                      offset=offset, limit=page_size,
+                                      instrumentation=hooks, *args, **kwargs)
+            except TransportTimeout:
+                if page_size <= self.min_chunk:
+                    raise
+                # Try the page again, smaller
+                ceiling = size = max(self.min_chunk, page_size // 2)
+                continue
+            elapsed = time.time() - start
+
+            request = hooks.request
+            size = min(ceiling, self.next_size(
+                page_size, elapsed,
+                request.response_bytes if request is not None else None))
+            if instrumentation is not None and request is not None:
+                instrumentation.after_page(request, size)
+
+            # It looks like we ran out results
+            if not results:
+                break
+
+            # Apparently this method doesn't return a list.
+            if not isinstance(results, list):
+                yield results
+                break
+
+            for item in results:
+                yield item
+                result_count += 1
+
+            offset += page_size
+
+            if len(results) < page_size:
+                break
+
+
+class _PageHooks(Instrumentation):
+    """ Keeps the request of a page and passes every hook on to the client's
+        instrumentation, if it has one """
+
+    def __init__(self, instrumentation):
+        super(_PageHooks, self).__init__()
+        self.instrumentation = instrumentation
+        self.request = None
+
+    def _forward(self, hook, *args):
+        """ Calls the hook of the client's instrumentation """
+        if self.instrumentation is not None:
+            getattr(self.instrumentation, hook)(*args)
+
+    def before_request(self, request):
+        self.request = request
+        self._forward('before_request', request)
+
+    def after_serialize(self, request):
+        self._forward('after_serialize', request)
+
+    def after_response(self, request):
+        self._forward('after_response', request)
+
+    def after_parse(self, request):
+        self._forward('after_parse', request)
+
+    def on_error(self, request, error):
+        self._forward('on_error', request, error)
+
+    def after_request(self, request):
+        self._forward('after_request', request)
+
+
+def _is_lower_bound(condition):
+    """ Whether a filter condition only sets a lower bound, like '> 1000' """
+    if not isinstance(condition, dict):
+        return False
+    operation = condition.get('operation')
+    return isinstance(operation, string_types) \
+        and operation.strip().startswith('>') \
+        and not condition.get('options')
+
+
+def _sorts(_filter):
+    """ Whether a dict filter sorts the results """
+    for item in _filter.values():
+        if not isinstance(item, dict):
+            continue
+        if 'operation' not in item:
+            if _sorts(item):
+                return True
+        elif item['operation'] == 'orderBy' or any(
+                option.get('name') == 'sort'
+                for option in item.get('options') or []):
+            return True
+    return False
+
+
+def get_paging(paging=None, cursor=None, prefetch=None):
+    """ Returns the paging strategy for a call to
+        :func:`SoftLayer.API.Client.iter_call`.
+
+    :param paging: (optional) a paging strategy, used as it is
+    :param string cursor: (optional) page with :class:`KeysetPaging` on this
+                          key
+    :param integer prefetch: (optional) pages to keep in flight with
+                             :class:`OffsetPaging`
+    """
+    if paging is not None:
+        return paging
+    if cursor is not None:
+        return KeysetPaging(cursor)
+    return OffsetPaging(prefetch=prefetch)
+
+
+def default_paging(kwargs, paging, method):
+    """ Sets the paging strategy a manager method prefers on the options of
+        an iterating call, unless the caller has already chosen how to page.
+        Keyset paging is only chosen when the call's filter leaves the key
+        and the order of the results to it; other calls page by offset.
+
+    :param dict kwargs: the options of the call
+    :param paging: the preferred paging strategy
+    :param string method: the method being called
+    """
+    if not kwargs.get('iter') \
+            or any(kwargs.get(arg) for arg in PAGING_ARGS):
+        return kwargs
+    if isinstance(paging, KeysetPaging) \
+            and not paging.can_page(method, kwargs.get('filter')):
+        return kwargs
+    kwargs['paging'] = paging
+    return kwargs
@@ -0,0 +1,242 @@
+"""
+    SoftLayer.ratelimit
+    ~~~~~~~~~~~~~~~~~~~
+    Client-side rate limiting and adaptive concurrency
+
+    :license: MIT, see LICENSE for more details.
+"""
+from collections import deque
+import threading
+import time
+
+from .exceptions import RateLimitExceeded, TransportError
+
+__all__ = ['RateLimiter', 'TokenBucket', 'AdaptiveConcurrencyLimit']
+
+# Fault codes (HTTP status codes) that mean the API is throttling us
+THROTTLE_CODES = (429, 503)
+
+# Number of seconds the current rate is measured over
+RATE_WINDOW = 1.0
+
+
+class TokenBucket(object):
+    """ A thread-safe token bucket. Tokens are added at ``rate`` per second,
+        up to ``burst`` tokens. Every call takes one token, waiting for it
+        when the bucket is empty.
+
+    :param float rate: number of calls per second
+    :param int burst: number of calls that may be made at once
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """ Takes a token and returns the number of seconds the caller has to
+            wait before using it.
+
+        :param float max_wait: raise RateLimitExceeded instead of reserving a
+                               token that is further away than this
+        """
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.burst,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitExceeded(
+                    'Rate limit exceeded: the next call is allowed in %.3fs'
+                    % wait)
+            self.tokens -= 1
+            return wait
+
+
+class AdaptiveConcurrencyLimit(object):
+    """ Limits the number of calls in flight. The limit grows by
+        ``increase / limit`` after every successful call and is multiplied by
+        ``decrease`` whenever the API is throttling (AIMD).
+
+    :param int initial: the starting limit
+    :param int minimum: the lowest the limit can go
+    :param int maximum: the highest the limit can go
+    :param float increase: additive increase, spread over a full window of
+                           calls
+    :param float decrease: multiplicative decrease on throttling
+    """
+
+    def __init__(self, initial=10, minimum=1, maximum=100, increase=1.0,
+                 decrease=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, max_wait=None):
+        """ Waits for a free slot and takes it. Returns the number of seconds
+            spent waiting.
+
+        :param float max_wait: raise RateLimitExceeded when no slot frees up
+                               within this many seconds
+        """
+        start = time.time()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = None
+                if max_wait is not None:
+                    remaining = start + max_wait - time.time()
+                    if remaining <= 0:
+                        raise RateLimitExceeded(
+                            'Concurrency limit of %d calls reached'
+                            % int(self.limit))
+                self._condition.wait(remaining)
+            self.in_flight += 1
+        return time.time() - start
+
+    def release(self, throttled=False):
+        """ Frees a slot and adjusts the limit
+
+        :param bool throttled: whether the API throttled the call
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            else:
+                self.limit = min(self.maximum,
+                                 self.limit + self.increase / self.limit)
+            self._condition.notify_all()
+
+
+class RateLimiter(object):
+    """ Limits the rate and concurrency of API calls made by a client. It can
+        be shared by any number of threads, and by several clients.
+
+    :param float rate: calls per second. None means no rate limit.
+    :param int burst: number of calls that may be made at once after a quiet
+                      period. Defaults to one second worth of calls.
+    :param bool per_service: give each service its own rate limit instead of
+                             sharing one between all of them
+    :param concurrency: an optional :class:`AdaptiveConcurrencyLimit`
+    :param float max_wait: the longest a call may wait for the limiter before
+                           RateLimitExceeded is raised. None waits forever.
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.ratelimit import (
+        ...     RateLimiter, AdaptiveConcurrencyLimit)
+        >>> client = SoftLayer.Client()
+        >>> client.rate_limiter = RateLimiter(
+        ...     rate=10, burst=20, concurrency=AdaptiveConcurrencyLimit())
+        >>> client.rate_limiter.metrics
+        {'calls': 0, 'rejections': 0, 'rate': 0.0, 'wait_time': 0.0, ...}
+
+    """
+
+    def __init__(self, rate=None, burst=None, per_service=False,
+                 concurrency=None, max_wait=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.per_service = per_service
+        self.concurrency = concurrency
+        self.max_wait = max_wait
+        self.calls = 0
+        self.rejections = 0
+        self.wait_time = 0.0
+        self._buckets = {}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def get_bucket(self, service):
+        """ Returns the token bucket for the given service, or None when
+            there's no rate limit """
+        if self.rate is None:
+            return None
+        key = service if self.per_service else None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate,
+                                                          self.burst)
+        return bucket
+
+    def run(self, request, call):
+        """ Makes the call once the rate and concurrency limits allow it
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        :param call: callable that makes the request (usually the transport)
+        """
+        waited = 0.0
+        try:
+            bucket = self.get_bucket(request.service)
+            if bucket is not None:
+                waited = bucket.reserve(self.max_wait)
+                if waited:
+                    time.sleep(waited)
+            if self.concurrency is not None:
+                max_wait = None
+                if self.max_wait is not None:
+                    max_wait = self.max_wait - waited
+                waited += self.concurrency.acquire(max_wait)
+        except RateLimitExceeded:
+            with self._lock:
+                self.rejections += 1
+            raise
+
+        now = time.time()
+        with self._lock:
+            self.calls += 1
+            self.wait_time += waited
+            self._recent.append(now)
+            while self._recent[0] <= now - RATE_WINDOW:
+                self._recent.popleft()
+
+        if self.concurrency is None:
+            return call(request)
+
+        throttled = False
+        try:
+            return call(request)
+        except TransportError:
+            throttled = True
+            raise
+        except Exception as ex:
+            throttled = getattr(ex, 'faultCode', None) in THROTTLE_CODES
+            raise
+        finally:
+            self.concurrency.release(throttled)
+
+    @property
+    def metrics(self):
+        """ Returns a dictionary with the number of calls made, the number
+            of calls rejected, the current rate in calls per second, the
+            total number of seconds calls spent waiting and the current
+            concurrency limit """
+        now = time.time()
+        with self._lock:
+            while self._recent and self._recent[0] <= now - RATE_WINDOW:
+                self._recent.popleft()
+            metrics = {
+                'calls': self.calls,
+                'rejections': self.rejections,
+                'rate': len(self._recent) / RATE_WINDOW,
+                'wait_time': self.wait_time,
+                'average_wait_time': self.wait_time / (self.calls or 1),
+            }
+        if self.concurrency is not None:
+            metrics['concurrency_limit'] = int(self.concurrency.limit)
+            metrics['in_flight'] = self.concurrency.in_flight
+        return metrics
+
+    def __repr__(self):
+        return "<RateLimiter: rate=%r, burst=%r, per_service=%r>" \
+            % (self.rate, self.burst, self.per_service)
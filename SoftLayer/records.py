@@ -0,0 +1,143 @@
+"""
+    SoftLayer.records
+    ~~~~~~~~~~~~~~~~~
+    Compact, read-only rows for large API results
+
+    :license: MIT, see LICENSE for more details.
+"""
+__all__ = ['Record', 'compact', 'get_schema']
+
+# Record classes, keyed by the tuple of their field names
+_SCHEMAS = {}
+
+
+class Record(tuple):
+    """ A read-only row backed by a tuple. The field names live once on the
+        row's class, which every row with the same fields shares, instead of
+        in each row. Rows can be read like dictionaries or through
+        attributes. Fields that clash with a method name, like ``keys`` or
+        ``index``, can only be read like a dictionary.
+
+    Usage:
+
+        >>> from SoftLayer.records import compact
+        >>> row = compact({'id': 1, 'datacenter': {'name': 'dal05'}})
+        >>> row['datacenter']['name']
+        'dal05'
+        >>> row.datacenter.name
+        'dal05'
+        >>> row.to_dict()
+        {'id': 1, 'datacenter': {'name': 'dal05'}}
+
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        try:
+            return tuple.__getitem__(self, self._index[key])
+        except (KeyError, TypeError):
+            raise KeyError(key)
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def get(self, key, default=None):
+        """ Returns the value of the field, or default if there is none """
+        index = self._index.get(key)
+        if index is None:
+            return default
+        return tuple.__getitem__(self, index)
+
+    def keys(self):
+        """ Returns the field names """
+        return list(self._fields)
+
+    def values(self):
+        """ Returns the field values """
+        return list(tuple.__iter__(self))
+
+    def items(self):
+        """ Returns (name, value) pairs for every field """
+        return list(zip(self._fields, tuple.__iter__(self)))
+
+    def to_dict(self):
+        """ Converts the row, and the rows nested in it, back into
+            dictionaries """
+        return dict((key, _to_dict(value)) for key, value in self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (_make_record, (self._fields, tuple(tuple.__iter__(self))))
+
+    def __repr__(self):
+        return "Record(%r)" % (self.to_dict(),)
+
+
+def _make_record(fields, values):
+    """ Creates a row; used to copy and unpickle rows """
+    return get_schema(fields)(values)
+
+
+def _to_dict(value):
+    """ Converts rows nested in lists and rows back into dictionaries """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_dict(item) for item in value]
+    return value
+
+
+def get_schema(fields):
+    """ Returns the :class:`Record` class for rows with the given fields.
+        Every call with the same fields returns the same class.
+
+    :param tuple fields: the field names, in order
+    """
+    schema = _SCHEMAS.get(fields)
+    if schema is None:
+        schema = type('Record', (Record,), {
+            '__slots__': (),
+            '_fields': fields,
+            '_index': dict((key, i) for i, key in enumerate(fields)),
+        })
+        schema = _SCHEMAS.setdefault(fields, schema)
+    return schema
+
+
+def compact(value):
+    """ Converts the dictionaries in an API result, however deeply nested in
+        lists and other dictionaries, into :class:`Record` rows.
+
+    :param value: an API result
+    """
+    if isinstance(value, dict):
+        return get_schema(tuple(value))(
+            [compact(item) for item in value.values()])
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
@@ -0,0 +1,135 @@
+"""
+    SoftLayer.retry
+    ~~~~~~~~~~~~~~~
+    Retrying failed API calls
+
+    :license: MIT, see LICENSE for more details.
+"""
+import fnmatch
+import logging
+import random
+import time
+
+from .exceptions import ApplicationError, RemoteSystemError, TransportError
+
+__all__ = ['RetryPolicy']
+
+LOGGER = logging.getLogger(__name__)
+
+PREFIX = 'SoftLayer_'
+
+
+class RetryPolicy(object):
+    """ Decides which failed API calls are tried again, how often and how
+        long to wait in between. Waits grow exponentially with full jitter:
+        a random time between 0 and ``min(max_backoff, backoff * 2 ** n)``
+        seconds before the nth retry.
+
+        Transport errors (connection failures, timeouts, HTTP 429 and 5xx
+        responses), RemoteSystemError and other faults with a 5xx code are
+        retried. ApplicationError and HTTP 4xx errors never are.
+
+    :param int max_attempts: the maximum number of attempts, including the
+                             first one
+    :param float backoff: seconds to wait before the first retry, at most
+    :param float max_backoff: the longest wait between two attempts
+    :param float deadline: give up when another attempt would start more than
+                           this many seconds after the first one. None means
+                           no deadline.
+    :param list methods: the methods that may be retried, as 'Service.method'
+                         patterns. Defaults to the idempotent get* methods:
+                         ['*.get*']
+
+    Usage:
+
+        >>> import SoftLayer
+        >>> from SoftLayer.retry import RetryPolicy
+        >>> client = SoftLayer.Client()
+        >>> client.retry_policy = RetryPolicy(max_attempts=5, deadline=60)
+
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30.0,
+                 deadline=None, methods=None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.methods = methods or ['*.get*']
+
+    def is_retryable_method(self, service, method):
+        """ Returns True if calls to the given method may be retried
+
+        :param string service: the service name. E.G. Account
+        :param string method: the method name. E.G. getObject
+        """
+        if service.startswith(PREFIX):
+            service = service[len(PREFIX):]
+        name = '%s.%s' % (service, method)
+        return any(fnmatch.fnmatchcase(name, pattern)
+                   for pattern in self.methods)
+
+    @staticmethod
+    def is_retryable_error(error):
+        """ Returns True if the call that raised the error may be retried
+
+        :param Exception error: the exception raised by the call
+        """
+        if isinstance(error, ApplicationError):
+            return False
+        if isinstance(error, RemoteSystemError):
+            return True
+
+        code = getattr(error, 'faultCode', None)
+        if isinstance(error, TransportError):
+            return not (isinstance(code, int) and 400 <= code < 500
+                        and code != 429)
+        return isinstance(code, int) and 500 <= code < 600
+
+    def get_backoff(self, retry):
+        """ Returns the number of seconds to wait before the given retry
+
+        :param int retry: the retry number, starting at 1
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+
+    def run(self, request, call):
+        """ Makes the call, retrying it as allowed by the policy. The number
+            of retries is recorded in ``request.retries``.
+
+        :param request: a :class:`SoftLayer.transports.Request`
+        :param call: callable that makes the request (usually the transport)
+        """
+        if not self.is_retryable_method(request.service, request.method):
+            return call(request)
+
+        start = time.time()
+        while True:
+            try:
+                return call(request)
+            except Exception as ex:  # pylint: disable=W0703
+                attempt = request.retries + 1
+                if attempt >= self.max_attempts \
+                        or not self.is_retryable_error(ex):
+                    raise
+
+                wait = self.get_backoff(attempt)
+                if self.deadline is not None \
+                        and time.time() + wait - start > self.deadline:
+                    raise
+                # Don't wait for an attempt the call's deadline won't allow
+                remaining = None
+                if request.deadline is not None:
+                    remaining = request.deadline.remaining()
+                if remaining is not None and wait >= remaining:
+                    raise
+
+                LOGGER.info('Retrying %s::%s in %.3fs after %r',
+                            request.service, request.method, wait, ex)
+                time.sleep(wait)
+                request.retries = attempt
+
+    def __repr__(self):
+        return "<RetryPolicy: max_attempts=%r, backoff=%r, deadline=%r>" \
+            % (self.max_attempts, self.backoff, self.deadline)
@@ -76,7 +76,7 @@ class CommandLineTests(unittest.TestCase):
 
     @patch('SoftLayer.TimedClient.get_last_calls')
     def test_normal_path_with_timings(self, calls_mock):
-        calls_mock.return_value = [('SERVICE.METHOD', 1000, 0.25)]
+        calls_mock.return_value = [('SERVICE.METHOD', 1000, 0.25, 0)]
         self.env.get_module_name.return_value = 'cci'
         self.assertRaises(
             SystemExit, core.main,
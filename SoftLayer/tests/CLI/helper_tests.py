@@ -10,7 +10,7 @@ import json
 
 import SoftLayer.CLI as cli
 from SoftLayer.tests import FIXTURE_PATH, unittest
-from mock import patch, mock_open, call
+from mock import patch, mock_open, call, MagicMock
 
 if sys.version_info >= (3,):
     open_path = 'builtins.open'
@@ -396,6 +396,151 @@ class TestTemplateArgs(unittest.TestCase):
         })
 
 
+class TestBulkHelpers(unittest.TestCase):
+
+    def test_is_bulk(self):
+        self.assertFalse(cli.helpers.is_bulk({'<identifier>': '1'}))
+        self.assertFalse(cli.helpers.is_bulk({'<identifier>': ['1']}))
+        self.assertTrue(cli.helpers.is_bulk({'<identifier>': ['1', '2']}))
+        self.assertTrue(cli.helpers.is_bulk({'<identifier>': [],
+                                             '--datacenter': 'dal05'}))
+
+    def test_get_bulk_runner(self):
+        runner = cli.helpers.get_bulk_runner({
+            '--concurrency': '4', '--rate': '2.5', '--percent': '10',
+            '--max-failures': '0'})
+        self.assertEqual(runner.max_workers, 4)
+        self.assertEqual(runner.rate, 2.5)
+        self.assertEqual(runner.percent, 10)
+        self.assertEqual(runner.max_failures, 0)
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.get_bulk_runner, {'--rate': 'fast'})
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.get_bulk_runner,
+                          {'--batch': '5', '--percent': '10'})
+
+    def test_resolve_bulk_ids(self):
+        select = MagicMock(return_value=[{'id': 1}, {'id': 2}])
+        ids = cli.helpers.resolve_bulk_ids(
+            {'<identifier>': [], '--tags': 'a, b'}, None, select)
+        self.assertEqual(ids, [1, 2])
+        select.assert_called_once_with(mask='id', tags=['a', 'b'])
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.resolve_bulk_ids,
+                          {'<identifier>': []}, None, select)
+
+    def test_run_bulk_command(self):
+        report = MagicMock(results={1: True, 2: Exception('boom')},
+                           skipped=[3])
+        operation = MagicMock(return_value=report)
+        table = cli.helpers.run_bulk_command(
+            {'<identifier>': ['a', 'b'], '--really': True,
+             '--concurrency': '2'},
+            lambda identifier: [identifier], None, 'cancel', 'CCI',
+            operation, hard=True)
+        args, kwargs = operation.call_args
+        self.assertEqual(args, (['a', 'b'],))
+        self.assertTrue(kwargs['hard'])
+        self.assertEqual(kwargs['runner'].max_workers, 2)
+        self.assertEqual([row[1] for row in table.rows],
+                         ['ok', 'error: boom', 'skipped'])
+
+    def test_get_reboot_mode(self):
+        self.assertEqual(cli.helpers.get_reboot_mode({'--hard': True}),
+                         'hard')
+        self.assertEqual(cli.helpers.get_reboot_mode({'--soft': True}),
+                         'soft')
+        self.assertEqual(cli.helpers.get_reboot_mode({}), 'default')
+
+
+class TestLoadHostsTemplate(unittest.TestCase):
+
+    def test_hosts_not_exists(self):
+        path = os.path.join(FIXTURE_PATH, 'sample_hosts_not_exists.csv')
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.load_hosts_template, path)
+
+    def test_csv(self):
+        path = os.path.join(FIXTURE_PATH, 'sample_cci_hosts.csv')
+        hosts = cli.helpers.load_hosts_template(path)
+        self.assertEqual(hosts, [
+            {'--hostname': 'web1', '--domain': 'example.com', '--cpu': '1',
+             '--memory': '1024', '--disk': '25,100'},
+            {'--hostname': 'web2', '--domain': 'example.com', '--cpu': '2'},
+        ])
+
+    def test_ini(self):
+        path = os.path.join(FIXTURE_PATH, 'sample_cci_hosts.conf')
+        hosts = cli.helpers.load_hosts_template(path)
+        self.assertEqual(hosts, [
+            {'--hostname': 'web1', '--domain': 'example.com', '--cpu': '1'},
+            {'--hostname': 'other', '--memory': '2048'},
+        ])
+
+    def test_no_hosts(self):
+        path = os.path.join(FIXTURE_PATH, 'empty.conf')
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.load_hosts_template, path)
+
+
+class TestCreateMany(unittest.TestCase):
+
+    def setUp(self):
+        self.env = MagicMock()
+        self.manager = MagicMock()
+        self.validate = MagicMock()
+        self.args = {'--hosts': os.path.join(FIXTURE_PATH,
+                                             'sample_cci_hosts.csv'),
+                     '--cpu': '4', '--really': True, '--wait': None}
+
+    def parse(self, args):
+        return {'hostname': args['--hostname'], 'domain': args['--domain'],
+                'cpus': args['--cpu'], 'disks': args.get('--disk'),
+                'hourly': False}
+
+    def test_split_list_args(self):
+        args = {'--disk': '25,100', '--key': ['a'], '--cpu': '1,2'}
+        cli.helpers.split_list_args(args)
+        self.assertEqual(args, {'--disk': ['25', '100'], '--key': ['a'],
+                                '--cpu': '1,2'})
+
+    def test_create_many(self):
+        self.manager.iter_create_instances.return_value = iter([
+            ('ordered', {'id': 1, 'hostname': 'web1'}),
+            ('ordered', {'id': 2, 'hostname': 'web2'}),
+            ('provisioning', {'id': 1, 'hostname': 'web1'}),
+        ])
+        table = cli.helpers.create_many(self.env, self.manager, self.args,
+                                        self.validate, self.parse)
+        specs = self.manager.iter_create_instances.call_args[0][0]
+        self.assertEqual([(spec['hostname'], spec['cpus'], spec['disks'])
+                          for spec in specs],
+                         [('web1', '1', ['25', '100']), ('web2', '2', None)])
+        self.assertEqual(self.validate.call_count, 2)
+        self.assertEqual([row[0] for row in table.rows], [1, 2])
+        self.assertEqual([row[-1] for row in table.rows],
+                         ['provisioning', 'ordered'])
+        self.assertEqual(self.env.err.call_count, 3)
+
+    def test_create_many_test(self):
+        self.args['--test'] = True
+        self.manager.verify_create_instances.return_value = [
+            {'prices': [{'recurringFee': '1.5'}, {'recurringFee': '2'}]},
+            {'prices': [{'recurringFee': '4'}]},
+        ]
+        output = cli.helpers.create_many(self.env, self.manager, self.args,
+                                         self.validate, self.parse)
+        self.assertEqual([row[-1] for row in output[0].rows],
+                         ['3.50', '4.00'])
+        self.assertFalse(self.manager.iter_create_instances.called)
+
+    def test_create_many_export(self):
+        self.args['--export'] = 'file.txt'
+        self.assertRaises(cli.helpers.ArgumentError,
+                          cli.helpers.create_many, self.env, self.manager,
+                          self.args, self.validate, self.parse)
+
+
 class TestExportToTemplate(unittest.TestCase):
     def test_export_to_template(self):
         with patch(open_path, mock_open(), create=True) as open_:
@@ -7,8 +7,9 @@
 
     :license: MIT, see LICENSE for more details.
 """
+from SoftLayer.cache import catalog_key
 from SoftLayer.tests import unittest, FixtureClient
-from mock import patch
+from mock import patch, Mock, ANY
 
 from SoftLayer.CLI.helpers import format_output, CLIAbort, ArgumentError
 from SoftLayer.CLI.modules import bmc
@@ -55,6 +56,18 @@ class BMCCLITests(unittest.TestCase):
         self.assertEqual(
             [], bmc.BMCCreateOptions().get_create_options([], 'nope'))
 
+    def test_BMCCreateOptions_refresh_catalog(self):
+        env = Mock()
+        args = {'--all': True, '--refresh-catalog': True}
+        for opt in bmc.BMCCreateOptions.options:
+            args['--' + opt] = False
+
+        bmc.BMCCreateOptions(client=self.client, env=env).execute(args)
+
+        self.assertFalse(env.catalog_cache.get.called)
+        env.catalog_cache.set.assert_any_call(
+            catalog_key(self.client, 'package-50'), ANY)
+
     def test_BMCCreateOptions_with_cpu_only(self):
         args = {
             '--all': False,
@@ -8,7 +8,7 @@
     :license: MIT, see LICENSE for more details.
 """
 from SoftLayer.tests import unittest, FixtureClient
-from mock import Mock, patch
+from mock import ANY, Mock, patch
 try:
     # Python 3.x compatibility
     import builtins  # NOQA
@@ -16,6 +16,7 @@ try:
 except ImportError:
     builtins_name = '__builtin__'
 
+from SoftLayer.bulk import BulkReport
 from SoftLayer.CLI.helpers import format_output, CLIAbort, ArgumentError
 from SoftLayer.CLI.modules import server
 
@@ -314,6 +315,98 @@ class ServerCLITests(unittest.TestCase):
         args['--really'] = False
         self.assertRaises(CLIAbort, runnable.execute, args)
 
+    @patch('SoftLayer.CLI.helpers.confirm')
+    def test_ServerPowerCycle_bulk(self, confirm_mock):
+        runnable = server.ServerPowerCycle(client=self.client)
+        self.client['Hardware_Server'].powerCycle.side_effect = [
+            True, ValueError('nope')]
+
+        args = {
+            '<identifier>': [],
+            '--really': True,
+            '--tags': 'db, web',
+            '--datacenter': None,
+            '--concurrency': '1',
+        }
+
+        output = runnable.execute(args)
+
+        self.assertEqual(format_output(output, 'python'), [
+            {'id': 1000, 'result': 'ok'},
+            {'id': 1001, 'result': 'error: nope'}])
+        _, kwargs = self.client['Account'].getHardware.call_args
+        self.assertEqual(kwargs['mask'], 'id')
+
+        # Selectors can't be mixed with identifiers
+        args['<identifier>'] = ['12345']
+        self.assertRaises(ArgumentError, runnable.execute, args)
+
+        # Now check to make sure we properly call CLIAbort in the negative case
+        confirm_mock.return_value = False
+        args['<identifier>'] = ['12345', '12346']
+        args['--tags'] = None
+        args['--really'] = False
+        self.assertRaises(CLIAbort, runnable.execute, args)
+
+    def test_ServerPower_bulk(self):
+        args = {'<identifier>': ['1000', '1001'], '--really': True}
+        commands = [(server.ServerPowerOff, 'powerOff'),
+                    (server.ServerPowerOn, 'powerOn')]
+        for command, method in commands:
+            output = command(client=self.client).execute(args)
+
+            self.assertEqual(format_output(output, 'python'), [
+                {'id': 1000, 'result': 'ok'},
+                {'id': 1001, 'result': 'ok'}])
+            self.assertEqual(
+                getattr(self.client['Hardware_Server'], method).call_count, 2)
+
+    def test_ServerReboot_bulk(self):
+        runnable = server.ServerReboot(client=self.client)
+        args = {
+            '<identifier>': [],
+            '--really': True,
+            '--tags': 'db',
+            '--hard': False,
+            '--soft': True,
+        }
+
+        output = runnable.execute(args)
+
+        self.assertEqual(len(format_output(output, 'python')), 2)
+        self.assertEqual(
+            self.client['Hardware_Server'].rebootSoft.call_count, 2)
+
+    @patch('SoftLayer.HardwareManager.reload_many')
+    @patch('SoftLayer.CLI.modules.server.resolve_id')
+    def test_ServerReload_bulk(self, resolve_mock, reload_mock):
+        resolve_mock.return_value = 5
+        reload_mock.return_value = BulkReport()
+        runnable = server.ServerReload(client=self.client)
+        args = {
+            '<identifier>': ['1000', '1001'],
+            '--really': True,
+            '--postinstall': 'https://x/setup.sh',
+            '--key': ['mykey'],
+        }
+
+        runnable.execute(args)
+
+        reload_mock.assert_called_once_with(
+            [1000, 1001], runner=ANY, post_uri='https://x/setup.sh',
+            ssh_keys=[5])
+
+    @patch('SoftLayer.HardwareManager.cancel_many')
+    def test_CancelServer_bulk(self, cancel_mock):
+        cancel_mock.return_value = BulkReport()
+        runnable = server.CancelServer(client=self.client)
+        args = {'<identifier>': ['1000', '1001'], '--really': True}
+
+        runnable.execute(args)
+
+        cancel_mock.assert_called_once_with(
+            [1000, 1001], runner=ANY, reason='unneeded', comment='')
+
     @patch('SoftLayer.HardwareManager.change_port_speed')
     @patch('SoftLayer.CLI.modules.server.resolve_id')
     def test_NicEditServer(self, resolve_mock, port_mock):
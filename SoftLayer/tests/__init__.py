@@ -14,4 +14,20 @@ from .fixture_client import FixtureClient
 
 FIXTURE_PATH = os.path.abspath(os.path.join(__file__, '..', 'fixtures'))
 
-__all__ = ['unittest', 'FixtureClient']
+__all__ = ['unittest', 'FixtureClient', 'FakeClock']
+
+
+class FakeClock(object):
+    """ Stands in for the time module. Sleeping moves the clock forward
+        instead of waiting. """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
@@ -0,0 +1,182 @@
+"""
+    SoftLayer.tests.aio_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import sys
+import threading
+import time
+
+from mock import MagicMock, call
+
+from SoftLayer.tests import unittest
+
+if sys.version_info < (3, 6):
+    raise unittest.SkipTest('SoftLayer.aio requires Python 3.6+')
+
+import asyncio  # NOQA
+from SoftLayer.aio import AsyncClient  # NOQA
+from SoftLayer.deadline import Deadline  # NOQA
+from SoftLayer.exceptions import DeadlineExceeded  # NOQA
+
+LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(LOOP)
+
+
+def run(coro):
+    return LOOP.run_until_complete(coro)
+
+
+def collect(agen):
+    items = []
+    while True:
+        try:
+            items.append(run(agen.__anext__()))
+        except StopAsyncIteration:
+            return items
+
+
+class AsyncClientTests(unittest.TestCase):
+    def setUp(self):
+        self.sync_client = MagicMock()
+        self.client = AsyncClient(client=self.sync_client, concurrency=4)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_call(self):
+        self.sync_client.call.return_value = {'id': 1}
+        result = run(self.client['SERVICE'].METHOD(1234, id=5, mask='id'))
+
+        self.assertEqual(result, {'id': 1})
+        self.sync_client.call.assert_called_with(
+            'SERVICE', 'METHOD', 1234, id=5, mask='id')
+
+    def test_call_invalid_arguments(self):
+        self.assertRaises(
+            TypeError,
+            self.client.call, 'SERVICE', 'METHOD', invalid_kwarg='invalid')
+
+    def test_call_exception(self):
+        self.sync_client.call.side_effect = ValueError('boom')
+        self.assertRaises(ValueError, run, self.client['SERVICE'].METHOD())
+
+    def test_concurrency_limit(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def blocking_call(*args, **kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return args[2]
+
+        self.sync_client.call.side_effect = blocking_call
+        calls = [self.client['SERVICE'].METHOD(i) for i in range(40)]
+        results = run(asyncio.gather(*calls))
+
+        self.assertEqual(results, list(range(40)))
+        self.assertEqual(state['peak'], 4)
+
+    def test_iter_call(self):
+        self.sync_client.call.side_effect = [list(range(100)),
+                                             list(range(100, 125))]
+        result = collect(self.client['SERVICE'].METHOD(iter=True))
+
+        self.assertEqual(result, list(range(125)))
+        self.sync_client.call.assert_has_calls([
+            call('SERVICE', 'METHOD', limit=100, offset=0),
+            call('SERVICE', 'METHOD', limit=100, offset=100),
+        ])
+
+    def test_iter_call_paging(self):
+        pages = iter(range(5))
+        self.sync_client.iter_call.return_value = pages
+        result = collect(self.client['SERVICE'].METHOD(
+            iter=True, chunk=3, cursor='id'))
+
+        self.assertEqual(result, list(range(5)))
+        self.sync_client.iter_call.assert_called_once_with(
+            'SERVICE', 'METHOD', 3, None, 0, cursor='id')
+
+    def test_iter_call_prefetch(self):
+        self.sync_client.iter_call.return_value = iter(range(5))
+        result = collect(self.client['SERVICE'].METHOD(
+            iter=True, chunk=2, prefetch=3))
+
+        self.assertEqual(result, list(range(5)))
+        self.sync_client.iter_call.assert_called_once_with(
+            'SERVICE', 'METHOD', 2, None, 0, prefetch=3)
+        self.assertFalse(self.sync_client.call.called)
+
+    def test_iter_call_limit(self):
+        self.sync_client.call.side_effect = [list(range(0, 25)),
+                                             list(range(25, 30))]
+        result = collect(self.client['SERVICE'].iter_call(
+            'METHOD', limit=30, chunk=25, offset=12))
+
+        self.assertEqual(result, list(range(30)))
+        self.sync_client.call.assert_has_calls([
+            call('SERVICE', 'METHOD', limit=25, offset=12),
+            call('SERVICE', 'METHOD', limit=5, offset=37),
+        ])
+
+    def test_iter_call_not_list(self):
+        self.sync_client.call.return_value = 'test'
+        result = collect(self.client.iter_call('SERVICE', 'METHOD'))
+        self.assertEqual(result, ['test'])
+
+    def test_iter_call_empty(self):
+        self.sync_client.call.return_value = []
+        result = collect(self.client['SERVICE'].METHOD(iter=True))
+
+        self.assertEqual(result, [])
+        self.assertEqual(self.sync_client.call.call_count, 1)
+
+    def test_iter_call_invalid_chunk(self):
+        agen = self.client.iter_call('SERVICE', 'METHOD', chunk=0)
+        self.assertRaises(AttributeError, run, agen.__anext__())
+
+    def test_deadline(self):
+        transport = MagicMock(return_value=[])
+        client = AsyncClient(username='doesnotexist', api_key='issurelywrong',
+                             transport=transport)
+        deadline = Deadline(30)
+        run(client['SERVICE'].METHOD(deadline=deadline))
+        self.assertLessEqual(transport.call_args[0][0].timeout, 30)
+
+        deadline.cancel()
+        self.assertRaises(DeadlineExceeded, run,
+                          client['SERVICE'].METHOD(deadline=deadline))
+        self.assertEqual(transport.call_count, 1)
+        client.close()
+
+    def test_context_manager(self):
+        async def use():
+            async with AsyncClient(client=self.sync_client) as client:
+                return client
+
+        client = run(use())
+        self.assertIsInstance(client, AsyncClient)
+        self.assertTrue(client.executor._shutdown)
+
+    def test_service_special_attributes(self):
+        service = self.client['SERVICE']
+        self.assertRaises(AttributeError, getattr, service, '__name__')
+        self.assertRaises(AttributeError, getattr, service, '__bases__')
+
+    def test_repr(self):
+        self.assertIn('AsyncClient', repr(self.client))
+        self.assertIn('AsyncService', repr(self.client['SERVICE']))
+
+    def test_creates_client(self):
+        client = AsyncClient(username='doesnotexist',
+                             api_key='issurelywrong', concurrency=7)
+        self.assertEqual(client.client.auth.username, 'doesnotexist')
+        adapter = client.client.session.get_adapter('https://')
+        self.assertEqual(adapter._pool_maxsize, 7)
+        client.close()
@@ -9,7 +9,11 @@ from mock import patch, call, Mock, ANY
 import SoftLayer
 import SoftLayer.API
 from SoftLayer.tests import unittest
-from SoftLayer.consts import USER_AGENT
+from SoftLayer.consts import USER_AGENT, API_PUBLIC_ENDPOINT_REST
+from SoftLayer.masks import Mask
+from SoftLayer.records import Record
+from SoftLayer.utils import Filter
+from SoftLayer.retry import RetryPolicy
 
 
 class Inititialization(unittest.TestCase):
@@ -37,6 +41,55 @@ class Inititialization(unittest.TestCase):
         self.assertEquals(client.timeout, 10)
         self.assertEquals(client.endpoint_url, 'http://endpoint_url')
 
+    def test_transport_rest(self):
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong', transport='rest')
+        self.assertIsInstance(client.transport,
+                              SoftLayer.transports.RestTransport)
+        self.assertEquals(client.endpoint_url,
+                          API_PUBLIC_ENDPOINT_REST.rstrip('/'))
+
+    def test_transport_default(self):
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong')
+        self.assertIsInstance(client.transport,
+                              SoftLayer.transports.XmlRpcTransport)
+
+    @patch('SoftLayer.API.get_client_settings')
+    def test_transport_config(self, get_client_settings):
+        get_client_settings.return_value = {'transport': 'rest'}
+        client = SoftLayer.Client()
+        self.assertIsInstance(client.transport,
+                              SoftLayer.transports.RestTransport)
+
+    @patch('SoftLayer.API.make_session')
+    def test_connection_pool(self, make_session):
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong',
+                                  pool_connections=4, pool_maxsize=20,
+                                  keep_alive=False)
+        make_session.assert_called_with(pool_connections=4, pool_maxsize=20,
+                                        keep_alive=False)
+        self.assertEqual(client.session, make_session())
+
+    @patch('SoftLayer.API.get_client_settings')
+    @patch('SoftLayer.API.make_session')
+    def test_connection_pool_env(self, make_session, get_client_settings):
+        get_client_settings.return_value = {
+            'pool_connections': '2',
+            'pool_maxsize': '50',
+            'keep_alive': 'false',
+        }
+        SoftLayer.Client()
+        make_session.assert_called_with(pool_connections=2, pool_maxsize=50,
+                                        keep_alive=False)
+
+    @patch('SoftLayer.API.make_session')
+    def test_connection_pool_defaults(self, make_session):
+        SoftLayer.Client(username='doesnotexist', api_key='issurelywrong')
+        make_session.assert_called_with(pool_connections=10, pool_maxsize=10,
+                                        keep_alive=True)
+
 
 class ClientMethods(unittest.TestCase):
     def test_help(self):
@@ -77,7 +130,7 @@ class APIClient(unittest.TestCase):
             username='doesnotexist', api_key='issurelywrong',
             endpoint_url="ENDPOINT")
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_simple_call(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD()
         make_xml_rpc_api_call.assert_called_with(
@@ -87,6 +140,9 @@ class APIClient(unittest.TestCase):
                     'username': 'doesnotexist', 'apiKey': 'issurelywrong'}},
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -94,7 +150,7 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_complex(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(
             1234,
@@ -119,6 +175,9 @@ class APIClient(unittest.TestCase):
                 'resultLimit': {'limit': 9, 'offset': 10}},
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'RAW': 'HEADER',
                 'Content-Type': 'application/xml',
@@ -127,7 +186,7 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_mask_call_v2(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(
             mask="mask[something[nested]]")
@@ -136,9 +195,12 @@ class APIClient(unittest.TestCase):
             headers={
                 'authenticate': {
                     'username': 'doesnotexist', 'apiKey': 'issurelywrong'},
-                'SoftLayer_ObjectMask': {'mask': 'mask[something[nested]]'}},
+                'SoftLayer_ObjectMask': {'mask': 'mask[something.nested]'}},
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -146,7 +208,7 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_mask_call_v2_dot(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(
             mask="mask.something.nested")
@@ -158,6 +220,9 @@ class APIClient(unittest.TestCase):
                 'SoftLayer_ObjectMask': {'mask': 'mask.something.nested'}},
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -165,7 +230,7 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_mask_call_no_mask_prefix(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(mask="something.nested")
         make_xml_rpc_api_call.assert_called_with(
@@ -176,6 +241,9 @@ class APIClient(unittest.TestCase):
                 'SoftLayer_ObjectMask': {'mask': 'mask[something.nested]'}},
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -183,6 +251,90 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
+    def test_filter_object(self):
+        transport = Mock()
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong',
+                                  endpoint_url='ENDPOINT',
+                                  transport=transport)
+        client['SERVICE'].METHOD(filter=Filter().where('guests.id', 1))
+
+        request = transport.call_args[0][0]
+        self.assertEqual(request.filter, {'guests': {'id': {'operation': 1}}})
+        self.assertIsInstance(request.filter, dict)
+
+    def test_mask_object(self):
+        transport = Mock()
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong',
+                                  endpoint_url='ENDPOINT',
+                                  transport=transport)
+        client['SERVICE'].METHOD(mask=Mask('id, datacenter.name') + 'id')
+
+        request = transport.call_args[0][0]
+        self.assertEqual(request.mask, 'mask[datacenter.name,id]')
+
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
+    def test_stream(self, make_xml_rpc_api_call):
+        result = self.client['SERVICE'].METHOD(stream=True)
+        make_xml_rpc_api_call.assert_called_with(
+            'ENDPOINT/SoftLayer_SERVICE', 'METHOD', (),
+            headers=ANY,
+            proxy=None,
+            timeout=None,
+            session=self.client.session,
+            stream=True,
+            request=ANY,
+            http_headers=ANY)
+        self.assertEqual(result, make_xml_rpc_api_call())
+
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
+    def test_compact(self, make_xml_rpc_api_call):
+        make_xml_rpc_api_call.return_value = [
+            {'id': 1, 'datacenter': {'name': 'dal05'}},
+            {'id': 2, 'datacenter': {'name': 'sjc01'}}]
+
+        result = self.client['SERVICE'].METHOD(compact=True)
+
+        self.assertEqual(result, make_xml_rpc_api_call.return_value)
+        self.assertIsInstance(result[0], Record)
+        self.assertIs(type(result[0]), type(result[1]))
+        self.assertEqual(result[1]['datacenter']['name'], 'sjc01')
+
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
+    def test_compact_stream(self, make_xml_rpc_api_call):
+        make_xml_rpc_api_call.return_value = iter([{'id': 1}])
+
+        result = list(self.client['SERVICE'].METHOD(stream=True,
+                                                    compact=True))
+
+        self.assertEqual(result, [{'id': 1}])
+        self.assertIsInstance(result[0], Record)
+
+    def test_custom_transport(self):
+        transport = Mock()
+        client = SoftLayer.Client(username='doesnotexist',
+                                  api_key='issurelywrong',
+                                  endpoint_url='ENDPOINT',
+                                  transport=transport)
+        result = client['SERVICE'].METHOD(1234, id=5678, mask='id',
+                                          filter={'id': 1}, limit=9)
+
+        request = transport.call_args[0][0]
+        self.assertEqual(result, transport.return_value)
+        self.assertEqual(request.service, 'SoftLayer_SERVICE')
+        self.assertEqual(request.method, 'METHOD')
+        self.assertEqual(request.args, (1234,))
+        self.assertEqual(request.identifier, 5678)
+        self.assertEqual(request.mask, 'mask[id]')
+        self.assertEqual(request.filter, {'id': 1})
+        self.assertEqual(request.limit, 9)
+        self.assertEqual(request.endpoint_url, 'ENDPOINT')
+        self.assertEqual(request.session, client.session)
+        self.assertEqual(request.headers['authenticate']['username'],
+                         'doesnotexist')
+        self.assertEqual(request.transport_headers['User-Agent'], USER_AGENT)
+
     @patch('SoftLayer.API.Client.iter_call')
     def test_iterate(self, _iter_call):
         self.client['SERVICE'].METHOD(iter=True)
@@ -253,12 +405,65 @@ class APIClient(unittest.TestCase):
             lambda: list(self.client.iter_call(
                 'SERVICE', 'METHOD', iter=True, chunk=0)))
 
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_prefetch(self, _call):
+        pages = {0: list(range(100)), 100: list(range(100, 200)),
+                 200: list(range(200, 225))}
+        _call.side_effect = lambda *args, **kwargs: pages.get(
+            kwargs['offset'], [])
+
+        result = list(self.client.iter_call('SERVICE', 'METHOD', iter=True,
+                                            prefetch=2))
+
+        self.assertEquals(list(range(225)), result)
+        _call.assert_has_calls([
+            call('SERVICE', 'METHOD', limit=100, iter=False, offset=0),
+            call('SERVICE', 'METHOD', limit=100, iter=False, offset=100),
+            call('SERVICE', 'METHOD', limit=100, iter=False, offset=200),
+        ], any_order=True)
+        # At most one page is requested past the short one
+        self.assertLessEqual(_call.call_count, 4)
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_prefetch_limit(self, _call):
+        _call.side_effect = lambda *args, **kwargs: list(range(
+            kwargs['offset'], kwargs['offset'] + kwargs['limit']))
+
+        result = list(self.client.iter_call(
+            'SERVICE', 'METHOD', iter=True, prefetch=4, limit=30, chunk=25,
+            offset=12))
+
+        self.assertEquals(list(range(12, 42)), result)
+        self.assertEqual(_call.call_count, 2)
+        _call.assert_has_calls([
+            call('SERVICE', 'METHOD', iter=False, limit=25, offset=12),
+            call('SERVICE', 'METHOD', iter=False, limit=5, offset=37),
+        ], any_order=True)
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_prefetch_not_list(self, _call):
+        _call.return_value = 'test'
+        result = list(self.client.iter_call('SERVICE', 'METHOD', prefetch=3))
+        self.assertEquals(['test'], result)
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_prefetch_error(self, _call):
+        def page(*args, **kwargs):
+            if kwargs['offset'] == 100:
+                raise SoftLayer.SoftLayerAPIError('faultCode', 'faultString')
+            return list(range(kwargs['offset'], kwargs['offset'] + 100))
+        _call.side_effect = page
+
+        gen = self.client.iter_call('SERVICE', 'METHOD', prefetch=3)
+        self.assertEquals(list(range(100)), [next(gen) for _ in range(100)])
+        self.assertRaises(SoftLayer.SoftLayerAPIError, next, gen)
+
     def test_call_invalid_arguments(self):
         self.assertRaises(
             TypeError,
             self.client.call, 'SERVICE', 'METHOD', invalid_kwarg='invalid')
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_call_compression_disabled(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(compress=False)
         make_xml_rpc_api_call.assert_called_with(
@@ -266,12 +471,15 @@ class APIClient(unittest.TestCase):
             headers=ANY,
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_call_compression_enabled(self, make_xml_rpc_api_call):
         self.client['SERVICE'].METHOD(compress=True)
         make_xml_rpc_api_call.assert_called_with(
@@ -279,6 +487,9 @@ class APIClient(unittest.TestCase):
             headers=ANY,
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -286,7 +497,7 @@ class APIClient(unittest.TestCase):
                 'Accept-Encoding': 'gzip, deflate, compress',
             })
 
-    @patch('SoftLayer.API.make_xml_rpc_api_call')
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
     def test_call_compression_override(self, make_xml_rpc_api_call):
         # raw_headers should override compress=False
         self.client['SERVICE'].METHOD(
@@ -297,6 +508,9 @@ class APIClient(unittest.TestCase):
             headers=ANY,
             proxy=None,
             timeout=None,
+            session=self.client.session,
+            stream=False,
+            request=ANY,
             http_headers={
                 'Content-Type': 'application/xml',
                 'User-Agent': USER_AGENT,
@@ -311,18 +525,93 @@ class APITimedClient(unittest.TestCase):
             endpoint_url="ENDPOINT")
 
     @patch('SoftLayer.API.time.time')
-    @patch('SoftLayer.API.Client.call')
-    def test_overriden_call_times_methods(self, _call, _time):
-        _call.side_effect = [list(range(10))]
+    def test_overriden_call_times_methods(self, _time):
+        self.client.transport = Mock(return_value=list(range(10)))
         _time.side_effect = [1121362200, 1121762200]
 
         result = list(self.client.call('SERVICE', 'METHOD'))
 
         self.assertEqual(list(range(10)), result)
 
-        expected_calls = [('SERVICE.METHOD', 1121362200, 400000)]
+        expected_calls = [('SERVICE.METHOD', 1121362200, 400000, 0)]
         self.assertEqual(expected_calls, self.client.get_last_calls())
 
+    @patch('SoftLayer.retry.time.sleep')
+    def test_retries_recorded(self, _sleep):
+        self.client.retry_policy = RetryPolicy(max_attempts=3)
+        self.client.transport = Mock(side_effect=[
+            SoftLayer.TransportError(0, 'timeout'), 'ok'])
+
+        self.assertEqual(self.client['Account'].getObject(), 'ok')
+
+        (call, _, _, retries), = self.client.get_last_calls()
+        self.assertEqual(call, 'Account.getObject')
+        self.assertEqual(retries, 1)
+
+
+class APIBatch(unittest.TestCase):
+    def setUp(self):
+        self.transport = Mock(side_effect=self._transport)
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport)
+
+    @staticmethod
+    def _transport(request):
+        if request.identifier == 2:
+            raise SoftLayer.SoftLayerAPIError('NotFound', 'nope')
+        return {'service': request.service, 'id': request.identifier}
+
+    def test_batch(self):
+        with self.client.batch(max_workers=2) as batch:
+            self.assertEqual(batch['Virtual_Guest'].getObject(id=1), 0)
+            self.assertEqual(
+                batch.call('Hardware_Server', 'getObject', id=2), 1)
+            self.assertEqual(
+                batch.call('Hardware_Server', 'getObject', id=3), 2)
+            self.assertEqual(len(batch), 3)
+            self.assertEqual(batch.results, [])
+
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertEqual(batch.results[0],
+                         {'service': 'SoftLayer_Virtual_Guest', 'id': 1})
+        self.assertIsInstance(batch.results[1], SoftLayer.SoftLayerAPIError)
+        self.assertEqual(batch.results[2],
+                         {'service': 'SoftLayer_Hardware_Server', 'id': 3})
+        self.assertEqual(batch.errors, [(1, batch.results[1])])
+
+        timing = batch.timing
+        self.assertEqual(timing['calls'], 3)
+        self.assertEqual(timing['errors'], 1)
+        self.assertTrue(timing['elapsed'] >= 0)
+        self.assertTrue(timing['max'] <= timing['total'])
+
+    def test_run(self):
+        batch = self.client.batch()
+        for guest_id in range(5, 0, -1):
+            batch['Virtual_Guest'].getObject(id=guest_id, mask='id')
+
+        results = batch.run()
+
+        self.assertEqual([result['id'] if isinstance(result, dict) else None
+                          for result in results], [5, 4, 3, None, 1])
+        self.assertEqual(batch.durations.count(None), 0)
+
+    def test_empty(self):
+        self.assertEqual(self.client.batch().run(), [])
+
+    def test_exception_in_block(self):
+        def queue_and_fail():
+            with self.client.batch() as batch:
+                batch['Account'].getObject()
+                raise ValueError
+
+        self.assertRaises(ValueError, queue_and_fail)
+        self.assertFalse(self.transport.called)
+
+    def test_repr(self):
+        self.assertEqual(repr(self.client.batch()), '<Batch: 0 calls>')
+
 
 class UnauthenticatedAPIClient(unittest.TestCase):
     def setUp(self):
@@ -5,8 +5,14 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import datetime
+
 import SoftLayer
-from SoftLayer.tests import unittest
+from mock import patch, MagicMock
+
+from SoftLayer.deadline import Deadline
+from SoftLayer.tests import unittest, FakeClock
+from SoftLayer.utils import Filter, Poller
 
 
 class TestExceptions(unittest.TestCase):
@@ -100,6 +106,112 @@ class TestNestedDict(unittest.TestCase):
         self.assertEqual(dict, type(d['test']['test1']['test2']['test3']))
 
 
+class TestFilter(unittest.TestCase):
+
+    def test_where(self):
+        _filter = Filter().where('guests.hostname', 'web*') \
+            .where('guests.datacenter.name', 'dal05') \
+            .where('guests.maxCpu', 4) \
+            .where('guests.id', {'operation': '> 5'})
+        self.assertEqual(_filter.to_dict(), {'guests': {
+            'hostname': {'operation': '^= web'},
+            'datacenter': {'name': {'operation': '_= dal05'}},
+            'maxCpu': {'operation': 4},
+            'id': {'operation': '> 5'}}})
+
+    def test_immutable(self):
+        base = Filter().where('guests.hostname', 'web')
+        extended = base.where('guests.domain', 'example.com')
+        self.assertEqual(list(base.to_dict()['guests']), ['hostname'])
+        self.assertEqual(len(extended.to_dict()['guests']), 2)
+
+        compiled = base.to_dict()
+        compiled['guests']['hostname'] = 'changed'
+        self.assertEqual(base.to_dict()['guests']['hostname'],
+                         {'operation': '_= web'})
+
+    def test_base(self):
+        base = {'guests': {'id': {'operation': 1}, 'domain': {}}}
+        _filter = Filter(base).where('guests.hostname', 'a')
+        self.assertEqual(_filter.to_dict(), {'guests': {
+            'id': {'operation': 1}, 'hostname': {'operation': '_= a'}}})
+        self.assertEqual(Filter(_filter), _filter)
+        self.assertEqual(Filter(None).to_dict(), {})
+        self.assertFalse(Filter())
+
+    def test_replaces_condition(self):
+        _filter = Filter({'guests': {'id': {'operation': 1}}}) \
+            .where('guests.id', 2)
+        self.assertEqual(_filter.to_dict(), {'guests': {'id': {
+            'operation': 2}}})
+
+    def test_get(self):
+        _filter = Filter({'guests': {'id': {'operation': 1}}})
+        self.assertEqual(_filter.get('guests.id'), {'operation': 1})
+        self.assertEqual(_filter.get(('guests', 'id')), {'operation': 1})
+        self.assertEqual(_filter.get('guests.hostname'), None)
+
+    def test_where_in(self):
+        _filter = Filter().where_in('guests.id', iter([3, 1, 3, 2]))
+        self.assertEqual(_filter.to_dict(), {'guests': {'id': {
+            'operation': 'in',
+            'options': [{'name': 'data', 'value': [3, 1, 2]}]}}})
+
+    def test_where_not(self):
+        self.assertEqual(Filter().where_not('type', 'GLOBAL_IP').to_dict(),
+                         {'type': {'operation': '!= GLOBAL_IP'}})
+
+    def test_dates(self):
+        start = datetime.datetime(2013, 3, 1)
+        _filter = Filter().between('createDate', start, '03/15/2013 0:0:0') \
+            .after('modifyDate', datetime.date(2013, 3, 2)) \
+            .before('provisionDate', '03/03/2013 0:0:0')
+        self.assertEqual(_filter.to_dict(), {
+            'createDate': {'operation': 'betweenDate', 'options': [
+                {'name': 'startDate', 'value': ['03/01/2013 00:00:00']},
+                {'name': 'endDate', 'value': ['03/15/2013 0:0:0']}]},
+            'modifyDate': {'operation': 'greaterThanDate', 'options': [
+                {'name': 'date', 'value': ['03/02/2013 00:00:00']}]},
+            'provisionDate': {'operation': 'lessThanDate', 'options': [
+                {'name': 'date', 'value': ['03/03/2013 0:0:0']}]}})
+
+    def test_order_by(self):
+        _filter = Filter().order_by('guests.id')
+        self.assertEqual(_filter.to_dict(), {'guests': {'id': {
+            'operation': 'orderBy',
+            'options': [{'name': 'sort', 'value': ['ASC']}]}}})
+
+        _filter = Filter().where('guests.id', '> 10') \
+            .order_by('guests.hostname', 'DESC').order_by('guests.id')
+        self.assertEqual(_filter.to_dict(), {'guests': {
+            'hostname': {'operation': 'orderBy', 'options': [
+                {'name': 'sort', 'value': ['DESC']},
+                {'name': 'sortOrder', 'value': [1]}]},
+            'id': {'operation': '> 10', 'options': [
+                {'name': 'sort', 'value': ['ASC']},
+                {'name': 'sortOrder', 'value': [2]}]}}})
+
+    def test_merge(self):
+        first = Filter().where('guests.id', 1).order_by('guests.id')
+        second = Filter().where('guests.id', 2).where('guests.domain', 'a')
+        merged = first & second
+        self.assertEqual(merged, Filter().where('guests.id', 2)
+                         .where('guests.domain', 'a').order_by('guests.id'))
+        self.assertEqual(first.merge({'guests': {'domain': {
+            'operation': 'b'}}}).to_dict()['guests']['domain'],
+            {'operation': 'b'})
+
+    def test_equality_and_hash(self):
+        first = Filter().where('a', 1).where_in('b', [1, 2])
+        second = Filter().where_in('b', [1, 2]).where('a', 1)
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(first, first.to_dict())
+        self.assertNotEqual(first, Filter().where('a', 1))
+        self.assertNotEqual(first, 1)
+        self.assertEqual(len(set([first, second])), 1)
+
+
 class TestLookup(unittest.TestCase):
 
     def test_lookup(self):
@@ -117,6 +229,59 @@ class TestLookup(unittest.TestCase):
         self.assertEqual(val, None)
 
 
+class TestPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patchers = [patch('SoftLayer.utils.time', self.clock),
+                    patch('SoftLayer.utils.random.uniform', return_value=1)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_backoff(self):
+        poller = Poller(timeout=60, interval=2, max_interval=10, backoff=2)
+        self.assertEqual(list(poller), list(range(1, 10)))
+        self.assertEqual(self.clock.sleeps, [2, 4, 8, 10, 10, 10, 10, 6])
+
+    def test_fast_phase(self):
+        poller = Poller(timeout=40, interval=5, max_interval=30, backoff=2,
+                        fast_period=3, fast_interval=1)
+        list(poller)
+        self.assertEqual(self.clock.sleeps, [1, 1, 1, 5, 10, 20, 2])
+
+    def test_jitter(self):
+        poller = Poller(interval=10, jitter=0.5)
+        with patch('SoftLayer.utils.random.uniform',
+                   return_value=1.5) as uniform:
+            self.assertEqual(poller.get_interval(0, 1), 15)
+            uniform.assert_called_once_with(0.5, 1.5)
+        self.assertEqual(Poller(interval=10, jitter=0).get_interval(0, 1), 10)
+        self.assertEqual(Poller(interval=60).get_interval(0, 5), 60)
+
+    def test_no_timeout(self):
+        checks = iter(Poller(interval=1))
+        self.assertEqual([next(checks) for _ in range(50)], list(range(1, 51)))
+
+    def test_poll(self):
+        check = MagicMock(side_effect=[None, None, 'done'])
+        self.assertEqual(Poller(timeout=10).poll(check), 'done')
+        self.assertEqual(check.call_count, 3)
+
+        check = MagicMock(return_value=False)
+        self.assertEqual(Poller(timeout=0).poll(check), False)
+        self.assertEqual(check.call_count, 1)
+
+    def test_deadline(self):
+        deadline = Deadline()
+        deadline.sleep = MagicMock(side_effect=[True, False])
+        self.assertEqual(list(Poller(deadline=deadline)), [1, 2])
+
+        deadline = Deadline()
+        deadline.cancel()
+        self.assertEqual(list(Poller(deadline=deadline)), [])
+
+
 def is_a(string):
     if string == 'a':
         return ['this', 'is', 'a']
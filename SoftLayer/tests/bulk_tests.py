@@ -0,0 +1,142 @@
+"""
+    SoftLayer.tests.bulk_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+from mock import MagicMock, patch, call
+
+import SoftLayer
+from SoftLayer.bulk import BulkRunner, run_bulk
+from SoftLayer.deadline import Deadline
+from SoftLayer.tests import unittest
+
+
+class BulkRunnerTests(unittest.TestCase):
+
+    def test_run(self):
+        callback = MagicMock()
+        error = SoftLayer.SoftLayerAPIError('SoftLayer_Exception', 'no')
+
+        def operation(key):
+            if key == 2:
+                raise error
+            return key * 10
+
+        report = BulkRunner(max_workers=2).run(operation, [1, 2, 3, 1],
+                                               callback=callback)
+
+        self.assertEqual(list(report.results.items()),
+                         [(1, 10), (2, error), (3, 30)])
+        self.assertEqual(report.succeeded, [1, 3])
+        self.assertEqual(report.errors, [(2, error)])
+        self.assertEqual(report.skipped, [])
+        self.assertFalse(report.ok)
+        callback.assert_has_calls([call(1, 10), call(2, error),
+                                   call(3, 30)], any_order=True)
+
+    def test_waves(self):
+        ids = list(range(10))
+        self.assertEqual(BulkRunner().get_waves(ids), [ids])
+        self.assertEqual(BulkRunner(batch_size=4).get_waves(ids),
+                         [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual(BulkRunner(percent=25).get_waves(ids),
+                         [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]])
+        self.assertEqual(BulkRunner(percent=1).get_waves(ids)[0], [0])
+        self.assertRaises(ValueError, BulkRunner, batch_size=2, percent=10)
+
+    def test_max_failures(self):
+        operation = MagicMock(side_effect=[1, ValueError(), ValueError(), 4])
+        runner = BulkRunner(max_workers=1, batch_size=2, max_failures=1)
+
+        report = runner.run(operation, [1, 2, 3, 4, 5, 6])
+
+        self.assertEqual(list(report.results), [1, 2, 3])
+        self.assertEqual(report.skipped, [4, 5, 6])
+        self.assertEqual(operation.call_count, 3)
+
+    def test_max_failures_in_one_wave(self):
+        operation = MagicMock(side_effect=[1, ValueError(), 3])
+        runner = BulkRunner(max_workers=1, max_failures=0)
+
+        report = runner.run(operation, [1, 2, 3, 4])
+
+        self.assertEqual(list(report.results), [1, 2])
+        self.assertEqual(report.skipped, [3, 4])
+        self.assertEqual(operation.call_count, 2)
+
+    @patch('SoftLayer.bulk.time.sleep')
+    def test_pause(self, _sleep):
+        runner = BulkRunner(batch_size=1, pause=5)
+        report = runner.run(lambda key: key, [1, 2, 3])
+        self.assertTrue(report.ok)
+        self.assertEqual(_sleep.call_args_list, [call(5), call(5)])
+
+    def test_deadline(self):
+        deadline = Deadline()
+        operation = MagicMock(side_effect=lambda key: deadline.cancel())
+
+        report = BulkRunner(max_workers=1, deadline=deadline).run(
+            operation, [1, 2, 3])
+
+        self.assertEqual(list(report.results), [1])
+        self.assertEqual(report.skipped, [2, 3])
+
+    @patch('SoftLayer.bulk.time.sleep')
+    def test_pause_deadline(self, _sleep):
+        deadline = MagicMock(expired=False)
+        runner = BulkRunner(batch_size=1, pause=5, deadline=deadline)
+
+        report = runner.run(lambda key: key, [1, 2])
+
+        self.assertTrue(report.ok)
+        # The pause ends early if the deadline does
+        deadline.sleep.assert_called_once_with(5)
+        self.assertFalse(_sleep.called)
+
+    def test_repr(self):
+        runner = BulkRunner(max_workers=2, rate=4)
+        self.assertEqual(repr(runner), 'BulkRunner(max_workers=2, rate=4, '
+                                       'batch_size=None, percent=None)')
+
+        report = runner.run(lambda key: key, [1, 2])
+        self.assertEqual(repr(report),
+                         'BulkReport(succeeded=2, failed=0, skipped=0)')
+
+    @patch('SoftLayer.bulk.time.sleep')
+    @patch('SoftLayer.bulk.TokenBucket')
+    def test_rate(self, bucket, _sleep):
+        bucket.return_value.reserve.side_effect = [0, 0.5, 0.25]
+        report = BulkRunner(max_workers=1, rate=2).run(lambda key: key,
+                                                       [1, 2, 3])
+        self.assertTrue(report.ok)
+        bucket.assert_called_once_with(2)
+        self.assertEqual(_sleep.call_args_list, [call(0.5), call(0.25)])
+
+
+class RunBulkTests(unittest.TestCase):
+
+    def test_ids(self):
+        select = MagicMock()
+        report = run_bulk(lambda key: key, [1, 2], select)
+        self.assertEqual(report.succeeded, [1, 2])
+        self.assertFalse(select.called)
+
+    def test_filters(self):
+        select = MagicMock(return_value=[{'id': 5}, {'id': 6}])
+        report = run_bulk(lambda key: key, None, select, tags=['web'],
+                          datacenter=None)
+        self.assertEqual(report.succeeded, [5, 6])
+        select.assert_called_once_with(mask='id', tags=['web'])
+
+    def test_no_ids_or_filters(self):
+        self.assertRaises(ValueError, run_bulk, MagicMock(), None,
+                          MagicMock(), datacenter=None)
+
+    def test_empty_filters(self):
+        select = MagicMock()
+        for filters in [{'tags': []}, {'datacenter': ''}, {'tags': ()},
+                        {'hourly': True, 'tags': []}]:
+            self.assertRaises(ValueError, run_bulk, MagicMock(), None,
+                              select, **filters)
+        self.assertFalse(select.called)
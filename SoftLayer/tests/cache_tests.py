@@ -0,0 +1,390 @@
+"""
+    SoftLayer.tests.cache_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import os
+import os.path
+import shutil
+import tempfile
+import threading
+import time
+
+from mock import patch, Mock
+
+import SoftLayer
+from SoftLayer.cache import (
+    ResponseCache, SingleFlight, CatalogCache, CATALOG_METHODS, catalog_key,
+    user_cache_dir)
+from SoftLayer.tests import unittest, FakeClock
+
+
+class ResponseCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Mock(return_value={'id': 1})
+        self.cache = ResponseCache(methods=['*.get*'])
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport, cache=self.cache)
+
+    def test_hit(self):
+        first = self.client['Account'].getObject(mask='id')
+        second = self.client['Account'].getObject(mask='id')
+
+        self.assertEqual(self.transport.call_count, 1)
+        self.assertEqual(first, {'id': 1})
+        self.assertEqual(second, {'id': 1})
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_results_are_copies(self):
+        self.client['Account'].getObject()['id'] = 2
+        self.assertEqual(self.client['Account'].getObject(), {'id': 1})
+
+    def test_key(self):
+        service = self.client['Virtual_Guest']
+        service.getObject(id=1)
+        service.getObject(id=2)
+        service.getObject(id=1, mask='hostname')
+        service.getObject(id=1, filter={'id': {'operation': 1}})
+        service.getObject(id=1, limit=1, offset=1)
+        service.getObject(1, id=1)
+        service.getObject(id=1, filter={'id': {'operation': 1}})
+
+        self.assertEqual(self.transport.call_count, 6)
+
+    def test_not_cacheable(self):
+        self.cache.methods = ['Account.getObject']
+        self.client['Account'].getHardware()
+        self.client['Account'].getHardware()
+        self.client['Account'].getObject()
+        self.client['Account'].getObject()
+
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertTrue(self.cache.is_cacheable('SoftLayer_Account',
+                                                'getObject'))
+        self.assertFalse(self.cache.is_cacheable('Account', 'getHardware'))
+
+    def test_only_get_methods(self):
+        self.cache.methods = ['*']
+        self.client['Product_Order'].verifyOrder({})
+        self.client['Product_Order'].verifyOrder({})
+
+        self.assertEqual(self.transport.call_count, 2)
+
+    def test_stream_not_cached(self):
+        self.client['Account'].getHardware(stream=True)
+        self.client['Account'].getHardware(stream=True)
+
+        self.assertEqual(self.transport.call_count, 2)
+
+    @patch('SoftLayer.cache.time.time')
+    def test_ttl(self, time):
+        self.cache.ttls = {'Account.getHardware': 100}
+        time.return_value = 1000
+        self.client['Account'].getObject()
+        self.client['Account'].getHardware()
+
+        time.return_value = 1000 + 99
+        self.client['Account'].getObject()
+        self.client['Account'].getHardware()
+        self.assertEqual(self.transport.call_count, 2)
+
+        time.return_value = 1000 + 100
+        self.client['Account'].getObject()
+        self.client['Account'].getHardware()
+        self.assertEqual(self.transport.call_count, 3)
+
+        time.return_value = 1000 + 300
+        self.client['Account'].getObject()
+        self.assertEqual(self.transport.call_count, 4)
+
+    def test_lru(self):
+        self.cache.max_size = 2
+        service = self.client['Virtual_Guest']
+        service.getObject(id=1)
+        service.getObject(id=2)
+        service.getObject(id=1)
+        service.getObject(id=3)
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertEqual(self.cache.stats['evictions'], 1)
+        self.assertEqual(len(self.cache), 2)
+
+        # id=2 was the least recently used
+        service.getObject(id=1)
+        self.assertEqual(self.transport.call_count, 3)
+        service.getObject(id=2)
+        self.assertEqual(self.transport.call_count, 4)
+
+    def test_mutating_call_invalidates_service(self):
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.client['Account'].getObject()
+        self.client['Hardware'].getObject(id=1)
+
+        self.client['Virtual_Guest'].editObject({'notes': 'x'}, id=1)
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.client['Account'].getObject()
+        self.client['Hardware'].getObject(id=1)
+
+        # Account lists the objects of other services, so it's dropped too
+        self.assertEqual(self.transport.call_count, 6)
+        self.assertEqual(self.cache.stats['invalidations'], 2)
+
+    def test_related_services(self):
+        self.cache.related = []
+        self.client['Account'].getSshKeys()
+        self.client['Security_Ssh_Key'].createObject({})
+        self.client['Account'].getSshKeys()
+        self.assertEqual(self.transport.call_count, 2)
+
+    def test_invalidates_after_mutating_call(self):
+        def transport(request):
+            if request.method == 'createObject':
+                # A read made while the change is in progress
+                self.client['Account'].getSshKeys()
+                return {'id': 2}
+            return {'id': 1}
+        self.transport.side_effect = transport
+
+        self.client['Security_Ssh_Key'].createObject({})
+        self.client['Account'].getSshKeys()
+        self.assertEqual(self.transport.call_count, 3)
+
+    def test_failed_mutating_call_invalidates(self):
+        self.client['Account'].getObject()
+        self.transport.side_effect = SoftLayer.SoftLayerAPIError('E', 'E')
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.client['Account'].editObject, {})
+        self.assertEqual(len(self.cache), 0)
+
+    def test_not_stored_after_invalidation(self):
+        def transport(request):
+            # The cache is invalidated while the read is in flight
+            self.cache.invalidate('Virtual_Guest')
+            return {'id': 1}
+        self.transport.side_effect = transport
+
+        self.client['Account'].getObject()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_cache_false(self):
+        self.client['Account'].getObject(cache=False)
+        self.client['Account'].getObject(cache=False)
+        self.assertEqual(self.transport.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_default_methods(self):
+        self.client.cache = cache = ResponseCache()
+        self.client['Account'].getObject()
+        self.client['Account'].getObject()
+        self.client['Product_Package'].getCategories(id=1)
+        self.client['Product_Package'].getCategories(id=1)
+
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertEqual(cache.methods, CATALOG_METHODS)
+
+    @patch('SoftLayer.utils.time', FakeClock())
+    def test_polling_skips_cache(self):
+        self.transport.return_value = {'activeTransaction': {'id': 1}}
+        manager = SoftLayer.CCIManager(self.client)
+
+        self.assertFalse(manager.wait_for_ready(1, 4))
+        self.assertGreater(self.transport.call_count, 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate(self):
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.client['Virtual_Guest'].getTagReferences(id=1)
+        self.client['Account'].getObject()
+
+        self.cache.invalidate('Virtual_Guest', 'getTagReferences')
+        self.assertEqual(len(self.cache), 2)
+        self.cache.invalidate('SoftLayer_Account')
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats['invalidations'], 3)
+
+    def test_errors_not_cached(self):
+        self.transport.side_effect = SoftLayer.SoftLayerAPIError('E', 'E')
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.client['Account'].getObject)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_repr(self):
+        self.assertIn('ResponseCache', repr(self.cache))
+
+
+class SingleFlightTests(unittest.TestCase):
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.transport = Mock(side_effect=self._transport)
+        self.singleflight = SingleFlight()
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport, singleflight=self.singleflight)
+        self.result = {'vlans': [{'id': 1}]}
+
+    def _transport(self, _):
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    def _run_concurrently(self, count, func):
+        """ Runs func in count threads, all of which share the first call """
+        results = [None] * count
+
+        def worker(index):
+            try:
+                results[index] = func()
+            except Exception as ex:  # pylint: disable=W0703
+                results[index] = ex
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i in range(count)]
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while self.singleflight.stats['deduplicated'] < count - 1:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_shared_result(self):
+        results = self._run_concurrently(
+            5, lambda: self.client['Account'].getNetworkVlans(mask='id'))
+
+        self.assertEqual(self.transport.call_count, 1)
+        self.assertEqual(results, [self.result] * 5)
+        self.assertEqual(self.singleflight.stats,
+                         {'calls': 5, 'deduplicated': 4})
+
+        # Every caller gets its own copy
+        results[1]['vlans'].append({'id': 2})
+        self.assertEqual(results[2], self.result)
+        self.assertEqual(len(set(id(result) for result in results)), 5)
+
+    def test_shared_exception(self):
+        self.result = SoftLayer.TransportError(0, 'reset')
+        results = self._run_concurrently(
+            3, lambda: self.client['Account'].getNetworkVlans())
+
+        self.assertEqual(self.transport.call_count, 1)
+        self.assertEqual(results, [self.result] * 3)
+
+    def test_sequential_calls_not_shared(self):
+        self.release.set()
+        self.client['Account'].getNetworkVlans()
+        self.client['Account'].getNetworkVlans()
+
+        self.assertEqual(self.transport.call_count, 2)
+        self.assertEqual(self.singleflight.stats['deduplicated'], 0)
+
+    def test_only_get_methods(self):
+        self.release.set()
+        self.singleflight.methods = ['*']
+        self.client['Virtual_Guest'].createObject({})
+
+        self.assertEqual(self.singleflight.stats['calls'], 0)
+
+    def test_repr(self):
+        self.assertIn('SingleFlight', repr(self.singleflight))
+
+
+class CatalogCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = CatalogCache(os.path.join(self.path, 'softlayer'))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_set_get(self):
+        data = {'locations': [{'keyname': 'RANDOM_LOCATION'}],
+                'categories': {'os': {'items': [{'capacity': 1.0}]}}}
+        self.cache.set('package-50', data)
+
+        self.assertEqual(self.cache.get('package-50'), data)
+        self.assertEqual(os.listdir(self.cache.path), ['package-50.json'])
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('package-50'))
+
+    def test_get_corrupt(self):
+        self.cache.set('package-50', {})
+        with open(os.path.join(self.cache.path, 'package-50.json'), 'w') as f:
+            f.write('{"locat')
+
+        self.assertIsNone(self.cache.get('package-50'))
+
+    @patch('SoftLayer.cache.time.time')
+    def test_ttl(self, time):
+        self.cache.set('package-50', {})
+        mtime = os.path.getmtime(
+            os.path.join(self.cache.path, 'package-50.json'))
+
+        time.return_value = mtime + self.cache.ttl - 1
+        self.assertEqual(self.cache.get('package-50'), {})
+        time.return_value = mtime + self.cache.ttl
+        self.assertIsNone(self.cache.get('package-50'))
+
+    def test_replace(self):
+        self.cache.set('package-50', {'version': 1})
+        self.cache.set('package-50', {'version': 2})
+
+        self.assertEqual(self.cache.get('package-50'), {'version': 2})
+        self.assertEqual(os.listdir(self.cache.path), ['package-50.json'])
+
+    def test_failed_write(self):
+        self.cache.set('package-50', {'version': 1})
+        with patch('SoftLayer.cache.json.dump') as dump:
+            dump.side_effect = IOError
+            self.cache.set('package-50', {'version': 2})
+
+        self.assertEqual(self.cache.get('package-50'), {'version': 1})
+        self.assertEqual(os.listdir(self.cache.path), ['package-50.json'])
+
+    def test_delete(self):
+        self.cache.set('package-50', {})
+        self.cache.delete('package-50')
+        self.cache.delete('package-50')
+
+        self.assertIsNone(self.cache.get('package-50'))
+
+    def test_catalog_key(self):
+        client = SoftLayer.Client(username='a', api_key='key',
+                                  endpoint_url='https://one')
+        key = catalog_key(client, 'package-50')
+        self.assertTrue(key.endswith('-package-50'))
+        self.assertEqual(catalog_key(client, 'package-50'), key)
+
+        other_user = SoftLayer.Client(username='b', api_key='key',
+                                      endpoint_url='https://one')
+        other_endpoint = SoftLayer.Client(username='a', api_key='key',
+                                          endpoint_url='https://two')
+        self.assertNotEqual(catalog_key(other_user, 'package-50'), key)
+        self.assertNotEqual(catalog_key(other_endpoint, 'package-50'), key)
+
+        self.cache.set(key, {})
+        self.assertEqual(os.listdir(self.cache.path), ['%s.json' % key])
+
+    @patch('SoftLayer.cache.sys')
+    def test_user_cache_dir(self, _sys):
+        _sys.platform = 'linux2'
+        with patch.dict(os.environ, {'XDG_CACHE_HOME': '/xdg'}):
+            self.assertEqual(user_cache_dir(), '/xdg/softlayer')
+
+        _sys.platform = 'win32'
+        with patch.dict(os.environ, {'LOCALAPPDATA': '/appdata'}):
+            self.assertEqual(user_cache_dir(),
+                             os.path.join('/appdata', 'softlayer'))
@@ -63,6 +63,10 @@ class TestGetClientSettingsArgs(unittest.TestCase):
             'timeout': None,
             'proxy': None,
             'auth': None,
+            'pool_connections': None,
+            'pool_maxsize': None,
+            'keep_alive': None,
+            'transport': None,
         })
 
     def test_with_auth(self):
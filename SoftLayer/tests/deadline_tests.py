@@ -0,0 +1,193 @@
+"""
+    SoftLayer.tests.deadline_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import threading
+import time
+
+from mock import patch, Mock, MagicMock, ANY, call
+
+import SoftLayer
+from SoftLayer.deadline import Deadline
+from SoftLayer.retry import RetryPolicy
+from SoftLayer.tests import unittest
+
+
+class DeadlineTests(unittest.TestCase):
+
+    @patch('SoftLayer.deadline.time.time')
+    def test_remaining(self, _time):
+        _time.return_value = 100.0
+        deadline = Deadline(30)
+        _time.return_value = 110.0
+        self.assertEqual(deadline.remaining(), 20)
+        self.assertFalse(deadline.expired)
+        self.assertEqual(deadline.get_timeout(), 20)
+        self.assertEqual(deadline.get_timeout(5), 5)
+        self.assertEqual(deadline.get_timeout(60), 20)
+
+        _time.return_value = 131.0
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired)
+        self.assertRaises(SoftLayer.DeadlineExceeded, deadline.get_timeout)
+
+    def test_no_timeout(self):
+        deadline = Deadline()
+        self.assertIsNone(deadline.remaining())
+        self.assertIsNone(deadline.get_timeout())
+        self.assertEqual(deadline.get_timeout(5), 5)
+        deadline.check()
+
+    def test_cancel(self):
+        deadline = Deadline(30)
+        deadline.cancel()
+        self.assertTrue(deadline.cancelled)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertRaises(SoftLayer.DeadlineExceeded, deadline.check)
+
+    def test_sleep(self):
+        self.assertTrue(Deadline(30).sleep(0.01))
+        self.assertFalse(Deadline(0.01).sleep(30))
+
+    @patch('SoftLayer.deadline.time.time')
+    def test_run_timeout_expired(self, _time):
+        _time.return_value = 100.0
+        deadline = Deadline(30)
+        request = Mock(timeout=60)
+
+        def timed_out(request):
+            _time.return_value = 131.0
+            raise SoftLayer.TransportTimeout(0, 'timed out')
+
+        self.assertRaises(SoftLayer.DeadlineExceeded, deadline.run, request,
+                          call=timed_out)
+        self.assertEqual(request.timeout, 30)
+
+    def test_run_timeout(self):
+        # Time was left, so the request itself was too slow
+        deadline = Deadline(30)
+        timed_out = Mock(side_effect=SoftLayer.TransportTimeout(0, 'slow'))
+        self.assertRaises(SoftLayer.TransportTimeout, deadline.run,
+                          Mock(timeout=5), call=timed_out)
+        self.assertFalse(deadline.expired)
+
+    def test_repr(self):
+        deadline = Deadline()
+        deadline.cancel()
+        self.assertEqual(repr(deadline),
+                         '<Deadline: remaining=0.0, cancelled=True>')
+
+    def test_cancel_from_thread(self):
+        deadline = Deadline()
+        timer = threading.Timer(0.05, deadline.cancel)
+        timer.start()
+        start = time.time()
+        self.assertFalse(deadline.sleep(30))
+        self.assertLess(time.time() - start, 5)
+        timer.join()
+
+
+class ClientDeadlineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Mock(return_value=[])
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong', timeout=60,
+            transport=self.transport)
+
+    def test_shrinks_timeout(self):
+        self.client['Account'].getObject(deadline=Deadline(10))
+        request = self.transport.call_args[0][0]
+        self.assertLessEqual(request.timeout, 10)
+
+        self.client['Account'].getObject(deadline=Deadline(600))
+        request = self.transport.call_args[0][0]
+        self.assertEqual(request.timeout, 60)
+
+    def test_client_deadline(self):
+        self.client.deadline = Deadline(10)
+        self.client['Account'].getObject()
+        self.assertLessEqual(self.transport.call_args[0][0].timeout, 10)
+
+        self.client.deadline.cancel()
+        self.assertRaises(SoftLayer.DeadlineExceeded,
+                          self.client['Account'].getObject)
+        self.assertEqual(self.transport.call_count, 1)
+
+    def test_timeout_after_deadline(self):
+        deadline = Deadline(30)
+
+        def transport(request):
+            deadline.cancel()
+            raise SoftLayer.TransportTimeout(0, 'timed out')
+        self.transport.side_effect = transport
+
+        self.assertRaises(SoftLayer.DeadlineExceeded,
+                          self.client['Account'].getObject, deadline=deadline)
+
+    @patch('SoftLayer.retry.time.sleep')
+    def test_retry(self, sleep):
+        self.client.retry_policy = RetryPolicy(max_attempts=5, backoff=1)
+        self.transport.side_effect = SoftLayer.TransportError(503, 'busy')
+
+        with patch('SoftLayer.retry.random.uniform', return_value=1):
+            self.assertRaises(SoftLayer.TransportError,
+                              self.client['Account'].getObject,
+                              deadline=Deadline(0.5))
+        self.assertEqual(self.transport.call_count, 1)
+        self.assertFalse(sleep.called)
+
+    def test_iter_call(self):
+        deadline = Deadline()
+        pages = [list(range(10)), list(range(10, 20))]
+
+        def transport(request):
+            if len(pages) == 1:
+                deadline.cancel()
+            return pages.pop(0)
+        self.transport.side_effect = transport
+
+        result = []
+        with self.assertRaises(SoftLayer.DeadlineExceeded):
+            for item in self.client['Account'].getVirtualGuests(
+                    iter=True, chunk=10, deadline=deadline):
+                result.append(item)
+        self.assertEqual(result, list(range(20)))
+        self.assertEqual(self.transport.call_count, 2)
+
+
+class ManagerDeadlineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.cci = SoftLayer.CCIManager(self.client)
+        self.guestObject = self.client['Virtual_Guest'].getObject
+
+    @patch('SoftLayer.utils.random.uniform', return_value=1)
+    def test_wait_for_ready(self, _uniform):
+        deadline = Deadline(30)
+        deadline.sleep = Mock(side_effect=[True, False])
+        self.guestObject.return_value = {'activeTransaction': {'id': 1}}
+
+        self.assertFalse(self.cci.wait_for_ready(1, 10, deadline=deadline))
+        self.guestObject.assert_has_calls([
+            call(id=1, mask=ANY, cache=False, deadline=deadline),
+            call(id=1, mask=ANY, cache=False, deadline=deadline),
+        ])
+        deadline.sleep.assert_has_calls([call(1), call(1.5)])
+
+    def test_wait_for_ready_exceeded(self):
+        self.guestObject.side_effect = SoftLayer.DeadlineExceeded('exceeded')
+        self.assertFalse(self.cci.wait_for_ready(1, 10))
+
+    def test_dedicated_server_packages(self):
+        deadline = Deadline()
+        hardware = SoftLayer.HardwareManager(self.client)
+        package = self.client['Product_Package'].getObject
+        package.return_value = {}
+
+        hardware.get_available_dedicated_server_packages(deadline=deadline)
+        package.assert_called_with(id=ANY, mask=ANY, deadline=deadline)
@@ -0,0 +1,176 @@
+"""
+    SoftLayer.tests.instrumentation_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import datetime
+
+from mock import patch, MagicMock, Mock
+
+import SoftLayer
+from SoftLayer.cache import ResponseCache
+from SoftLayer.instrumentation import (
+    Instrumentation, Histogram, MetricsCollector)
+from SoftLayer.retry import RetryPolicy
+from SoftLayer.tests import unittest
+from SoftLayer.utils import xmlrpc_client
+
+
+class InstrumentationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = MagicMock()
+        response = self.session.send.return_value
+        response.content = xmlrpc_client.dumps(([{'id': 1}],),
+                                               methodresponse=True)
+        response.elapsed = datetime.timedelta(seconds=0.25)
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            endpoint_url='http://endpoint')
+        self.client.session = self.session
+
+        self.calls = []
+        self.client.instrumentation = Instrumentation(**dict(
+            (hook, self._recorder(hook)) for hook in Instrumentation.HOOKS))
+
+    def _recorder(self, hook):
+        def record(request, *args):
+            self.calls.append((hook, request) + args)
+        return record
+
+    def test_hooks(self):
+        self.client['Account'].getVirtualGuests()
+
+        self.assertEqual([call[0] for call in self.calls],
+                         ['before_request', 'after_serialize',
+                          'after_response', 'after_parse', 'after_request'])
+        request = self.calls[-1][1]
+        self.assertEqual(request.service, 'SoftLayer_Account')
+        self.assertEqual(request.ttfb, 0.25)
+        self.assertEqual(request.response_bytes,
+                         len(self.session.send.return_value.content))
+        self.assertTrue(request.request_bytes > 0)
+        for timing in ['serialize_time', 'network_time', 'parse_time',
+                       'elapsed']:
+            self.assertTrue(getattr(request, timing) >= 0)
+        self.assertEqual(request.retries, 0)
+        self.assertFalse(request.cache_hit)
+
+    def test_on_error(self):
+        self.session.send.return_value.content = xmlrpc_client.dumps(
+            xmlrpc_client.Fault('SoftLayer_Exception', 'Error'),
+            methodresponse=True)
+
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.client['Account'].getObject)
+
+        self.assertEqual([call[0] for call in self.calls],
+                         ['before_request', 'after_serialize',
+                          'after_response', 'on_error', 'after_request'])
+        self.assertIsInstance(self.calls[3][2], SoftLayer.SoftLayerAPIError)
+
+    def test_cache_hit(self):
+        self.client.cache = ResponseCache(methods=['*.get*'])
+        self.client['Account'].getObject()
+        self.calls = []
+
+        self.client['Account'].getObject()
+
+        self.assertEqual([call[0] for call in self.calls],
+                         ['before_request', 'after_request'])
+        self.assertTrue(self.calls[-1][1].cache_hit)
+
+    def test_rest_transport(self):
+        self.client.transport = SoftLayer.transports.RestTransport()
+        response = self.session.request.return_value
+        response.text = response.content = '{"id": 1}'
+        response.elapsed = datetime.timedelta(seconds=0.5)
+
+        self.client['Account'].getObject()
+
+        self.assertEqual([call[0] for call in self.calls],
+                         ['before_request', 'after_serialize',
+                          'after_response', 'after_parse', 'after_request'])
+        self.assertEqual(self.calls[-1][1].ttfb, 0.5)
+
+    def test_invalid_hook(self):
+        self.assertRaises(TypeError, Instrumentation, after_everything=None)
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value / 1000.0)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.mean, 0.5005)
+        self.assertEqual(histogram.max, 1.0)
+        for percent, expected in [(50, 0.5), (95, 0.95), (99, 0.99)]:
+            value = histogram.percentile(percent)
+            self.assertTrue(expected <= value <= expected * histogram.growth,
+                            (percent, value))
+        self.assertEqual(histogram.percentile(100), 1.0)
+
+    def test_fixed_memory(self):
+        histogram = Histogram()
+        buckets = len(histogram.counts)
+        for value in [0, 1e-9, 1, 1e12]:
+            histogram.record(value)
+
+        self.assertEqual(len(histogram.counts), buckets)
+        self.assertEqual(histogram.counts[0], 2)
+        self.assertEqual(histogram.counts[-1], 1)
+
+    def test_empty(self):
+        self.assertEqual(Histogram().summary(),
+                         {'count': 0, 'mean': None, 'max': None,
+                          'p50': None, 'p95': None, 'p99': None})
+
+
+class MetricsCollectorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Mock(side_effect=self._transport)
+        self.metrics = MetricsCollector()
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport, instrumentation=self.metrics)
+
+    @staticmethod
+    def _transport(request):
+        request.serialize_time = 0.001
+        request.request_bytes = 100
+        request.response_bytes = 1000
+        if request.identifier == 0:
+            raise SoftLayer.TransportError(503, 'busy')
+        return {}
+
+    @patch('SoftLayer.retry.time.sleep')
+    def test_summary(self, _sleep):
+        self.client.cache = ResponseCache(methods=['*.get*'])
+        self.client.retry_policy = RetryPolicy(max_attempts=2)
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.assertRaises(SoftLayer.TransportError,
+                          self.client['Virtual_Guest'].getObject, id=0)
+        self.client['SoftLayer_Account'].getObject()
+
+        summary = self.metrics.summary()
+
+        self.assertEqual(sorted(summary.keys()),
+                         ['Account.getObject', 'Virtual_Guest.getObject'])
+        guest = summary['Virtual_Guest.getObject']
+        self.assertEqual(guest['calls'], 3)
+        self.assertEqual(guest['errors'], 1)
+        self.assertEqual(guest['retries'], 1)
+        self.assertEqual(guest['cache_hits'], 1)
+        self.assertEqual(guest['elapsed']['count'], 3)
+        self.assertEqual(guest['request_bytes']['count'], 2)
+        self.assertEqual(guest['request_bytes']['max'], 100)
+        self.assertEqual(guest['ttfb']['count'], 0)
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.summary(), {})
@@ -0,0 +1,176 @@
+"""
+    SoftLayer.tests.inventory_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+from mock import MagicMock
+
+from SoftLayer import CCIManager, HardwareManager
+from SoftLayer.inventory import Inventory, INVENTORY_MASK
+from SoftLayer.tests import unittest
+
+GUESTS = [
+    {'id': 1, 'hostname': 'web1', 'domain': 'example.com',
+     'fullyQualifiedDomainName': 'web1.example.com',
+     'primaryIpAddress': '1.1.1.1', 'primaryBackendIpAddress': '10.0.0.1',
+     'datacenter': {'name': 'dal05'},
+     'tagReferences': [{'tag': {'name': 'Web'}}, {'tag': {'name': 'prod'}}],
+     'modifyDate': '2014-03-04T10:00:00-06:00'},
+    {'id': 2, 'hostname': 'web2', 'domain': 'example.com',
+     'fullyQualifiedDomainName': 'web2.example.com',
+     'primaryBackendIpAddress': '10.0.0.2',
+     'datacenter': {'name': 'sng01'},
+     'tagReferences': [{'tag': {'name': 'web'}}],
+     'modifyDate': '2014-03-05T12:30:00-06:00'},
+]
+
+HARDWARE = [
+    {'id': 1000, 'hostname': 'db1', 'domain': 'example.com',
+     'fullyQualifiedDomainName': 'db1.example.com',
+     'primaryIpAddress': '2.2.2.2', 'primaryBackendIpAddress': '10.0.1.1',
+     'datacenter': {'name': 'dal05'}, 'tagReferences': [],
+     'modifyDate': '2014-03-01T08:00:00-06:00'},
+]
+
+
+class InventoryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.objects = {'getVirtualGuests': list(GUESTS),
+                        'getHardware': list(HARDWARE)}
+        self.client.iter_call.side_effect = \
+            lambda service, method, **kwargs: iter(self.objects[method])
+        self.inventory = Inventory(self.client)
+
+    def test_load(self):
+        self.inventory.load()
+
+        self.assertTrue(self.inventory.loaded)
+        self.assertEqual(len(self.inventory), 3)
+        self.assertEqual(self.client.iter_call.call_count, 2)
+        _, kwargs = self.client.iter_call.call_args_list[0]
+        self.assertEqual(kwargs['mask'], INVENTORY_MASK)
+        self.assertEqual(kwargs['paging'].get_path('getVirtualGuests'),
+                         'virtualGuests.id')
+
+    def test_find(self):
+        find = self.inventory.get_ids
+        self.assertEqual(find('hostname', 'WEB1'), [1])
+        self.assertEqual(find('fqdn', 'web2.example.com'), [2])
+        self.assertEqual(find('public_ip', '2.2.2.2'), [1000])
+        self.assertEqual(find('private_ip', '10.0.0.2'), [2])
+        self.assertEqual(find('datacenter', 'dal05'), [1, 1000])
+        self.assertEqual(find('datacenter', 'dal05', kind='hardware'),
+                         [1000])
+        self.assertEqual(find('tag', 'web'), [1, 2])
+        self.assertEqual(find('hostname', 'nope'), [])
+        self.assertEqual(self.inventory.get(2)['hostname'], 'web2')
+        self.assertIsNone(self.inventory.get(3))
+
+        # Loaded once, on the first lookup
+        self.assertEqual(self.client.iter_call.call_count, 2)
+        self.assertRaises(ValueError, find, 'color', 'red')
+
+    def test_refresh(self):
+        self.inventory.load()
+        self.client.iter_call.reset_mock()
+        changed = dict(GUESTS[0], hostname='api1',
+                       modifyDate='2014-03-06T09:00:00-06:00')
+        self.objects['getVirtualGuests'] = [GUESTS[1], changed]
+        self.objects['getHardware'] = []
+
+        self.assertEqual(self.inventory.refresh(), 1)
+
+        self.assertEqual(self.inventory.get_ids('hostname', 'web1'), [])
+        self.assertEqual(self.inventory.get_ids('hostname', 'api1'), [1])
+        self.assertEqual(self.inventory.get_ids('tag', 'prod'), [1])
+        _, kwargs = self.client.iter_call.call_args_list[0]
+        self.assertEqual(kwargs['filter'], {'virtualGuests': {'modifyDate': {
+            'operation': 'greaterThanDate',
+            'options': [{'name': 'date', 'value': ['03/05/2014 12:29:59']}],
+        }}})
+
+        # The next refresh starts from the newest change
+        self.inventory.refresh()
+        _, kwargs = self.client.iter_call.call_args_list[2]
+        self.assertEqual(
+            kwargs['filter']['virtualGuests']['modifyDate']['options'],
+            [{'name': 'date', 'value': ['03/06/2014 08:59:59']}])
+
+    def test_refresh_before_load(self):
+        self.assertEqual(self.inventory.refresh(), 3)
+        self.assertTrue(self.inventory.loaded)
+        _, kwargs = self.client.iter_call.call_args_list[0]
+        self.assertNotIn('filter', kwargs)
+
+    def test_refresh_new_object(self):
+        self.inventory.load()
+        added = dict(GUESTS[0], id=3, hostname='web3',
+                     fullyQualifiedDomainName='web3.example.com')
+        self.objects['getVirtualGuests'] = [added]
+
+        self.assertEqual(self.inventory.refresh(), 1)
+        self.assertEqual(self.inventory.get_ids('hostname', 'web3'), [3])
+        self.assertEqual(self.inventory.get_ids('tag', 'web'), [1, 2, 3])
+
+    def test_refresh_prune(self):
+        self.inventory.load()
+        self.objects['getVirtualGuests'] = [GUESTS[0]]
+
+        self.assertEqual(self.inventory.refresh(prune=True), 1)
+
+        self.assertEqual(self.inventory.get_ids('tag', 'web'), [1])
+        self.assertIsNone(self.inventory.get(2))
+        self.assertEqual(self.inventory.get(1000)['hostname'], 'db1')
+
+    def test_modify_dates(self):
+        self.objects['getVirtualGuests'] = [
+            dict(GUESTS[0], modifyDate=''),
+            dict(GUESTS[1], modifyDate='Tuesday')]
+        self.inventory.load()
+        self.client.iter_call.reset_mock()
+
+        self.inventory.refresh()
+
+        # Without a date to start from, every guest is listed again
+        _, kwargs = self.client.iter_call.call_args_list[0]
+        self.assertNotIn('filter', kwargs)
+        _, kwargs = self.client.iter_call.call_args_list[1]
+        self.assertIn('filter', kwargs)
+
+    def test_mask(self):
+        inventory = Inventory(self.client, mask='mask[notes]')
+        self.assertEqual(inventory.mask, INVENTORY_MASK + 'mask[notes]')
+
+    def test_repr(self):
+        self.inventory.load()
+        self.assertEqual(repr(self.inventory), 'Inventory(virtual=2, '
+                                               'hardware=1)')
+
+    def test_kinds(self):
+        inventory = Inventory(self.client, kinds=('hardware',))
+        self.assertEqual(inventory.get_ids('hostname', 'db1'), [1000])
+        self.assertEqual(self.client.iter_call.call_count, 1)
+        self.assertRaises(ValueError, inventory.get_ids, 'hostname', 'web1',
+                          kind='virtual')
+        self.assertRaises(ValueError, Inventory, self.client,
+                          kinds=('storage',))
+
+    def test_resolvers(self):
+        cci = CCIManager(self.client, inventory=self.inventory)
+        hardware = HardwareManager(self.client, inventory=self.inventory)
+
+        self.assertEqual(cci.resolve_ids('web2'), [2])
+        self.assertEqual(cci.resolve_ids('10.0.0.1'), [1])
+        self.assertEqual(hardware.resolve_ids('db1'), [1000])
+        self.assertEqual(hardware.resolve_ids('2.2.2.2'), [1000])
+        self.assertFalse(self.client['Account'].getVirtualGuests.called)
+        self.assertFalse(self.client['Account'].getHardware.called)
+
+        # Misses are still looked up with the API
+        self.client['Account'].getVirtualGuests.return_value = [{'id': 5}]
+        self.assertEqual(cci.resolve_ids('new1'), [5])
+        self.client['Account'].getHardware.return_value = [{'id': 1001}]
+        self.assertEqual(hardware.resolve_ids('db2'), [1001])
@@ -4,8 +4,12 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import SoftLayer
 from SoftLayer import CCIManager
-from SoftLayer.tests import unittest, FixtureClient
+from SoftLayer.bulk import BulkRunner
+from SoftLayer.managers.cci import (
+    DEFAULT_INSTANCE_MASK, LIST_INSTANCES_PAGING, READY_MASK)
+from SoftLayer.tests import unittest, FixtureClient, FakeClock
 from SoftLayer.tests.fixtures import Virtual_Guest
 
 from mock import MagicMock, ANY, call, patch
@@ -45,6 +49,31 @@ class CCITests(unittest.TestCase):
         for result in results:
             self.assertIn(result['id'], hourly_expected_ids)
 
+    def test_list_instances_iter(self):
+        self.cci.list_instances(iter=True)
+        service = self.client['Account']
+        service.getVirtualGuests.assert_called_once_with(
+            mask=ANY, filter={}, iter=True, paging=LIST_INSTANCES_PAGING)
+
+        self.cci.list_instances(iter=True, prefetch=4)
+        service.getVirtualGuests.assert_called_with(
+            mask=ANY, filter={}, iter=True, prefetch=4)
+
+    def test_list_instances_iter_key_filter(self):
+        # The pages would replace the caller's filter on the key
+        _filter = {'virtualGuests': {'id': {'operation': '< 100'}}}
+        self.cci.list_instances(iter=True, filter=_filter)
+        self.client['Account'].getVirtualGuests.assert_called_once_with(
+            mask=ANY, filter=_filter, iter=True)
+
+    def test_list_instances_iter_order(self):
+        _filter = {'virtualGuests': {'hostname': {
+            'operation': 'orderBy',
+            'options': [{'name': 'sort', 'value': ['DESC']}]}}}
+        self.cci.list_instances(iter=True, filter=_filter)
+        self.client['Account'].getVirtualGuests.assert_called_once_with(
+            mask=ANY, filter=_filter, iter=True)
+
     def test_list_instances_with_filters(self):
         self.cci.list_instances(
             hourly=True,
@@ -107,6 +136,18 @@ class CCITests(unittest.TestCase):
             id=100, mask=ANY)
         self.assertEqual(Virtual_Guest.getObject, result)
 
+    def test_get_many(self):
+        guest = self.client['Virtual_Guest'].getObject
+        guest.side_effect = [{'id': 100}, SoftLayer.SoftLayerAPIError(
+            'SoftLayer_Exception_ObjectNotFound', 'nope')]
+
+        results = self.cci.get_many([100, 101], max_workers=1)
+
+        self.assertEqual(results[0], {'id': 100})
+        self.assertIsInstance(results[1], SoftLayer.SoftLayerAPIError)
+        guest.assert_has_calls([call(id=100, mask=DEFAULT_INSTANCE_MASK),
+                                call(id=101, mask=DEFAULT_INSTANCE_MASK)])
+
     def test_get_create_options(self):
         results = self.cci.get_create_options()
         self.assertEqual(Virtual_Guest.getCreateObjectOptions, results)
@@ -539,19 +580,26 @@ class CCIWaitReadyGoTests(unittest.TestCase):
         self.client = MagicMock()
         self.cci = CCIManager(self.client)
         self.guestObject = self.client['Virtual_Guest'].getObject
+        self.clock = FakeClock()
+        patchers = [patch('SoftLayer.utils.time', self.clock),
+                    patch('SoftLayer.utils.random.uniform', return_value=1)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     @patch('SoftLayer.managers.cci.CCIManager.wait_for_ready')
     def test_wait_interface(self, ready):
         # verify interface to wait_for_ready is intact
         self.cci.wait_for_transaction(1, 1)
-        ready.assert_called_once_with(1, 1, delay=1, pending=True)
+        ready.assert_called_once_with(1, 1, delay=1, pending=True,
+                                      deadline=None)
 
     def test_active_not_provisioned(self):
         # active transaction and no provision date should be false
         self.guestObject.side_effect = [
             {'activeTransaction': {'id': 1}},
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 0)
         self.assertFalse(value)
 
     def test_active_and_provisiondate(self):
@@ -560,7 +608,7 @@ class CCIWaitReadyGoTests(unittest.TestCase):
             {'activeTransaction': {'id': 1},
              'provisionDate': 'aaa'},
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 0)
         self.assertTrue(value)
 
     def test_active_provision_pending(self):
@@ -570,7 +618,7 @@ class CCIWaitReadyGoTests(unittest.TestCase):
             {'activeTransaction': {'id': 1},
              'provisionDate': 'aaa'},
         ]
-        value = self.cci.wait_for_ready(1, 1, pending=True)
+        value = self.cci.wait_for_ready(1, 0, pending=True)
         self.assertFalse(value)
 
     def test_active_reload(self):
@@ -582,7 +630,7 @@ class CCIWaitReadyGoTests(unittest.TestCase):
                 'lastOperatingSystemReload': {'id': 1},
             },
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 0)
         self.assertFalse(value)
 
     def test_reload_no_pending(self):
@@ -594,7 +642,7 @@ class CCIWaitReadyGoTests(unittest.TestCase):
                 'lastOperatingSystemReload': {'id': 1},
             },
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 0)
         self.assertTrue(value)
 
     def test_reload_pending(self):
@@ -606,34 +654,29 @@ class CCIWaitReadyGoTests(unittest.TestCase):
                 'lastOperatingSystemReload': {'id': 1},
             },
         ]
-        value = self.cci.wait_for_ready(1, 1, pending=True)
+        value = self.cci.wait_for_ready(1, 0, pending=True)
         self.assertFalse(value)
 
-    @patch('SoftLayer.managers.cci.sleep')
-    def test_ready_iter_once_incomplete(self, _sleep):
-        self.guestObject = self.client['Virtual_Guest'].getObject
-
-        # no iteration, false
+    def test_ready_iter_once_incomplete(self):
+        # no waiting, false
         self.guestObject.side_effect = [
             {'activeTransaction': {'id': 1}},
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 0)
         self.assertFalse(value)
-        self.assertFalse(_sleep.called)
+        self.assertEqual(self.clock.sleeps, [])
 
-    @patch('SoftLayer.managers.cci.sleep')
-    def test_iter_once_complete(self, _sleep):
-        # no iteration, true
+    def test_iter_once_complete(self):
+        # no waiting, true
         self.guestObject.side_effect = [
             {'provisionDate': 'aaa'},
         ]
-        value = self.cci.wait_for_ready(1, 1)
+        value = self.cci.wait_for_ready(1, 10)
         self.assertTrue(value)
-        self.assertFalse(_sleep.called)
+        self.assertEqual(self.clock.sleeps, [])
 
-    @patch('SoftLayer.managers.cci.sleep')
-    def test_iter_four_complete(self, _sleep):
-        # test 4 iterations with positive match
+    def test_iter_four_complete(self):
+        # test 4 checks with positive match
         self.guestObject.side_effect = [
             {'activeTransaction': {'id': 1}},
             {'activeTransaction': {'id': 1}},
@@ -641,56 +684,212 @@ class CCIWaitReadyGoTests(unittest.TestCase):
             {'provisionDate': 'aaa'},
         ]
 
-        value = self.cci.wait_for_ready(1, 4)
+        value = self.cci.wait_for_ready(1, 10)
         self.assertTrue(value)
-        _sleep.assert_has_calls([call(1), call(1), call(1)])
+        self.assertEqual(self.clock.sleeps, [1, 1.5, 2.25])
         self.guestObject.assert_has_calls([
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
+            call(id=1, mask=ANY, cache=False),
+            call(id=1, mask=ANY, cache=False),
+            call(id=1, mask=ANY, cache=False),
+            call(id=1, mask=ANY, cache=False),
         ])
 
-    @patch('SoftLayer.managers.cci.sleep')
-    def test_iter_two_incomplete(self, _sleep):
-        # test 2 iterations, with no matches
+    def test_iter_two_incomplete(self):
+        # test 2 checks, with no matches. The last check is made when the
+        # time is up.
         self.guestObject.side_effect = [
             {'activeTransaction': {'id': 1}},
             {'activeTransaction': {'id': 1}},
             {'provisionDate': 'aaa'}
         ]
-        value = self.cci.wait_for_ready(1, 2)
+        value = self.cci.wait_for_ready(1, 1)
         self.assertFalse(value)
-        _sleep.assert_called_once_with(1)
+        self.assertEqual(self.clock.sleeps, [1])
         self.guestObject.assert_has_calls([
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
+            call(id=1, mask=ANY, cache=False),
+            call(id=1, mask=ANY, cache=False),
         ])
 
-    @patch('SoftLayer.managers.cci.sleep')
-    def test_iter_ten_incomplete(self, _sleep):
-        # 10 iterations at 10 second sleeps with no
-        # matching values.
-        self.guestObject.side_effect = [
-            {},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-            {'activeTransaction': {'id': 1}},
-        ]
-        value = self.cci.wait_for_ready(1, 10, delay=10)
+    def test_backoff(self):
+        # checks back off from 10 seconds apart to at most 30, until 100
+        # seconds have passed
+        self.guestObject.return_value = {'activeTransaction': {'id': 1}}
+        value = self.cci.wait_for_ready(1, 100, delay=10)
         self.assertFalse(value)
-        self.guestObject.assert_has_calls([
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
-            call(id=1, mask=ANY), call(id=1, mask=ANY),
+        self.assertEqual(self.guestObject.call_count, 6)
+        self.assertEqual(self.clock.sleeps, [10, 15, 22.5, 30, 22.5])
+
+
+class CCIWaitReadyManyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.cci = CCIManager(self.client)
+        self.guests = self.client['Account'].getVirtualGuests
+        self.clock = FakeClock()
+        patchers = [patch('SoftLayer.utils.time', self.clock),
+                    patch('SoftLayer.utils.random.uniform', return_value=1)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_wait_for_ready_many(self):
+        self.guests.side_effect = [
+            [{'id': 1, 'provisionDate': 'aaa'},
+             {'id': 2},
+             {'id': 3, 'provisionDate': 'aaa',
+              'activeTransaction': {'id': 5},
+              'lastOperatingSystemReload': {'id': 5}}],
+            [{'id': 2}, {'id': 3, 'provisionDate': 'aaa'}],
+            [{'id': 2}],
+        ]
+        callback = MagicMock()
+
+        value = self.cci.wait_for_ready_many([1, 2, 3, 1], 10, delay=5,
+                                             callback=callback)
+
+        self.assertEqual(value, {1: True, 2: False, 3: True})
+        callback.assert_has_calls([call(1, True), call(3, True),
+                                   call(2, False)])
+        self.guests.assert_has_calls([
+            call(mask=READY_MASK, cache=False, filter={'virtualGuests': {
+                'id': {'operation': 'in',
+                       'options': [{'name': 'data', 'value': [1, 2, 3]}]}}}),
+            call(mask=READY_MASK, cache=False, filter={'virtualGuests': {
+                'id': {'operation': 'in',
+                       'options': [{'name': 'data', 'value': [2, 3]}]}}}),
+            call(mask=READY_MASK, cache=False, filter={'virtualGuests': {
+                'id': {'operation': 'in',
+                       'options': [{'name': 'data', 'value': [2]}]}}}),
         ])
-        # should only be 9 calls to sleep, last iteration
-        # should return a value and skip the sleep
-        _sleep.assert_has_calls([
-            call(10), call(10), call(10), call(10), call(10),
-            call(10), call(10), call(10), call(10)])
+        self.assertEqual(self.clock.sleeps, [5, 5])
+
+    def test_iter_ready_all_ready(self):
+        self.guests.return_value = [{'id': 1, 'provisionDate': 'aaa'},
+                                    {'id': 2, 'provisionDate': 'aaa',
+                                     'activeTransaction': {'id': 4}}]
+
+        result = list(self.cci.iter_ready([1, 2], 10))
+        self.assertEqual(result, [(1, True), (2, True)])
+        self.assertEqual(self.clock.sleeps, [])
+
+        result = list(self.cci.iter_ready([1, 2], 0, pending=True))
+        self.assertEqual(result, [(1, True), (2, False)])
+
+
+class CCICreateManyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.cci = CCIManager(self.client)
+        self.guest = self.client['Virtual_Guest']
+        self.guest.createObjects.side_effect = lambda options: [
+            {'id': int(o['hostname'][4:]), 'hostname': o['hostname']}
+            for o in options]
+        self.specs = [{'hostname': 'host%s' % i, 'domain': 'example.com',
+                       'cpus': 1, 'memory': 1024, 'os_code': 'UBUNTU_LATEST'}
+                      for i in range(1, 24)]
+
+    def test_create_instances(self):
+        callback = MagicMock()
+
+        result = self.cci.create_instances(self.specs, callback=callback)
+
+        self.assertEqual([i['id'] for i in result], list(range(1, 24)))
+        self.assertEqual(self.guest.generateOrderTemplate.call_count, 23)
+        batches = [c[0][0] for c in self.guest.createObjects.call_args_list]
+        self.assertEqual([len(b) for b in batches], [8, 8, 7])
+        self.assertEqual(batches[0][0]['hostname'], 'host1')
+        self.assertEqual(batches[2][-1]['hostname'], 'host23')
+        self.assertEqual(callback.call_count, 23)
+        callback.assert_any_call('ordered', {'id': 5, 'hostname': 'host5'})
+
+    def test_create_instances_invalid_spec(self):
+        self.specs[4]['image_id'] = 'abc'
+
+        self.assertRaises(ValueError, self.cci.create_instances, self.specs)
+        self.assertFalse(self.guest.generateOrderTemplate.called)
+        self.assertFalse(self.guest.createObjects.called)
+
+    def test_create_instances_verify_error(self):
+        error = SoftLayer.SoftLayerAPIError('SoftLayer_Exception', 'no')
+        self.guest.generateOrderTemplate.side_effect = [{}, error] + [{}] * 21
+
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.cci.create_instances, self.specs)
+        self.assertFalse(self.guest.createObjects.called)
+
+    def test_create_instances_no_verify(self):
+        self.cci.create_instances(self.specs[:3], verify=False)
+        self.assertFalse(self.guest.generateOrderTemplate.called)
+        self.assertEqual(self.guest.createObjects.call_count, 1)
+
+    @patch('SoftLayer.managers.cci.CCIManager.iter_ready')
+    def test_iter_create_instances_wait(self, iter_ready):
+        iter_ready.return_value = iter([(1, True), (2, False)])
+
+        progress = list(self.cci.iter_create_instances(self.specs[:2],
+                                                       wait=60))
+
+        self.assertEqual([(s, i['id']) for s, i in progress], [
+            ('ordered', 1), ('ordered', 2),
+            ('provisioning', 1), ('provisioning', 2),
+            ('ready', 1), ('not ready', 2)])
+        iter_ready.assert_called_once_with([1, 2], 60, delay=1,
+                                           deadline=None)
+
+    def test_verify_create_instances(self):
+        self.guest.generateOrderTemplate.side_effect = [{'a': 1}, {'b': 2}]
+
+        result = self.cci.verify_create_instances(self.specs[:2])
+
+        self.assertEqual(result, [{'a': 1}, {'b': 2}])
+
+
+class CCIBulkTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.cci = CCIManager(self.client)
+        self.guest = self.client['Virtual_Guest']
+
+    def test_reboot_many(self):
+        report = self.cci.reboot_many([1, 2], mode='soft')
+        self.assertEqual(report.succeeded, [1, 2])
+        self.guest.rebootSoft.assert_has_calls([call(id=1), call(id=2)],
+                                               any_order=True)
+        self.assertRaises(ValueError, self.cci.reboot_many, [1], mode='x')
+
+    def test_power_off_many_by_filter(self):
+        self.client['Account'].getVirtualGuests.return_value = [
+            {'id': 100}, {'id': 104}]
+
+        report = self.cci.power_off_many(tags=['web'], datacenter='dal05',
+                                         hard=True)
+
+        self.assertEqual(report.succeeded, [100, 104])
+        _, kwargs = self.client['Account'].getVirtualGuests.call_args
+        self.assertEqual(kwargs['mask'], 'id')
+        self.assertEqual(kwargs['filter']['virtualGuests']['datacenter'],
+                         {'name': {'operation': '_= dal05'}})
+        self.guest.powerOff.assert_has_calls([call(id=100), call(id=104)],
+                                             any_order=True)
+
+    def test_cancel_many_requires_ids_or_filters(self):
+        self.assertRaises(ValueError, self.cci.cancel_many)
+        self.assertRaises(ValueError, self.cci.cancel_many, tags=[])
+        self.assertRaises(ValueError, self.cci.cancel_many, datacenter='')
+        self.assertFalse(self.client['Account'].getVirtualGuests.called)
+        self.assertFalse(self.guest.deleteObject.called)
+
+    def test_reload_many(self):
+        error = SoftLayer.SoftLayerAPIError('SoftLayer_Exception', 'no')
+        self.guest.reloadOperatingSystem.side_effect = [True, error]
+
+        report = self.cci.reload_many([1, 2], post_uri='https://x/y.sh',
+                                      runner=BulkRunner(max_workers=1))
+
+        self.assertEqual(report.succeeded, [1])
+        self.assertEqual(report.errors, [(2, error)])
+        self.guest.reloadOperatingSystem.assert_called_with(
+            'FORCE', {'customProvisionScriptUri': 'https://x/y.sh'}, id=2)
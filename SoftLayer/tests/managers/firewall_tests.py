@@ -24,3 +24,10 @@ class FirewallTests(unittest.TestCase):
 
         call.assert_called_once_with(mask=ANY)
         self.assertEqual(firewalls, Account.getObject['networkVlans'])
+
+    def test_get_firewalls_mask(self):
+        self.firewall.get_firewalls()
+
+        mask = self.client['Account'].getObject.call_args[1]['mask']
+        # The CLI lists the firewalls by VLAN number
+        self.assertEqual(mask + 'mask[networkVlans[id,vlanNumber]]', mask)
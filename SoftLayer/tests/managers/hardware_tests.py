@@ -5,12 +5,14 @@
     :license: MIT, see LICENSE for more details.
 """
 from SoftLayer import HardwareManager
-from SoftLayer.managers.hardware import get_default_value
-from SoftLayer.tests import unittest, FixtureClient
+from SoftLayer.cache import catalog_key
+from SoftLayer.managers.hardware import (
+    get_default_value, LIST_HARDWARE_PAGING, READY_MASK)
+from SoftLayer.tests import unittest, FixtureClient, FakeClock
 from SoftLayer.tests.fixtures import (
     Hardware_Server, Account, Billing_Item, Ticket)
 
-from mock import ANY, call, patch
+from mock import ANY, call, patch, Mock, MagicMock
 
 
 class HardwareTests(unittest.TestCase):
@@ -26,6 +28,17 @@ class HardwareTests(unittest.TestCase):
         self.client['Account'].getHardware.assert_has_calls(mcall)
         self.assertEqual(results, Account.getHardware)
 
+    def test_list_hardware_iter(self):
+        self.hardware.list_hardware(iter=True)
+        self.client['Account'].getHardware.assert_called_with(
+            mask=ANY, filter={}, iter=True, paging=LIST_HARDWARE_PAGING)
+
+        _filter = {'hardware': {'id': {'operation': 'in', 'options': [
+            {'name': 'data', 'value': [1, 2]}]}}}
+        self.hardware.list_hardware(iter=True, filter=_filter)
+        self.client['Account'].getHardware.assert_called_with(
+            mask=ANY, filter=_filter, iter=True)
+
     def test_list_hardware_with_filters(self):
         results = self.hardware.list_hardware(
             tags=['tag1', 'tag2'],
@@ -84,6 +97,14 @@ class HardwareTests(unittest.TestCase):
             id=1000, mask=ANY)
         self.assertEqual(Hardware_Server.getObject, result)
 
+    def test_get_many(self):
+        results = self.hardware.get_many([1000, 1001], mask='id')
+
+        self.assertEqual(results, [Hardware_Server.getObject] * 2)
+        self.client['Hardware_Server'].getObject.assert_has_calls(
+            [call(id=1000, mask='id'), call(id=1001, mask='id')],
+            any_order=True)
+
     def test_reload(self):
         post_uri = 'http://test.sftlyr.ws/test.sh'
         self.hardware.reload(1, post_uri=post_uri, ssh_keys=[1701])
@@ -112,6 +133,41 @@ class HardwareTests(unittest.TestCase):
         f3 = self.client['Product_Package'].getCategories
         f3.assert_called_once_with(id=package_id)
 
+    def test_get_bare_metal_create_options_catalog_cache(self):
+        cache = Mock()
+        cache.get.return_value = None
+        self.hardware.catalog_cache = cache
+
+        options = self.hardware.get_bare_metal_create_options()
+
+        cache.set.assert_has_calls([
+            call(catalog_key(self.client, 'bare-metal-package-id'), 50),
+            call(catalog_key(self.client, 'package-50'), options)])
+
+        cache.get.side_effect = [50, {'categories': {}, 'locations': []}]
+        cache.set.reset_mock()
+        options = self.hardware.get_bare_metal_create_options()
+
+        self.assertEqual(options, {'categories': {}, 'locations': []})
+        self.assertFalse(cache.set.called)
+        self.assertEqual(
+            self.client['Product_Package'].getAllObjects.call_count, 1)
+        self.assertEqual(
+            self.client['Product_Package'].getRegions.call_count, 1)
+
+    def test_get_dedicated_server_create_options_refresh(self):
+        cache = Mock()
+        self.hardware.catalog_cache = cache
+
+        options = self.hardware.get_dedicated_server_create_options(
+            13, refresh=True)
+
+        self.assertFalse(cache.get.called)
+        cache.set.assert_called_once_with(
+            catalog_key(self.client, 'package-13'), options)
+        self.client['Product_Package'].getRegions.assert_called_once_with(
+            id=13)
+
     def test_generate_create_dict_with_all_bare_metal_options(self):
         args = {
             'server': 100,
@@ -386,3 +442,92 @@ class HardwareTests(unittest.TestCase):
 
         self.hardware.edit(100, **args)
         service.editObject.assert_called_once_with(args, id=100)
+
+
+class HardwareWaitReadyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.hardware = HardwareManager(self.client)
+        self.server = self.client['Hardware_Server'].getObject
+        self.clock = FakeClock()
+        patchers = [patch('SoftLayer.utils.time', self.clock),
+                    patch('SoftLayer.utils.random.uniform', return_value=1)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_wait_for_ready(self):
+        self.server.side_effect = [
+            {'provisionDate': 'aaa', 'activeTransaction': {'id': 2},
+             'lastOperatingSystemReload': {'id': 2}},
+            {'provisionDate': 'aaa', 'activeTransaction': {'id': 3},
+             'lastOperatingSystemReload': {'id': 2}},
+        ]
+        self.assertTrue(self.hardware.wait_for_ready(1, 600))
+        self.server.assert_called_with(id=1, mask=READY_MASK,
+                                       cache=False)
+        self.assertEqual(self.clock.sleeps, [10])
+
+    def test_wait_for_ready_timeout(self):
+        self.server.return_value = {'activeTransaction': {'id': 1}}
+        self.assertFalse(self.hardware.wait_for_ready(1, 60, pending=True))
+        self.assertEqual(self.clock.sleeps, [10, 15, 22.5, 12.5])
+
+
+class HardwareBulkTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.hardware = HardwareManager(self.client)
+        self.server = self.client['Hardware_Server']
+
+    def test_power_cycle_many_by_filter(self):
+        self.client['Account'].getHardware.return_value = [{'id': 1000}]
+
+        report = self.hardware.power_cycle_many(tags=['db'])
+
+        self.assertEqual(report.succeeded, [1000])
+        _, kwargs = self.client['Account'].getHardware.call_args
+        self.assertEqual(kwargs['mask'], 'id')
+        self.server.powerCycle.assert_called_once_with(id=1000)
+
+    def test_reboot_many(self):
+        report = self.hardware.reboot_many([1, 2], mode='hard')
+        self.assertTrue(report.ok)
+        self.server.rebootHard.assert_has_calls([call(id=1), call(id=2)],
+                                                any_order=True)
+
+    def test_reboot_many_invalid_mode(self):
+        self.assertRaises(ValueError,
+                          self.hardware.reboot_many, [1], mode='gentle')
+        self.assertFalse(self.server.called)
+
+    def test_power_off_many(self):
+        report = self.hardware.power_off_many([1, 2])
+        self.assertTrue(report.ok)
+        self.server.powerOff.assert_has_calls([call(id=1), call(id=2)],
+                                              any_order=True)
+
+    def test_power_on_many(self):
+        report = self.hardware.power_on_many([1, 2])
+        self.assertTrue(report.ok)
+        self.server.powerOn.assert_has_calls([call(id=1), call(id=2)],
+                                             any_order=True)
+
+    @patch('SoftLayer.HardwareManager.reload')
+    def test_reload_many(self, reload_hardware):
+        report = self.hardware.reload_many([1, 2], post_uri='http://x',
+                                           ssh_keys=[5])
+        self.assertTrue(report.ok)
+        reload_hardware.assert_has_calls([call(1, 'http://x', [5]),
+                                          call(2, 'http://x', [5])],
+                                         any_order=True)
+
+    @patch('SoftLayer.HardwareManager.cancel_hardware')
+    def test_cancel_many(self, cancel):
+        report = self.hardware.cancel_many([1, 2], reason='moved',
+                                           comment='bye')
+        self.assertTrue(report.ok)
+        cancel.assert_has_calls([call(1, 'moved', 'bye'),
+                                 call(2, 'moved', 'bye')], any_order=True)
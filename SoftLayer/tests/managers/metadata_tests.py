@@ -88,9 +88,15 @@ class MetadataTestsMakeRequest(unittest.TestCase):
         make_api_call.assert_called_with(
             'GET', self.url,
             timeout=5,
-            http_headers={'User-Agent': USER_AGENT})
+            http_headers={'User-Agent': USER_AGENT},
+            session=self.metadata.session)
         self.assertEqual(make_api_call(), r)
 
+    def test_client_session(self):
+        client = MagicMock()
+        metadata = MetadataManager(client)
+        self.assertEqual(metadata.session, client.session)
+
     @patch('SoftLayer.managers.metadata.make_rest_api_call')
     def test_raise_error(self, make_api_call):
         make_api_call.side_effect = SoftLayerAPIError(
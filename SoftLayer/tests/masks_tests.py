@@ -0,0 +1,107 @@
+"""
+    SoftLayer.tests.masks_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+from mock import patch
+
+from SoftLayer.masks import Mask, format_mask
+from SoftLayer.tests import unittest
+
+
+class MaskTests(unittest.TestCase):
+
+    def test_string_forms(self):
+        for mask in ['id,hostname', 'mask[id, hostname]', ' hostname , id ',
+                     'mask[hostname,id,id]']:
+            self.assertEqual(str(Mask(mask)), 'mask[hostname,id]')
+
+    def test_nested(self):
+        mask = Mask('mask[id, datacenter[name], tags.tag[id, name]]')
+        self.assertEqual(str(mask),
+                         'mask[datacenter.name,id,tags.tag[id,name]]')
+
+    def test_merges_paths(self):
+        mask = Mask('datacenter.name, activeTransaction.id',
+                    'datacenter[longName], activeTransaction[id, status]')
+        self.assertEqual(
+            str(mask),
+            'mask[activeTransaction[id,status],datacenter[longName,name]]')
+
+    def test_keeps_whole_relational_properties(self):
+        self.assertEqual(str(Mask('id,datacenter', 'datacenter.name')),
+                         'mask[datacenter,datacenter[name],id]')
+        mask = Mask('mask[networkComponents[primarySubnet]]',
+                    'networkComponents.primarySubnet[id]')
+        self.assertEqual(str(mask),
+                         'mask[networkComponents.primarySubnet,'
+                         'networkComponents.primarySubnet[id]]')
+        self.assertEqual(str(Mask('datacenter.name', {'datacenter': None})),
+                         'mask[datacenter,datacenter[name]]')
+        # The canonical form parses back to the same mask
+        self.assertEqual(str(Mask(str(mask))), str(mask))
+
+    def test_dict(self):
+        mask = Mask({'vlans': {'rules': None, 'flag': {}}, 'id': None,
+                     'datacenter.name': ''})
+        self.assertEqual(str(mask),
+                         'mask[datacenter.name,id,vlans[flag,rules]]')
+
+    def test_typed_masks(self):
+        mask = Mask('[mask[id], mask(SoftLayer_Hardware_Server)[bandwidth]]',
+                    'mask(SoftLayer_Hardware_Server)[activeTransaction]',
+                    'hostname')
+        self.assertEqual(str(mask),
+                         '[mask[hostname,id],mask(SoftLayer_Hardware_Server)'
+                         '[activeTransaction,bandwidth]]')
+
+    def test_empty(self):
+        self.assertEqual(str(Mask()), 'mask[]')
+        self.assertEqual(str(Mask('mask[]')), 'mask[]')
+
+    def test_add(self):
+        mask = Mask('id') + 'hostname' + {'datacenter': None}
+        self.assertEqual(str(mask), 'mask[datacenter,hostname,id]')
+        self.assertEqual(str('hostname' + Mask('id')), 'mask[hostname,id]')
+        self.assertEqual(str(Mask('id') | Mask('id')), 'mask[id]')
+
+    def test_equality(self):
+        self.assertEqual(Mask('id,hostname'), Mask('mask[hostname, id]'))
+        self.assertEqual(Mask('id,hostname'), 'hostname,id')
+        self.assertEqual('hostname,id', Mask('id,hostname'))
+        self.assertEqual(Mask('datacenter.name'), {'datacenter': {'name': 1}})
+        self.assertNotEqual(Mask('id'), Mask('hostname'))
+        self.assertNotEqual(Mask('id'), 1)
+        self.assertEqual(hash(Mask('id,hostname')), hash(Mask('hostname,id')))
+
+    def test_invalid(self):
+        for mask in ['id,', 'mask[id', 'mask[id]]', 'a[b', 'id;', 'a..b',
+                     'mask.id', '[id]']:
+            self.assertRaises(ValueError, Mask, mask)
+        self.assertRaises(TypeError, Mask, 1)
+
+    def test_caches_string(self):
+        mask = Mask('id')
+        self.assertIs(str(mask), str(mask))
+
+
+class FormatMaskTests(unittest.TestCase):
+
+    def test_format(self):
+        self.assertEqual(format_mask('id, hostname'), 'mask[hostname,id]')
+        self.assertEqual(format_mask(Mask('id')), 'mask[id]')
+        self.assertEqual(format_mask({'id': None}), 'mask[id]')
+
+    def test_unknown_syntax_unchanged(self):
+        self.assertEqual(format_mask('mask.something.nested'),
+                         'mask.something.nested')
+        self.assertEqual(format_mask('filteredMask[id'),
+                         'mask[filteredMask[id]')
+
+    def test_cached(self):
+        format_mask('mask[id,cached]')
+        with patch('SoftLayer.masks._Parser') as parser:
+            self.assertEqual(format_mask('mask[id,cached]'),
+                             'mask[cached,id]')
+            self.assertFalse(parser.called)
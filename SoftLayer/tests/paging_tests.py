@@ -0,0 +1,310 @@
+"""
+    SoftLayer.tests.paging_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+from mock import patch, call, Mock, ANY
+
+import SoftLayer
+from SoftLayer.instrumentation import Instrumentation, MetricsCollector
+from SoftLayer.masks import Mask
+from SoftLayer.paging import (
+    AdaptivePaging, KeysetPaging, OffsetPaging, get_paging, default_paging)
+from SoftLayer.tests import unittest
+from SoftLayer.transports import _instrument
+from SoftLayer.utils import Filter
+
+
+def guests(*ids):
+    return [{'id': i} for i in ids]
+
+
+class KeysetPagingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            endpoint_url="ENDPOINT")
+
+    def test_get_path(self):
+        self.assertEqual(KeysetPaging().get_path('getVirtualGuests'),
+                         'virtualGuests.id')
+        self.assertEqual(KeysetPaging('name').get_path('getHardware'),
+                         'hardware.name')
+        self.assertEqual(KeysetPaging('virtualGuests.id').get_path(
+            'getHourlyVirtualGuests'), 'virtualGuests.id')
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call(self, _call):
+        _call.side_effect = [guests(1, 5), guests(8, 9), guests(12)]
+        result = list(self.client.iter_call(
+            'Account', 'getVirtualGuests', chunk=2, cursor='id'))
+
+        self.assertEqual(result, guests(1, 5, 8, 9, 12))
+        first = Filter().order_by('virtualGuests.id')
+        _call.assert_has_calls([
+            call('Account', 'getVirtualGuests', filter=first, limit=2,
+                 iter=False),
+            call('Account', 'getVirtualGuests',
+                 filter=first.where('virtualGuests.id', '> 5'), limit=2,
+                 iter=False),
+            call('Account', 'getVirtualGuests',
+                 filter=first.where('virtualGuests.id', '> 9'), limit=2,
+                 iter=False),
+        ])
+        self.assertEqual(_call.call_args[1]['filter'].to_dict(), {
+            'virtualGuests': {'id': {
+                'operation': '> 9',
+                'options': [{'name': 'sort', 'value': ['ASC']}]}}})
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_filter_and_mask(self, _call):
+        _call.side_effect = [guests(3), []]
+        result = list(self.client.iter_call(
+            'Account', 'getVirtualGuests', cursor='id', mask='hostname',
+            filter={'virtualGuests': {'domain': {'operation': 'a.com'}}}))
+
+        self.assertEqual(result, guests(3))
+        kwargs = _call.call_args[1]
+        self.assertEqual(kwargs['mask'], Mask('id,hostname'))
+        self.assertEqual(kwargs['filter'].to_dict()['virtualGuests']['domain'],
+                         {'operation': 'a.com'})
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_limit(self, _call):
+        _call.side_effect = [guests(1, 2), guests(3)]
+        result = list(self.client.iter_call(
+            'Account', 'getVirtualGuests', chunk=2, limit=3, cursor='id'))
+
+        self.assertEqual(result, guests(1, 2, 3))
+        self.assertEqual(_call.call_count, 2)
+        self.assertEqual(_call.call_args[1]['limit'], 1)
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_not_list(self, _call):
+        _call.return_value = {'id': 1}
+        result = list(self.client.iter_call('Account', 'getObject',
+                                            cursor='id'))
+        self.assertEqual(result, [{'id': 1}])
+
+    def test_offset(self):
+        self.assertRaises(ValueError, lambda: list(self.client.iter_call(
+            'Account', 'getVirtualGuests', offset=10, cursor='id')))
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_lower_bound(self, _call):
+        _call.side_effect = [guests(1001, 1005), []]
+        result = list(self.client.iter_call(
+            'Account', 'getVirtualGuests', chunk=2, cursor='id',
+            filter=Filter().where('virtualGuests.id', '> 1000')))
+
+        self.assertEqual(result, guests(1001, 1005))
+        filters = [kwargs['filter'].get('virtualGuests.id')['operation']
+                   for _, kwargs in _call.call_args_list]
+        self.assertEqual(filters, ['> 1000', '> 1005'])
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_key_filtered(self, _call):
+        for query in [Filter().where_in('virtualGuests.id', [1, 2]),
+                      Filter().where('virtualGuests.id', '< 10'),
+                      {'virtualGuests': {'id': 5}},
+                      {'virtualGuests': {'id': {'operation': 5}}}]:
+            self.assertRaises(ValueError, lambda: list(self.client.iter_call(
+                'Account', 'getVirtualGuests', cursor='id', filter=query)))
+        self.assertFalse(_call.called)
+
+    @patch('SoftLayer.API.Client.call')
+    def test_iter_call_dict_mask(self, _call):
+        _call.side_effect = [guests(3, 4), []]
+        result = list(self.client.iter_call(
+            'Account', 'getVirtualGuests', chunk=2, cursor='id',
+            mask={'datacenter': {'name': None}}))
+
+        self.assertEqual(result, guests(3, 4))
+        self.assertEqual(_call.call_args[1]['mask'],
+                         Mask('id,datacenter.name'))
+
+
+class AdaptivePagingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.paging = AdaptivePaging(min_latency=1, max_latency=3,
+                                     min_chunk=10, max_chunk=400,
+                                     max_bytes=10000)
+        self.results = list(range(1000))
+        self.transport = Mock(side_effect=self._transport)
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport)
+
+    def _transport(self, request):
+        request.response_bytes = request.limit * 10
+        return self.results[request.offset:request.offset + request.limit]
+
+    def test_next_size(self):
+        # Inside the target band
+        self.assertEqual(self.paging.next_size(100, 2), 100)
+        # Quicker and slower pages move toward the middle of the band
+        self.assertEqual(self.paging.next_size(100, 4), 50)
+        self.assertEqual(self.paging.next_size(100, 3.2), 62)
+        # By at most a factor of growth
+        self.assertEqual(self.paging.next_size(100, 0.1), 200)
+        self.assertEqual(self.paging.next_size(100, 0), 200)
+        self.assertEqual(self.paging.next_size(100, 60), 50)
+        # Within the limits
+        self.assertEqual(self.paging.next_size(300, 0.1), 400)
+        self.assertEqual(self.paging.next_size(15, 60), 10)
+        # Large responses shrink
+        self.assertEqual(self.paging.next_size(100, 2, 20000), 50)
+        self.assertEqual(self.paging.next_size(100, 0.1, 12500), 80)
+
+    def test_iter_call(self):
+        result = list(self.client.iter_call('Account', 'getVirtualGuests',
+                                            chunk=25, paging=self.paging))
+
+        self.assertEqual(result, self.results)
+        sizes = [c[0][0].limit for c in self.transport.call_args_list]
+        offsets = [c[0][0].offset for c in self.transport.call_args_list]
+        self.assertEqual(sizes, [25, 50, 100, 200, 400, 400])
+        self.assertEqual(offsets, [0, 25, 75, 175, 375, 775])
+
+    def test_iter_call_limit(self):
+        result = list(self.client.iter_call('Account', 'getVirtualGuests',
+                                            chunk=25, limit=100,
+                                            paging=self.paging))
+
+        self.assertEqual(result, list(range(100)))
+        sizes = [c[0][0].limit for c in self.transport.call_args_list]
+        self.assertEqual(sizes, [25, 50, 25])
+
+    def test_timeout(self):
+        timeouts = [SoftLayer.TransportTimeout(0, 'timed out')]
+
+        def transport(request):
+            if request.limit > 100 and timeouts:
+                raise timeouts.pop()
+            return self._transport(request)
+        self.transport.side_effect = transport
+
+        result = list(self.client.iter_call('Account', 'getVirtualGuests',
+                                            chunk=200, paging=self.paging))
+
+        self.assertEqual(result, self.results)
+        sizes = [c[0][0].limit for c in self.transport.call_args_list]
+        self.assertEqual(sizes[:4], [200, 100, 100, 100])
+
+    def test_timeout_smallest_page(self):
+        self.transport.side_effect = SoftLayer.TransportTimeout(0, 'timed out')
+        self.assertRaises(
+            SoftLayer.TransportTimeout, list,
+            self.client.iter_call('Account', 'getVirtualGuests', chunk=40,
+                                  paging=self.paging))
+        sizes = [c[0][0].limit for c in self.transport.call_args_list]
+        self.assertEqual(sizes, [40, 20, 10])
+
+    def test_after_page(self):
+        self.client.instrumentation = MetricsCollector()
+        self.client.instrumentation.after_page = Mock(
+            side_effect=self.client.instrumentation.after_page)
+
+        list(self.client.iter_call('Account', 'getVirtualGuests', chunk=100,
+                                   limit=500, paging=self.paging))
+
+        self.client.instrumentation.after_page.assert_has_calls([
+            call(ANY, 200), call(ANY, 400)])
+        summary = self.client.instrumentation.summary()
+        account = summary['Account.getVirtualGuests']
+        self.assertEqual(account['calls'], 3)
+        self.assertEqual(account['page_size']['count'], 3)
+        self.assertEqual(account['page_size']['max'], 400)
+
+    def test_call_instrumentation(self):
+        self.client.instrumentation = MetricsCollector()
+        hooks = MetricsCollector()
+
+        list(self.client.iter_call('Account', 'getVirtualGuests', chunk=100,
+                                   limit=500, paging=self.paging,
+                                   instrumentation=hooks))
+
+        account = hooks.summary()['Account.getVirtualGuests']
+        self.assertEqual(account['calls'], 3)
+        self.assertEqual(account['page_size']['count'], 3)
+        self.assertEqual(self.client.instrumentation.summary(), {})
+
+    def test_call_instrumentation_hooks(self):
+        timeouts = [SoftLayer.TransportTimeout(0, 'timed out')]
+
+        def transport(request):
+            _instrument(request, 'after_serialize')
+            if request.offset and timeouts:
+                raise timeouts.pop()
+            _instrument(request, 'after_response')
+            _instrument(request, 'after_parse')
+            return self._transport(request)
+        self.transport.side_effect = transport
+        hooks = dict((name, Mock()) for name in Instrumentation.HOOKS)
+
+        list(self.client.iter_call('Account', 'getVirtualGuests', chunk=100,
+                                   limit=300, paging=self.paging,
+                                   instrumentation=Instrumentation(**hooks)))
+
+        # Every hook of every attempt reaches the caller's instrumentation,
+        # including the page that timed out
+        for name in ['before_request', 'after_serialize', 'after_request']:
+            self.assertEqual(hooks[name].call_count, 4)
+        for name in ['after_response', 'after_parse', 'after_page']:
+            self.assertEqual(hooks[name].call_count, 3)
+        self.assertEqual(hooks['on_error'].call_count, 1)
+        self.assertIsInstance(hooks['on_error'].call_args[0][1],
+                              SoftLayer.TransportTimeout)
+
+    def test_iter_call_not_list(self):
+        self.transport.side_effect = None
+        self.transport.return_value = {'id': 1}
+        result = list(self.client.iter_call('Account', 'getObject',
+                                            paging=self.paging))
+        self.assertEqual(result, [{'id': 1}])
+        self.assertEqual(self.transport.call_count, 1)
+
+
+class GetPagingTests(unittest.TestCase):
+
+    def test_get_paging(self):
+        paging = KeysetPaging()
+        self.assertIs(get_paging(paging, 'id', 4), paging)
+        self.assertIsInstance(get_paging(cursor='id'), KeysetPaging)
+        self.assertEqual(get_paging(prefetch=4).prefetch, 4)
+        self.assertIsInstance(get_paging(), OffsetPaging)
+
+    def test_default_paging(self):
+        paging = KeysetPaging('virtualGuests.id')
+        method = 'getVirtualGuests'
+        self.assertEqual(default_paging({'iter': True}, paging, method),
+                         {'iter': True, 'paging': paging})
+        self.assertEqual(default_paging({}, paging, method), {})
+        for arg in ['cursor', 'prefetch', 'offset']:
+            kwargs = {'iter': True, arg: 2}
+            self.assertEqual(default_paging(dict(kwargs), paging, method),
+                             kwargs)
+
+    def test_default_paging_filter(self):
+        paging = KeysetPaging()
+        method = 'getVirtualGuests'
+        lower_bound = {'virtualGuests': {'id': {'operation': '> 10'}}}
+        kwargs = {'iter': True, 'filter': lower_bound}
+        self.assertEqual(default_paging(dict(kwargs), paging, method),
+                         dict(kwargs, paging=paging))
+
+        for _filter in [
+                {'virtualGuests': {'id': {'operation': '< 100'}}},
+                {'virtualGuests': {'id': {'operation': 'orderBy'}}},
+                {'virtualGuests': {'notes': 'x', 'hostname': {
+                    'operation': 'orderBy'}}},
+                Filter().order_by('virtualGuests.hostname', 'DESC'),
+                {'virtualGuests': {'hostname': {
+                    'operation': '*= web',
+                    'options': [{'name': 'sort', 'value': ['ASC']}]}}}]:
+            kwargs = {'iter': True, 'filter': _filter}
+            self.assertEqual(default_paging(dict(kwargs), paging, method),
+                             kwargs)
@@ -0,0 +1,221 @@
+"""
+    SoftLayer.tests.ratelimit_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import threading
+
+from mock import patch, Mock
+
+import SoftLayer
+from SoftLayer.ratelimit import (
+    RateLimiter, TokenBucket, AdaptiveConcurrencyLimit)
+from SoftLayer.tests import unittest
+
+
+class TokenBucketTests(unittest.TestCase):
+
+    @patch('SoftLayer.ratelimit.time.time')
+    def test_reserve(self, time):
+        time.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.reserve(), 1.0)
+
+        time.return_value = 102.0
+        self.assertEqual(bucket.reserve(), 0)
+
+    @patch('SoftLayer.ratelimit.time.time')
+    def test_max_wait(self, time):
+        time.return_value = 100.0
+        bucket = TokenBucket(rate=1)
+
+        bucket.reserve()
+        self.assertRaises(SoftLayer.RateLimitExceeded, bucket.reserve, 0.5)
+        self.assertEqual(bucket.reserve(1), 1)
+
+
+class AdaptiveConcurrencyLimitTests(unittest.TestCase):
+
+    def test_aimd(self):
+        limit = AdaptiveConcurrencyLimit(initial=4, minimum=1, maximum=5)
+
+        limit.acquire()
+        limit.release()
+        self.assertEqual(limit.limit, 4.25)
+
+        limit.acquire()
+        limit.release(throttled=True)
+        self.assertEqual(limit.limit, 2.125)
+
+        for _ in range(5):
+            limit.acquire()
+            limit.release(throttled=True)
+        self.assertEqual(limit.limit, 1)
+
+        for _ in range(100):
+            limit.acquire()
+            limit.release()
+        self.assertEqual(limit.limit, 5)
+
+    def test_max_wait(self):
+        limit = AdaptiveConcurrencyLimit(initial=1)
+        limit.acquire()
+
+        self.assertRaises(SoftLayer.RateLimitExceeded, limit.acquire, 0.01)
+        self.assertEqual(limit.in_flight, 1)
+
+    def test_waits_for_slot(self):
+        limit = AdaptiveConcurrencyLimit(initial=1)
+        limit.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            limit.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limit.release()
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+
+class RateLimiterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Mock(return_value=[])
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport)
+
+    @patch('SoftLayer.ratelimit.time.sleep')
+    def test_rate(self, sleep):
+        self.client.rate_limiter = RateLimiter(rate=1, burst=2)
+
+        for _ in range(3):
+            self.client['Account'].getObject()
+
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertEqual(sleep.call_count, 1)
+        metrics = self.client.rate_limiter.metrics
+        self.assertEqual(metrics['calls'], 3)
+        self.assertEqual(metrics['rate'], 3)
+        self.assertGreater(metrics['wait_time'], 0)
+
+    @patch('SoftLayer.ratelimit.time.sleep')
+    def test_per_service(self, sleep):
+        self.client.rate_limiter = RateLimiter(rate=1, per_service=True)
+
+        self.client['Account'].getObject()
+        self.client['Virtual_Guest'].getObject(id=1)
+        self.assertFalse(sleep.called)
+
+        self.client['Account'].getObject()
+        self.assertTrue(sleep.called)
+
+    def test_rejections(self):
+        self.client.rate_limiter = RateLimiter(rate=0.1, max_wait=1)
+
+        self.client['Account'].getObject()
+        self.assertRaises(SoftLayer.RateLimitExceeded,
+                          self.client['Account'].getObject)
+
+        self.assertEqual(self.transport.call_count, 1)
+        self.assertEqual(self.client.rate_limiter.metrics['rejections'], 1)
+
+    def test_no_rate(self):
+        self.client.rate_limiter = RateLimiter()
+        self.client['Account'].getObject()
+
+        self.assertIsNone(self.client.rate_limiter.get_bucket('Account'))
+        self.assertEqual(self.transport.call_count, 1)
+
+    def test_concurrency_backs_off(self):
+        concurrency = AdaptiveConcurrencyLimit(initial=8)
+        self.client.rate_limiter = RateLimiter(concurrency=concurrency)
+
+        self.transport.side_effect = SoftLayer.TransportError(503, 'busy')
+        self.assertRaises(SoftLayer.TransportError,
+                          self.client['Account'].getObject)
+        self.assertEqual(concurrency.limit, 4)
+
+        self.transport.side_effect = SoftLayer.SoftLayerAPIError(429, 'slow')
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.client['Account'].getObject)
+        self.assertEqual(concurrency.limit, 2)
+
+        self.transport.side_effect = SoftLayer.SoftLayerAPIError(
+            'SoftLayer_Exception_NotFound', 'nope')
+        self.assertRaises(SoftLayer.SoftLayerAPIError,
+                          self.client['Account'].getObject)
+        self.assertEqual(concurrency.limit, 2.5)
+
+        self.transport.side_effect = None
+        self.client['Account'].getObject()
+        self.assertEqual(concurrency.limit, 2.9)
+        self.assertEqual(concurrency.in_flight, 0)
+
+        metrics = self.client.rate_limiter.metrics
+        self.assertEqual(metrics['concurrency_limit'], 2)
+        self.assertEqual(metrics['in_flight'], 0)
+
+    @patch('SoftLayer.ratelimit.time')
+    def test_max_wait_shared(self, _time):
+        _time.time.return_value = 100.0
+        concurrency = Mock(limit=4, in_flight=0)
+        concurrency.acquire.return_value = 0.5
+        self.client.rate_limiter = RateLimiter(
+            rate=1, concurrency=concurrency, max_wait=5)
+
+        self.client['Account'].getObject()
+        self.client['Account'].getObject()
+
+        # The second call waited a second for the rate limit, which leaves
+        # four for the concurrency limit
+        self.assertEqual([c[0][0] for c in concurrency.acquire.call_args_list],
+                         [5, 4])
+        self.assertEqual(self.client.rate_limiter.metrics['wait_time'], 2)
+
+    @patch('SoftLayer.ratelimit.time.time')
+    def test_rate_window(self, _time):
+        self.client.rate_limiter = RateLimiter()
+        for now in [100.0, 100.5, 101.2]:
+            _time.return_value = now
+            self.client['Account'].getObject()
+
+        # Calls older than a second no longer count towards the rate
+        self.assertEqual(self.client.rate_limiter.metrics['rate'], 2)
+        _time.return_value = 102.0
+        self.assertEqual(self.client.rate_limiter.metrics['rate'], 1)
+        self.assertEqual(self.client.rate_limiter.metrics['calls'], 3)
+
+    def test_shared_between_threads(self):
+        concurrency = AdaptiveConcurrencyLimit(initial=2, maximum=2)
+        self.client.rate_limiter = RateLimiter(concurrency=concurrency)
+        in_flight = []
+        lock = threading.Lock()
+
+        def transport(_):
+            with lock:
+                in_flight.append(concurrency.in_flight)
+
+        self.transport.side_effect = transport
+        threads = [threading.Thread(target=self.client['Account'].getObject)
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(in_flight), 10)
+        self.assertTrue(max(in_flight) <= 2)
+        self.assertEqual(self.client.rate_limiter.metrics['calls'], 10)
+
+    def test_repr(self):
+        self.assertIn('RateLimiter', repr(RateLimiter(rate=1)))
@@ -0,0 +1,87 @@
+"""
+    SoftLayer.tests.records_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+import copy
+import pickle
+
+from SoftLayer.records import Record, compact, get_schema
+from SoftLayer.tests import unittest
+from SoftLayer.tests.fixtures import Account
+from SoftLayer.utils import lookup
+
+
+class CompactTests(unittest.TestCase):
+
+    def setUp(self):
+        self.row = compact({'id': 1, 'hostname': 'web',
+                            'datacenter': {'name': 'dal05'},
+                            'tags': [{'name': 'a'}, {'name': 'b'}]})
+
+    def test_item_access(self):
+        self.assertEqual(self.row['id'], 1)
+        self.assertEqual(self.row['datacenter']['name'], 'dal05')
+        self.assertEqual(self.row['tags'][1]['name'], 'b')
+        self.assertRaises(KeyError, lambda: self.row['missing'])
+        self.assertRaises(KeyError, lambda: self.row[0])
+
+    def test_attribute_access(self):
+        self.assertEqual(self.row.hostname, 'web')
+        self.assertEqual(self.row.datacenter.name, 'dal05')
+        self.assertRaises(AttributeError, lambda: self.row.missing)
+
+    def test_mapping_methods(self):
+        self.assertEqual(self.row.get('id'), 1)
+        self.assertEqual(self.row.get('missing', 'default'), 'default')
+        self.assertEqual(sorted(self.row.keys()),
+                         ['datacenter', 'hostname', 'id', 'tags'])
+        self.assertEqual(sorted(self.row), sorted(self.row.keys()))
+        self.assertEqual(dict(self.row.items())['hostname'], 'web')
+        self.assertIn(1, self.row.values())
+        self.assertIn('hostname', self.row)
+        self.assertNotIn('web', self.row)
+        self.assertEqual(len(self.row), 4)
+
+    def test_lookup(self):
+        self.assertEqual(lookup(self.row, 'datacenter', 'name'), 'dal05')
+        self.assertEqual(lookup(self.row, 'missing', 'name'), None)
+
+    def test_to_dict(self):
+        data = self.row.to_dict()
+        self.assertIs(type(data), dict)
+        self.assertIs(type(data['datacenter']), dict)
+        self.assertIs(type(data['tags'][0]), dict)
+        self.assertEqual(data['tags'], [{'name': 'a'}, {'name': 'b'}])
+
+    def test_equality(self):
+        self.assertEqual(self.row, self.row.to_dict())
+        self.assertEqual(self.row.to_dict(), self.row)
+        self.assertEqual(self.row, compact(self.row.to_dict()))
+        self.assertNotEqual(self.row, {'id': 1})
+        self.assertNotEqual(self.row, (1, 'web'))
+
+    def test_shared_schema(self):
+        guests = compact(Account.getVirtualGuests)
+        self.assertEqual(guests, Account.getVirtualGuests)
+        self.assertIs(type(guests[0]), type(guests[1]))
+        self.assertIs(type(compact({'a': 1, 'b': 2})),
+                      get_schema(('a', 'b')))
+
+    def test_no_instance_dict(self):
+        self.assertIsInstance(self.row, Record)
+        self.assertFalse(hasattr(self.row, '__dict__'))
+
+    def test_copy_and_pickle(self):
+        copied = copy.deepcopy(self.row)
+        self.assertEqual(copied, self.row)
+        self.assertIs(type(copied), type(self.row))
+
+        unpickled = pickle.loads(pickle.dumps(self.row))
+        self.assertEqual(unpickled, self.row)
+        self.assertIs(type(unpickled.datacenter), type(self.row.datacenter))
+
+    def test_other_values(self):
+        self.assertEqual(compact([1, 'a', None]), [1, 'a', None])
+        self.assertEqual(compact('text'), 'text')
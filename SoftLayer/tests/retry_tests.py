@@ -0,0 +1,104 @@
+"""
+    SoftLayer.tests.retry_tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license: MIT, see LICENSE for more details.
+"""
+from mock import patch, Mock
+
+import SoftLayer
+from SoftLayer.retry import RetryPolicy
+from SoftLayer.tests import unittest
+
+
+class RetryPolicyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Mock(return_value='ok')
+        self.policy = RetryPolicy(max_attempts=3, backoff=1, max_backoff=3)
+        self.client = SoftLayer.Client(
+            username='doesnotexist', api_key='issurelywrong',
+            transport=self.transport, retry_policy=self.policy)
+
+    @patch('SoftLayer.retry.time.sleep')
+    def test_retry_transport_error(self, sleep):
+        self.transport.side_effect = [SoftLayer.TransportError(0, 'reset'),
+                                      SoftLayer.TransportError(503, 'busy'),
+                                      'ok']
+
+        self.assertEqual(self.client['Account'].getObject(), 'ok')
+        self.assertEqual(self.transport.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch('SoftLayer.retry.time.sleep')
+    def test_max_attempts(self, sleep):
+        self.transport.side_effect = SoftLayer.RemoteSystemError('E', 'E')
+
+        self.assertRaises(SoftLayer.RemoteSystemError,
+                          self.client['Account'].getObject)
+        self.assertEqual(self.transport.call_count, 3)
+
+    def test_application_error_not_retried(self):
+        self.transport.side_effect = SoftLayer.ApplicationError('E', 'E')
+
+        self.assertRaises(SoftLayer.ApplicationError,
+                          self.client['Account'].getObject)
+        self.assertEqual(self.transport.call_count, 1)
+
+    def test_only_get_methods(self):
+        self.transport.side_effect = SoftLayer.TransportError(0, 'reset')
+
+        self.assertRaises(SoftLayer.TransportError,
+                          self.client['Virtual_Guest'].createObject, {})
+        self.assertEqual(self.transport.call_count, 1)
+
+    @patch('SoftLayer.retry.time.sleep')
+    def test_methods(self, sleep):
+        self.policy.methods = ['Virtual_Guest.createObject']
+        self.transport.side_effect = [SoftLayer.TransportError(0, 'reset'),
+                                      'ok']
+
+        self.assertEqual(self.client['Virtual_Guest'].createObject({}), 'ok')
+        self.assertFalse(self.policy.is_retryable_method('Account',
+                                                         'getObject'))
+
+    def test_is_retryable_error(self):
+        retryable = self.policy.is_retryable_error
+        self.assertTrue(retryable(SoftLayer.TransportError(0, 'E')))
+        self.assertTrue(retryable(SoftLayer.TransportError(429, 'E')))
+        self.assertTrue(retryable(SoftLayer.TransportError(502, 'E')))
+        self.assertTrue(retryable(SoftLayer.TransportError('-32300', 'E')))
+        self.assertTrue(retryable(SoftLayer.SoftLayerAPIError(500, 'E')))
+        self.assertTrue(retryable(SoftLayer.RemoteSystemError('E', 'E')))
+        self.assertFalse(retryable(SoftLayer.TransportError(404, 'E')))
+        self.assertFalse(retryable(SoftLayer.ApplicationError(500, 'E')))
+        self.assertFalse(retryable(SoftLayer.SoftLayerAPIError('E', 'E')))
+        self.assertFalse(retryable(ValueError()))
+
+    @patch('SoftLayer.retry.random.uniform')
+    def test_backoff(self, uniform):
+        uniform.side_effect = lambda low, high: high
+
+        self.assertEqual(self.policy.get_backoff(1), 1)
+        self.assertEqual(self.policy.get_backoff(2), 2)
+        self.assertEqual(self.policy.get_backoff(3), 3)
+        self.assertEqual(self.policy.get_backoff(10), 3)
+
+    @patch('SoftLayer.retry.time.time')
+    @patch('SoftLayer.retry.time.sleep')
+    @patch('SoftLayer.retry.random.uniform')
+    def test_deadline(self, uniform, sleep, time):
+        self.policy.deadline = 2
+        self.policy.max_attempts = 10
+        uniform.return_value = 1
+        time.side_effect = [100, 100.5, 101.5]
+        self.transport.side_effect = SoftLayer.TransportError(0, 'reset')
+
+        self.assertRaises(SoftLayer.TransportError,
+                          self.client['Account'].getObject)
+        # The third attempt would start 2.5 seconds after the first one
+        self.assertEqual(self.transport.call_count, 2)
+        sleep.assert_called_once_with(1)
+
+    def test_repr(self):
+        self.assertIn('RetryPolicy', repr(self.policy))
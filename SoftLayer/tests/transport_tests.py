@@ -4,12 +4,19 @@
 
     :license: MIT, see LICENSE for more details.
 """
-from mock import patch, MagicMock, ANY
+from mock import patch, MagicMock, PropertyMock, ANY
 
-from SoftLayer import SoftLayerAPIError, TransportError
-from SoftLayer.transports import make_rest_api_call, make_xml_rpc_api_call
+from SoftLayer import (
+    SoftLayerAPIError, TransportError, TransportTimeout, ApplicationError)
+from SoftLayer.transports import (
+    make_rest_api_call, make_xml_rpc_api_call, make_session,
+    XmlRpcStreamParser, XmlRpcEncoder, parse_xml_rpc_response, Request,
+    XmlRpcTransport, RestTransport)
+from SoftLayer.utils import xmlrpc_client
 from SoftLayer.tests import unittest
-from requests import HTTPError, RequestException
+from SoftLayer.tests.fixtures import Account
+from requests import HTTPError, RequestException, Timeout
+from xml.parsers import expat
 
 
 class TestXmlRpcAPICall(unittest.TestCase):
@@ -74,6 +81,300 @@ class TestXmlRpcAPICall(unittest.TestCase):
                      'http': 'http://localhost:3128'},
             timeout=None)
 
+    def test_shared_session(self):
+        session = MagicMock()
+        session.send().content = self.send_content
+        make_xml_rpc_api_call('http://something.com/path/to/resource',
+                              'getObject', session=session)
+        session.send.assert_called_with(ANY, proxies=None, timeout=None)
+
+    @patch('SoftLayer.transports.requests.Session.send')
+    def test_stream(self, send):
+        records = [{'id': 1, 'name': 'one'}, {'id': 2, 'name': 'two'}]
+        body = xmlrpc_client.dumps((records,), methodresponse=True).encode()
+        response = send()
+        response.ok = True
+        response.iter_content.return_value = [body[:50], body[50:200],
+                                              body[200:]]
+        content = PropertyMock()
+        type(response).content = content
+
+        resp = make_xml_rpc_api_call(
+            'http://something.com/path/to/resource', 'getObject',
+            stream=True)
+
+        send.assert_called_with(ANY, proxies=None, timeout=None, stream=True)
+        self.assertFalse(content.called)
+        self.assertEqual(list(resp), records)
+        self.assertTrue(response.close.called)
+
+    @patch('SoftLayer.transports.requests.Session.send')
+    def test_stream_fault(self, send):
+        fault = xmlrpc_client.Fault('-32500', 'oops')
+        body = xmlrpc_client.dumps(fault, methodresponse=True).encode()
+        send().iter_content.return_value = [body]
+
+        resp = make_xml_rpc_api_call(
+            'http://something.com/path/to/resource', 'getObject',
+            stream=True)
+
+        self.assertRaises(ApplicationError, list, resp)
+
+    @patch('SoftLayer.transports.requests.Session.send')
+    def test_stream_download_errors(self, send):
+        errors = [
+            (xmlrpc_client.Fault('-32500', 'oops'), ApplicationError),
+            (Timeout('read timed out'), TransportTimeout),
+            (RequestException('connection reset'), TransportError),
+        ]
+        for error, expected in errors:
+            response = send()
+            response.reset_mock()
+            response.iter_content.side_effect = error
+
+            resp = make_xml_rpc_api_call(
+                'http://something.com/path/to/resource', 'getObject',
+                stream=True)
+
+            try:
+                list(resp)
+            except SoftLayerAPIError as ex:
+                self.assertIs(type(ex), expected)
+            else:
+                self.fail('%r was not raised' % expected)
+            self.assertTrue(response.close.called)
+
+    @patch('SoftLayer.transports.requests.Session.send')
+    def test_stream_http_error(self, send):
+        e = HTTPError('error')
+        e.response = MagicMock()
+        e.response.status_code = 503
+        send().ok = False
+        send().raise_for_status.side_effect = e
+
+        self.assertRaises(TransportError, make_xml_rpc_api_call,
+                          'http://something.com/path/to/resource',
+                          'getObject', stream=True)
+        self.assertTrue(send().close.called)
+
+
+class TestXmlRpcStreamParser(unittest.TestCase):
+
+    def parse(self, result, chunk_size=7):
+        body = xmlrpc_client.dumps((result,), methodresponse=True,
+                                   allow_none=True).encode('utf-8')
+        parser = XmlRpcStreamParser()
+        items = []
+        for i in range(0, len(body), chunk_size):
+            parser.feed(body[i:i + chunk_size])
+            items.extend(parser.drain())
+        parser.close()
+        items.extend(parser.drain())
+        return items
+
+    def test_list(self):
+        records = [{'id': i,
+                    'hostname': u'h\xe9st%d' % i,
+                    'datacenter': {'name': 'dal05'},
+                    'tags': ['a', None, 1.5, True]} for i in range(10)]
+        self.assertEqual(self.parse(records), records)
+
+    def test_items_as_they_complete(self):
+        body = xmlrpc_client.dumps(([{'id': 1}, {'id': 2}],),
+                                   methodresponse=True).encode()
+        first_member_end = body.index(b'</value>', body.index(b'</struct>'))
+        parser = XmlRpcStreamParser()
+        parser.feed(body[:first_member_end])
+        self.assertEqual(parser.drain(), [])
+        parser.feed(body[first_member_end:first_member_end + 8])
+        self.assertEqual(parser.drain(), [{'id': 1}])
+
+    def test_empty_list(self):
+        self.assertEqual(self.parse([]), [])
+
+    def test_nested_lists(self):
+        self.assertEqual(self.parse([[1, 2], [3]]), [[1, 2], [3]])
+
+    def test_not_list(self):
+        self.assertEqual(self.parse({'id': 1}), [{'id': 1}])
+        self.assertEqual(self.parse(5), [5])
+        self.assertEqual(self.parse('text'), ['text'])
+
+    def test_untyped_string(self):
+        parser = XmlRpcStreamParser()
+        parser.feed(b"<?xml version='1.0'?><methodResponse><params><param>"
+                    b"<value>bare</value></param></params></methodResponse>")
+        parser.close()
+        self.assertEqual(parser.drain(), ['bare'])
+
+    def test_fault(self):
+        fault = xmlrpc_client.Fault('-32500', 'oops')
+        body = xmlrpc_client.dumps(fault, methodresponse=True).encode()
+        parser = XmlRpcStreamParser()
+        self.assertRaises(xmlrpc_client.Fault, parser.feed, body)
+
+
+class TestXmlRpcEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = XmlRpcEncoder()
+        self.auth = {'authenticate': {'username': 'user', 'apiKey': 'key'}}
+
+    def assert_same(self, method, args, headers):
+        params = [{'headers': headers}]
+        params.extend(args)
+        expected = xmlrpc_client.dumps(tuple(params), methodname=method,
+                                       allow_none=True)
+        self.assertEqual(self.encoder.dumps(method, args, headers), expected)
+
+    def test_same_as_dumps(self):
+        headers = dict(self.auth)
+        headers['SoftLayer_ObjectMask'] = {'mask': 'mask[id,hostname]'}
+        headers['SoftLayer_Virtual_GuestInitParameters'] = {'id': 1234}
+        headers['resultLimit'] = {'limit': 10, 'offset': 0}
+        headers['SoftLayer_Virtual_GuestObjectFilter'] = {
+            'hostname': {'operation': 'web'}}
+        cases = [
+            ('getObject', (), headers),
+            ('getObject', (), {}),
+            ('setTags', ('a,b',), self.auth),
+            ('createObject', ({'hostname': u'\u00e9', 'cpus': 1,
+                               'hourly': True, 'disks': [1, 2.5, None]},),
+             self.auth),
+            ('getObject', (), {'SoftLayer_ObjectMask': {
+                'mask': {'datacenter': {'name': None}}}}),
+            ('getObject', (), {'flag': True}),
+            ('getObject', (), {'flag': 1}),
+            ('getObject', (), None),
+        ]
+        for method, args, case_headers in cases:
+            # Twice, so the cached fragments are used too
+            self.assert_same(method, args, case_headers)
+            self.assert_same(method, args, case_headers)
+
+    def test_caches_fragments(self):
+        self.encoder.dumps('getObject', (), self.auth)
+        with patch('SoftLayer.transports.xmlrpc_client.dumps') as dumps:
+            self.encoder.dumps('getObject', (), self.auth)
+            self.assertFalse(dumps.called)
+
+    def test_nested_values_not_cached(self):
+        self.encoder.dumps('getObject', (), {'filter': {'id': [1, 2]}})
+        self.assertEqual(self.encoder._fragments, {})
+
+    def test_max_size(self):
+        encoder = XmlRpcEncoder(max_size=2)
+        for i in range(5):
+            encoder.dumps('getObject', (), {'init': {'id': i}})
+            self.assertLessEqual(len(encoder._fragments), 2)
+
+
+def value_types(value):
+    """ Returns the types of a value and of everything in it, keys included """
+    if isinstance(value, dict):
+        return dict((key, (type(key), value_types(item)))
+                    for key, item in value.items())
+    if isinstance(value, list):
+        return [value_types(item) for item in value]
+    return type(value)
+
+
+class TestParseXmlRpcResponse(unittest.TestCase):
+
+    def assert_same(self, result):
+        payload = xmlrpc_client.dumps((result,), methodresponse=True,
+                                      allow_none=True).encode('utf-8')
+        self.assert_same_payload(payload)
+
+    def assert_same_payload(self, payload):
+        expected = xmlrpc_client.loads(payload)[0][0]
+        for parsed in [parse_xml_rpc_response(payload),
+                       parse_xml_rpc_response(payload, intern_keys=False)]:
+            self.assertEqual(parsed, expected)
+            # On Python 2, ASCII strings are str and the others unicode
+            self.assertEqual(value_types(parsed), value_types(expected))
+
+    def test_same_as_loads(self):
+        self.assert_same(Account.getVirtualGuests)
+        self.assert_same(Account.getHardware)
+        self.assert_same({'hostname': u'\u00e9<&>', 'id': 1, 'ok': True,
+                          'bad': False, 'price': 0.5, 'empty': '',
+                          'nothing': None, 'nested': [[], {}, [1, 'a']],
+                          'data': xmlrpc_client.Binary(b'\x00\x01'),
+                          'date': xmlrpc_client.DateTime('20140101T00:00:00')})
+        self.assert_same([])
+        self.assert_same('text')
+
+    def test_untyped_and_extension_values(self):
+        payload = b"""<?xml version='1.0'?>
+<methodResponse xmlns:ex="http://ws.apache.org/xmlrpc/namespaces/extensions">
+<params><param><value><struct>
+<member><name>a</name><value>untyped</value></member>
+<member><name>b</name><value/></member>
+<member><name>c</name><value><ex:nil/></value></member>
+<member><name>d</name><value><ex:i8>9</ex:i8></value></member>
+<member><name>e</name><value><bigdecimal>1.5</bigdecimal></value></member>
+</struct></value></param></params>
+</methodResponse>"""
+        self.assert_same_payload(payload)
+
+    def test_interned_keys(self):
+        payload = xmlrpc_client.dumps(
+            ([{'hostname': 'a'}, {'hostname': 'b'}],),
+            methodresponse=True).encode('utf-8')
+
+        first, second = parse_xml_rpc_response(payload)
+        self.assertIs(list(first)[0], list(second)[0])
+
+    def test_fault(self):
+        payload = xmlrpc_client.dumps(
+            xmlrpc_client.Fault('SoftLayer_Exception', 'Error'),
+            methodresponse=True).encode('utf-8')
+
+        try:
+            parse_xml_rpc_response(payload)
+        except xmlrpc_client.Fault as ex:
+            self.assertEqual(ex.faultCode, 'SoftLayer_Exception')
+            self.assertEqual(ex.faultString, 'Error')
+        else:
+            self.fail('Fault not raised')
+
+    def test_bad_boolean(self):
+        payload = (b"<methodResponse><params><param><value>"
+                   b"<boolean>2</boolean></value></param></params>"
+                   b"</methodResponse>")
+        self.assertRaises(TypeError, parse_xml_rpc_response, payload)
+
+    def test_unknown_tag(self):
+        payload = (b"<methodResponse><params><param><value>"
+                   b"<unknown>1</unknown></value></param></params>"
+                   b"</methodResponse>")
+        self.assertRaises(xmlrpc_client.ResponseError,
+                          parse_xml_rpc_response, payload)
+
+    def test_incomplete(self):
+        self.assertRaises(xmlrpc_client.ResponseError,
+                          parse_xml_rpc_response,
+                          b"<methodResponse><value><array><data/>"
+                          b"</array></value></methodResponse>")
+        self.assertRaises(expat.ExpatError, parse_xml_rpc_response,
+                          b"<methodResponse><params>")
+
+
+class TestMakeSession(unittest.TestCase):
+
+    def test_pool_size(self):
+        session = make_session(pool_connections=3, pool_maxsize=30)
+        adapter = session.get_adapter('https://api.softlayer.com')
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 30)
+        self.assertIs(adapter, session.get_adapter('http://localhost'))
+        self.assertNotEqual(session.headers.get('Connection'), 'close')
+
+    def test_no_keep_alive(self):
+        session = make_session(keep_alive=False)
+        self.assertEqual(session.headers['Connection'], 'close')
+
 
 class TestRestAPICall(unittest.TestCase):
 
@@ -150,6 +451,19 @@ class TestRestAPICall(unittest.TestCase):
             'GET',
             'http://something.com/path/to/resource.txt')
 
+    def test_shared_session(self):
+        session = MagicMock()
+        session.request().text = 'content'
+        resp = make_rest_api_call(
+            'GET', 'http://something.com/path/to/resource.txt',
+            session=session)
+        self.assertEqual(resp, 'content')
+        session.request.assert_called_with(
+            'GET', 'http://something.com/path/to/resource.txt',
+            headers=None,
+            proxies=None,
+            timeout=None)
+
     @patch('SoftLayer.transports.requests.request')
     def test_unknown_error(self, request):
         e = RequestException('error')
@@ -163,3 +477,143 @@ class TestRestAPICall(unittest.TestCase):
             make_rest_api_call,
             'GET',
             'http://something.com/path/to/resource.txt')
+
+
+def make_request(**kwargs):
+    request = Request()
+    request.service = 'SoftLayer_SERVICE'
+    request.method = 'METHOD'
+    request.endpoint_url = 'http://endpoint'
+    request.headers = {'authenticate': {'username': 'user',
+                                        'apiKey': 'key'}}
+    request.transport_headers = {'User-Agent': 'agent'}
+    request.session = MagicMock()
+    for key, value in kwargs.items():
+        setattr(request, key, value)
+    return request
+
+
+class TestXmlRpcTransport(unittest.TestCase):
+
+    @patch('SoftLayer.transports.make_xml_rpc_api_call')
+    def test_call(self, make_xml_rpc_api_call):
+        request = make_request(args=(1,), identifier=2,
+                               mask={'attr': None}, filter={'f': 1},
+                               limit=3, offset=4)
+        result = XmlRpcTransport()(request)
+
+        self.assertEqual(result, make_xml_rpc_api_call.return_value)
+        make_xml_rpc_api_call.assert_called_with(
+            'http://endpoint/SoftLayer_SERVICE', 'METHOD', (1,),
+            headers={
+                'authenticate': {'username': 'user', 'apiKey': 'key'},
+                'SoftLayer_SERVICEInitParameters': {'id': 2},
+                'SoftLayer_SERVICEObjectMask': {'mask': {'attr': None}},
+                'SoftLayer_SERVICEObjectFilter': {'f': 1},
+                'resultLimit': {'limit': 3, 'offset': 4},
+            },
+            http_headers={'User-Agent': 'agent',
+                          'Content-Type': 'application/xml'},
+            timeout=None,
+            proxy=None,
+            session=request.session,
+            stream=False,
+            request=request)
+
+
+class TestRestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = RestTransport()
+
+    def test_get(self):
+        request = make_request(identifier=2, mask='mask[id]',
+                               filter={'f': 1}, limit=3, offset=4)
+        request.session.request().text = '{"id": 2}'
+
+        result = self.transport(request)
+
+        self.assertEqual(result, {'id': 2})
+        request.session.request.assert_called_with(
+            'GET', 'http://endpoint/SoftLayer_SERVICE/2/METHOD.json',
+            params={'objectMask': 'mask[id]',
+                    'objectFilter': '{"f": 1}',
+                    'resultLimit': '4,3'},
+            data=None,
+            auth=('user', 'key'),
+            headers={'User-Agent': 'agent'},
+            timeout=None,
+            proxies=None)
+
+    def test_post_args(self):
+        request = make_request(args=({'hostname': 'test'}, 1))
+        request.session.request().text = 'true'
+
+        self.assertEqual(self.transport(request), True)
+        args, kwargs = request.session.request.call_args
+        self.assertEqual(args, ('POST',
+                                'http://endpoint/SoftLayer_SERVICE/'
+                                'METHOD.json'))
+        self.assertEqual(kwargs['data'],
+                         '{"parameters": [{"hostname": "test"}, 1]}')
+
+    def test_dict_mask(self):
+        request = make_request(mask={'vlans': {'rules': None, 'flag': {}},
+                                     'id': None})
+        request.session.request().text = '[]'
+
+        self.transport(request)
+
+        kwargs = request.session.request.call_args[1]
+        self.assertEqual(kwargs['params'],
+                         {'objectMask': 'mask[id,vlans[flag,rules]]'})
+
+    def test_stream(self):
+        request = make_request(stream=True)
+        request.session.request().text = '[1, 2]'
+        self.assertEqual(list(self.transport(request)), [1, 2])
+
+    def test_token_auth(self):
+        request = make_request(headers={'authenticate': {'userId': 1,
+                                                         'authToken': 'x'}})
+        request.session.request().text = '{}'
+        self.transport(request)
+        self.assertIsNone(request.session.request.call_args[1]['auth'])
+
+    def test_api_error(self):
+        request = make_request()
+        e = HTTPError('error')
+        e.response = MagicMock()
+        e.response.status_code = 404
+        e.response.text = ('{"error": "Unable to find object",'
+                           ' "code": "SoftLayer_Exception_ObjectNotFound"}')
+        request.session.request().raise_for_status.side_effect = e
+
+        try:
+            self.transport(request)
+        except SoftLayerAPIError as ex:
+            self.assertEqual(ex.faultCode,
+                             'SoftLayer_Exception_ObjectNotFound')
+            self.assertEqual(ex.faultString, 'Unable to find object')
+        else:
+            self.fail('No Exception Raised')
+
+    def test_http_error(self):
+        request = make_request()
+        e = HTTPError('error')
+        e.response = MagicMock()
+        e.response.status_code = 502
+        e.response.text = '<html>Bad Gateway</html>'
+        request.session.request().raise_for_status.side_effect = e
+
+        self.assertRaises(TransportError, self.transport, request)
+
+    def test_connection_error(self):
+        request = make_request()
+        request.session.request.side_effect = RequestException('error')
+        self.assertRaises(TransportError, self.transport, request)
+
+    def test_timeout(self):
+        request = make_request()
+        request.session.request.side_effect = Timeout('timed out')
+        self.assertRaises(TransportTimeout, self.transport, request)
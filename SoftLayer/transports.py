@@ -1,22 +1,48 @@
 """
     SoftLayer.transports
     ~~~~~~~~~~~~~~~~~~~~
-    XML-RPC transport layer that uses the requests library.
+    XML-RPC and REST transport layer that uses the requests library.
 
     :license: MIT, see LICENSE for more details.
 """
 from SoftLayer.exceptions import (
     SoftLayerAPIError, NotWellFormed, UnsupportedEncoding, InvalidCharacter,
     SpecViolation, MethodNotFound, InvalidMethodParameters, InternalError,
-    ApplicationError, RemoteSystemError, TransportError)
+    ApplicationError, RemoteSystemError, TransportError, TransportTimeout)
+from SoftLayer.consts import API_PUBLIC_ENDPOINT, API_PUBLIC_ENDPOINT_REST
+from SoftLayer.masks import format_mask
 from SoftLayer.utils import xmlrpc_client
 
 import logging
 import requests
+import six
 import json
+import time
+from decimal import Decimal
+from xml.parsers import expat
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+STREAM_CHUNK_SIZE = 64 * 1024
+ENCODER_CACHE_SIZE = 1000
+
+# These exceptions are formed from the XML-RPC spec
+# http://xmlrpc-epi.sourceforge.net/specs/rfc.fault_codes.php
+FAULT_CODE_MAPPING = {
+    '-32700': NotWellFormed,
+    '-32701': UnsupportedEncoding,
+    '-32702': InvalidCharacter,
+    '-32600': SpecViolation,
+    '-32601': MethodNotFound,
+    '-32602': InvalidMethodParameters,
+    '-32603': InternalError,
+    '-32500': ApplicationError,
+    '-32400': RemoteSystemError,
+    '-32300': TransportError,
+}
+
 
 def _proxies_dict(proxy):
     """ Makes a dict appropriate to pass to requests """
@@ -25,8 +51,391 @@ def _proxies_dict(proxy):
     return {'http': proxy, 'https': proxy}
 
 
+def make_session(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, keep_alive=True):
+    """ Creates a requests session with its own connection pool. Reusing the
+        session across API calls avoids a new TCP and TLS handshake for every
+        request. The session can be shared between threads.
+
+    :param int pool_connections: number of per-host connection pools to keep
+    :param int pool_maxsize: maximum number of connections to keep per host
+    :param bool keep_alive: set to False to close connections after each
+                            request
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections,
+                                            pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+class XmlRpcEncoder(object):
+    """ Encodes XML-RPC API requests. The output is identical to
+        xmlrpc_client.dumps, but the encoded form of headers that are sent
+        over and over, like the authentication and object mask headers, is
+        cached so only the parts that change are encoded for each call.
+        Headers holding nested lists or dicts are encoded every time.
+
+    :param int max_size: the maximum number of cached header fragments
+    """
+    PARAMS = '<params>\n'
+    PARAMS_END = '</params>\n'
+    STRUCT = '<value><struct>\n'
+    STRUCT_END = '</struct></value>\n'
+    HEADERS = '%s<param>\n%s<member>\n<name>headers</name>\n%s' % (
+        PARAMS, STRUCT, STRUCT)
+    HEADERS_END = '%s</member>\n%s</param>\n' % (STRUCT_END, STRUCT_END)
+
+    def __init__(self, max_size=ENCODER_CACHE_SIZE):
+        self.max_size = max_size
+        self._methods = {}
+        self._fragments = {}
+
+    def _encode_method(self, method):
+        """ Returns the encoded text that comes before and after the params
+            of a call to the method """
+        parts = self._methods.get(method)
+        if parts is None:
+            empty = xmlrpc_client.dumps((), methodname=method,
+                                        allow_none=True)
+            head, tail = empty.split(self.PARAMS + self.PARAMS_END)
+            parts = self._methods[method] = (head, tail)
+        return parts
+
+    def _encode_header(self, name, value):
+        """ Returns a header encoded as a struct member """
+        if isinstance(value, dict):
+            key = (name, tuple((k, type(v), v) for k, v in value.items()))
+        else:
+            key = (name, type(value), value)
+        try:
+            fragment = self._fragments.get(key)
+        except TypeError:
+            # Nested values can't be used as a cache key
+            fragment = key = None
+        if fragment is not None:
+            return fragment
+
+        encoded = xmlrpc_client.dumps(({name: value},), allow_none=True)
+        fragment = encoded[len(self.PARAMS) + len('<param>\n')
+                           + len(self.STRUCT):
+                           -len(self.STRUCT_END + '</param>\n'
+                                + self.PARAMS_END)]
+        if key is not None:
+            if len(self._fragments) >= self.max_size:
+                self._fragments.clear()
+            self._fragments[key] = fragment
+        return fragment
+
+    def dumps(self, method, args=None, headers=None):
+        """ Returns the XML-RPC request calling the method with the given
+            arguments and SoftLayer API headers.
+
+        :param string method: method to call E.G.: 'getObject'
+        :param args: the positional arguments of the call
+        :param dict headers: XML-RPC headers to use for the request
+        """
+        if not isinstance(headers, dict):
+            params = [{'headers': headers}]
+            params.extend(args or ())
+            return xmlrpc_client.dumps(tuple(params), methodname=method,
+                                       allow_none=True)
+
+        head, tail = self._encode_method(method)
+        parts = [head, self.HEADERS]
+        for name, value in headers.items():
+            parts.append(self._encode_header(name, value))
+        parts.append(self.HEADERS_END)
+        if args:
+            parts.append(xmlrpc_client.dumps(tuple(args), allow_none=True)[
+                len(self.PARAMS):-len(self.PARAMS_END)])
+        parts.append(self.PARAMS_END)
+        parts.append(tail)
+        return ''.join(parts)
+
+
+ENCODER = XmlRpcEncoder()
+
+
+def _instrument(request, hook):
+    """ Calls a hook of the request's instrumentation, if it has any """
+    if request.instrumentation is not None:
+        getattr(request.instrumentation, hook)(request)
+
+
+def _fault_to_exception(fault):
+    """ Converts an XML-RPC fault into the matching SoftLayerAPIError """
+    return FAULT_CODE_MAPPING.get(fault.faultCode, SoftLayerAPIError)(
+        fault.faultCode, fault.faultString)
+
+
+def _decode_boolean(data):
+    """ Decodes the text of a <boolean> element """
+    if data == '0':
+        return False
+    elif data == '1':
+        return True
+    raise TypeError("bad boolean value")
+
+
+def _decode_base64(data):
+    """ Decodes the text of a <base64> element """
+    value = xmlrpc_client.Binary()
+    value.decode(data.encode('ascii'))
+    return value
+
+
+def _decode_datetime(data):
+    """ Decodes the text of a <dateTime.iso8601> element """
+    value = xmlrpc_client.DateTime()
+    value.decode(data)
+    return value
+
+
+# Decoders for the text of XML-RPC scalar elements
+SCALAR_DECODERS = {
+    'int': int, 'i1': int, 'i2': int, 'i4': int, 'i8': int,
+    'biginteger': int,
+    'double': float, 'float': float,
+    'bigdecimal': Decimal,
+    'boolean': _decode_boolean,
+    'nil': lambda data: None,
+    'base64': _decode_base64,
+    'dateTime.iso8601': _decode_datetime,
+}
+XML_RPC_TAGS = frozenset(list(SCALAR_DECODERS) + [
+    'string', 'name', 'array', 'struct', 'value', 'params', 'fault',
+    'methodName'])
+
+if six.PY2:  # pragma: no cover
+    def _join_text(parts):
+        """ Joins the text of a string element. Like xmlrpc_client.loads,
+            ASCII-only strings are str and the others unicode. """
+        text = u''.join(parts)
+        try:
+            return text.encode('ascii')
+        except UnicodeError:
+            return text
+else:
+    _join_text = ''.join  # pylint: disable=C0103
+
+
+def parse_xml_rpc_response(data, intern_keys=True):
+    """ Parses an XML-RPC method response and returns its result, or raises
+        xmlrpc_client.Fault for a fault response. The result is identical to
+        ``xmlrpc_client.loads(data)[0][0]``, but the response is decoded by
+        a single expat pass with much less overhead per element.
+
+    :param data: the response body
+    :param bool intern_keys: share a single string between all struct keys
+                             with the same name. Results with many records
+                             then take less memory.
+    """
+    stack = []
+    marks = []
+    text = []
+    names = {}
+    append = stack.append
+    # [the element being closed is a <value> without a type, response type]
+    state = [False, None]
+
+    def start(tag, attrs):
+        """ expat start element handler """
+        if ':' in tag:
+            tag = tag.split(':')[-1]
+        if tag == 'struct' or tag == 'array':
+            marks.append(len(stack))
+        del text[:]
+        if state[0] and tag not in XML_RPC_TAGS:
+            raise xmlrpc_client.ResponseError("unknown tag %r" % tag)
+        state[0] = tag == 'value'
+
+    def end(tag):
+        """ expat end element handler """
+        if tag == 'value':
+            if state[0]:
+                # A value without a type is a string
+                append(_join_text(text))
+                state[0] = False
+        elif tag == 'member':
+            pass
+        elif tag == 'name':
+            name = _join_text(text)
+            if intern_keys:
+                name = names.setdefault(name, name)
+            append(name)
+        elif tag == 'string':
+            append(_join_text(text))
+        elif tag == 'struct':
+            mark = marks.pop()
+            items = stack[mark:]
+            stack[mark:] = [dict(zip(items[::2], items[1::2]))]
+        elif tag == 'array':
+            mark = marks.pop()
+            stack[mark:] = [stack[mark:]]
+        elif tag in SCALAR_DECODERS:
+            append(SCALAR_DECODERS[tag](''.join(text)))
+        elif tag == 'params' or tag == 'fault' or tag == 'methodName':
+            state[1] = tag
+        elif ':' in tag:
+            end(tag.split(':')[-1])
+
+    parser = expat.ParserCreate(None, None)
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text.append
+    parser.Parse(data, True)
+
+    if state[1] is None or marks:
+        raise xmlrpc_client.ResponseError()
+    if state[1] == 'fault':
+        raise xmlrpc_client.Fault(**stack[0])
+    return stack[0]
+
+
+class XmlRpcStreamParser(object):
+    """ Incrementally parses an XML-RPC method response. When the result is
+        an array, each member is made available in `items` as soon as its
+        closing tag has been parsed. Any other result shows up as a single
+        item once it is complete. A fault response raises
+        xmlrpc_client.Fault from :func:`feed`.
+
+        Each value is decoded with xmlrpc_client.Unmarshaller, so items are
+        identical to what xmlrpc_client.loads would return.
+    """
+    # Nesting depth of the result <value>: methodResponse > params > param
+    RESULT_DEPTH = 3
+    # Nesting depth of array members: ... > value > array > data
+    MEMBER_DEPTH = 6
+    # Nesting depth of a fault <value>: methodResponse > fault
+    FAULT_DEPTH = 2
+
+    def __init__(self):
+        self.items = []
+        self._path = []
+        self._target = None
+        self._target_depth = None
+        self._is_fault = False
+        self._result_pending = False
+        self._result_data = []
+        self._is_array = False
+
+        self._parser = parser = expat.ParserCreate(None, None)
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+
+    def feed(self, data):
+        """ Parses the next chunk of the response body """
+        self._parser.Parse(data, False)
+
+    def close(self):
+        """ Finishes parsing. Raises an error if the response is truncated """
+        self._parser.Parse(b'', True)
+
+    def drain(self):
+        """ Returns and forgets the items parsed so far """
+        items, self.items = self.items, []
+        return items
+
+    def _begin(self, depth, is_fault=False):
+        """ Starts decoding the <value> element at the given depth """
+        self._target = xmlrpc_client.Unmarshaller()
+        # expat has already decoded the text
+        self._target.xml(None, None)
+        self._target_depth = depth
+        self._is_fault = is_fault
+        self._target.start('value', {})
+
+    def _finish(self):
+        """ Completes the value being decoded and stores it """
+        target, self._target = self._target, None
+        if self._is_fault:
+            target.end('fault')
+            target.close()  # raises the fault
+        target.end('params')
+        self.items.append(target.close()[0])
+
+    def _start(self, tag, attrs):
+        """ expat start element handler """
+        depth = len(self._path)
+        self._path.append(tag)
+        if self._target is not None:
+            self._target.start(tag, attrs)
+        elif self._result_pending:
+            # The first child of the result decides how it is streamed
+            self._result_pending = False
+            if tag == 'array':
+                self._is_array = True
+            else:
+                self._begin(self.RESULT_DEPTH)
+                self._target.start(tag, attrs)
+        elif tag == 'value':
+            if depth == self.RESULT_DEPTH:
+                self._result_pending = True
+                self._result_data = []
+            elif depth == self.MEMBER_DEPTH and self._is_array:
+                self._begin(depth)
+            elif depth == self.FAULT_DEPTH and self._path[1] == 'fault':
+                self._begin(depth, is_fault=True)
+
+    def _end(self, tag):
+        """ expat end element handler """
+        self._path.pop()
+        depth = len(self._path)
+        if self._target is not None:
+            self._target.end(tag)
+            if tag == 'value' and depth == self._target_depth:
+                self._finish()
+        elif self._result_pending and tag == 'value':
+            # A bare <value>text</value> result is a string
+            self._result_pending = False
+            self._begin(depth)
+            self._target.data(''.join(self._result_data))
+            self._target.end('value')
+            self._finish()
+
+    def _data(self, text):
+        """ expat character data handler """
+        if self._target is not None:
+            self._target.data(text)
+        elif self._result_pending:
+            self._result_data.append(text)
+
+
+def _stream_xml_rpc_response(response, chunk_size=STREAM_CHUNK_SIZE):
+    """ A generator yielding result items from a streamed XML-RPC response
+        while it is being downloaded.
+
+    :param response: a requests response sent with stream=True
+    :param int chunk_size: number of bytes to read and parse at a time
+    """
+    parser = XmlRpcStreamParser()
+    try:
+        for data in response.iter_content(chunk_size):
+            parser.feed(data)
+            for item in parser.drain():
+                yield item
+        parser.close()
+        for item in parser.drain():
+            yield item
+    except xmlrpc_client.Fault as ex:
+        raise _fault_to_exception(ex)
+    except requests.Timeout as ex:
+        raise TransportTimeout(0, str(ex))
+    except requests.RequestException as ex:
+        raise TransportError(0, str(ex))
+    finally:
+        response.close()
+
+
 def make_xml_rpc_api_call(uri, method, args=None, headers=None,
-                          http_headers=None, timeout=None, proxy=None):
+                          http_headers=None, timeout=None, proxy=None,
+                          session=None, stream=False, request=None):
     """ Makes a SoftLayer API call against the XML-RPC endpoint
 
     :param string uri: endpoint URL
@@ -34,17 +443,29 @@ def make_xml_rpc_api_call(uri, method, args=None, headers=None,
     :param dict headers: XML-RPC headers to use for the request
     :param dict http_headers: HTTP headers to use for the request
     :param int timeout: number of seconds to use as a timeout
+    :param session: a requests session to send the request with. A new
+                    session is created for the call if one isn't given.
+    :param bool stream: return a generator that parses the response while
+                        it downloads and yields each member of the resulting
+                        list as soon as it is complete. Only one member is
+                        held in memory at a time.
+    :param request: an optional :class:`Request` to record the time spent in
+                    each phase of the call on, and whose instrumentation
+                    hooks are called
     """
     if args is None:
         args = tuple()
+    if request is None:
+        request = Request()
     try:
-        largs = list(args)
-        largs.insert(0, {'headers': headers})
+        start = time.time()
+        payload = ENCODER.dumps(method, args, headers)
+        request.serialize_time = time.time() - start
+        request.request_bytes = len(payload)
+        _instrument(request, 'after_serialize')
 
-        payload = xmlrpc_client.dumps(tuple(largs),
-                                      methodname=method,
-                                      allow_none=True)
-        session = requests.Session()
+        if session is None:
+            session = requests.Session()
         req = requests.Request('POST', uri, data=payload,
                                headers=http_headers).prepare()
         LOGGER.debug("=== REQUEST ===")
@@ -52,53 +473,75 @@ def make_xml_rpc_api_call(uri, method, args=None, headers=None,
         LOGGER.debug(req.headers)
         LOGGER.debug(payload)
 
+        start = time.time()
+        if stream:
+            response = session.send(req,
+                                    timeout=timeout,
+                                    proxies=_proxies_dict(proxy),
+                                    stream=True)
+            _record_response(request, response, start, stream)
+            LOGGER.debug("=== RESPONSE (streamed) ===")
+            LOGGER.debug(response.headers)
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            return _stream_xml_rpc_response(response)
+
         response = session.send(req,
                                 timeout=timeout,
                                 proxies=_proxies_dict(proxy))
+        _record_response(request, response, start, stream)
         LOGGER.debug("=== RESPONSE ===")
         LOGGER.debug(response.headers)
         LOGGER.debug(response.content)
         response.raise_for_status()
-        result = xmlrpc_client.loads(response.content,)[0][0]
+
+        start = time.time()
+        result = parse_xml_rpc_response(response.content)
+        request.parse_time = time.time() - start
+        _instrument(request, 'after_parse')
         return result
     except xmlrpc_client.Fault as ex:
-        # These exceptions are formed from the XML-RPC spec
-        # http://xmlrpc-epi.sourceforge.net/specs/rfc.fault_codes.php
-        error_mapping = {
-            '-32700': NotWellFormed,
-            '-32701': UnsupportedEncoding,
-            '-32702': InvalidCharacter,
-            '-32600': SpecViolation,
-            '-32601': MethodNotFound,
-            '-32602': InvalidMethodParameters,
-            '-32603': InternalError,
-            '-32500': ApplicationError,
-            '-32400': RemoteSystemError,
-            '-32300': TransportError,
-        }
-        raise error_mapping.get(ex.faultCode, SoftLayerAPIError)(
-            ex.faultCode, ex.faultString)
+        raise _fault_to_exception(ex)
     except requests.HTTPError as ex:
         raise TransportError(ex.response.status_code, str(ex))
+    except requests.Timeout as ex:
+        raise TransportTimeout(0, str(ex))
     except requests.RequestException as ex:
         raise TransportError(0, str(ex))
 
 
+def _record_response(request, response, start, stream):
+    """ Records the network time, time to first byte and size of a response
+        on the request. The size is unknown for streamed responses, whose
+        body hasn't been read yet. """
+    request.network_time = time.time() - start
+    request.ttfb = response.elapsed.total_seconds()
+    if not stream:
+        request.response_bytes = len(response.content)
+    _instrument(request, 'after_response')
+
+
 def make_rest_api_call(method, url,
-                       http_headers=None, timeout=None, proxy=None):
+                       http_headers=None, timeout=None, proxy=None,
+                       session=None):
     """ Makes a SoftLayer API call against the REST endpoint
 
     :param string method: HTTP method: GET, POST, PUT, DELETE
     :param string url: endpoint URL
     :param dict http_headers: HTTP headers to use for the request
     :param int timeout: number of seconds to use as a timeout
+    :param session: an optional requests session to send the request with
     """
     LOGGER.info('%s %s', method, url)
     try:
-        resp = requests.request(method, url,
-                                headers=http_headers,
-                                timeout=timeout,
-                                proxies=_proxies_dict(proxy))
+        request = requests.request
+        if session is not None:
+            request = session.request
+        resp = request(method, url,
+                       headers=http_headers,
+                       timeout=timeout,
+                       proxies=_proxies_dict(proxy))
         resp.raise_for_status()
         LOGGER.debug(resp.content)
         if url.endswith('.json'):
@@ -111,5 +554,205 @@ def make_rest_api_call(method, url,
             raise SoftLayerAPIError(ex.response.status_code, content['error'])
         else:
             raise SoftLayerAPIError(ex.response.status_code, ex.response.text)
+    except requests.Timeout as ex:
+        raise TransportTimeout(0, str(ex))
     except requests.RequestException as ex:
         raise TransportError(0, str(ex))
+
+
+class Request(object):
+    """ Describes a single API call independently of how it is transported.
+        Built by :class:`SoftLayer.API.Client` and handed to a transport.
+    """
+    def __init__(self):
+        #: The full service name. E.G. SoftLayer_Account
+        self.service = None
+        #: The method to call. E.G. getObject
+        self.method = None
+        #: Positional arguments of the remote call
+        self.args = tuple()
+        #: The init parameter (id) of the object to call the method on
+        self.identifier = None
+        #: A string or dict object mask
+        self.mask = None
+        #: An object filter dict
+        self.filter = None
+        #: Result limit and offset
+        self.limit = None
+        self.offset = None
+        #: Extra API headers, including authentication
+        self.headers = {}
+        #: HTTP headers
+        self.transport_headers = {}
+        #: Whether to return a generator over the results
+        self.stream = False
+
+        #: Instrumentation hooks called while the request is made. See
+        #: :class:`SoftLayer.instrumentation.Instrumentation`
+        self.instrumentation = None
+        #: The :class:`SoftLayer.deadline.Deadline` of the call
+        self.deadline = None
+        #: Seconds spent encoding the request, sending it and receiving the
+        #: response, until the first byte of the response and decoding it
+        self.serialize_time = None
+        self.network_time = None
+        self.ttfb = None
+        self.parse_time = None
+        #: Size of the encoded request and response
+        self.request_bytes = None
+        self.response_bytes = None
+        #: Number of times the call was retried
+        self.retries = 0
+        #: Whether the response may come from, and go in, the client's cache
+        self.cache = True
+        #: Whether the result came from a cache
+        self.cache_hit = False
+        #: Seconds the whole call took
+        self.elapsed = None
+
+        #: Connection settings from the client
+        self.endpoint_url = None
+        self.timeout = None
+        self.proxy = None
+        self.session = None
+
+    def __repr__(self):
+        return "<Request: %s::%s(id=%r)>" % (self.service, self.method,
+                                             self.identifier)
+
+
+class XmlRpcTransport(object):
+    """ Makes API calls against the XML-RPC endpoint. This is the default
+        transport. """
+    default_endpoint_url = API_PUBLIC_ENDPOINT
+
+    def __call__(self, request):
+        """ Makes the API call described by a :class:`Request` """
+        headers = dict(request.headers)
+
+        if request.identifier is not None:
+            headers[request.service + 'InitParameters'] = {
+                'id': request.identifier}
+
+        if request.mask is not None:
+            if isinstance(request.mask, dict):
+                mheader = '%sObjectMask' % request.service
+            else:
+                mheader = 'SoftLayer_ObjectMask'
+            headers[mheader] = {'mask': request.mask}
+
+        if request.filter is not None:
+            headers['%sObjectFilter' % request.service] = request.filter
+
+        if request.limit:
+            headers['resultLimit'] = {
+                'limit': request.limit,
+                'offset': request.offset or 0,
+            }
+
+        http_headers = {'Content-Type': 'application/xml'}
+        http_headers.update(request.transport_headers)
+
+        uri = '/'.join([request.endpoint_url, request.service])
+        return make_xml_rpc_api_call(uri, request.method, request.args,
+                                     headers=headers,
+                                     http_headers=http_headers,
+                                     timeout=request.timeout,
+                                     proxy=request.proxy,
+                                     session=request.session,
+                                     stream=request.stream,
+                                     request=request)
+
+    def __repr__(self):
+        return "<XmlRpcTransport>"
+
+
+class RestTransport(object):
+    """ Makes API calls against the REST endpoint, which speaks JSON. JSON is
+        considerably cheaper to encode and decode than XML-RPC and results
+        are the same Python structures.
+
+        Calls without arguments are sent as GET requests. Calls with
+        arguments are POSTed with the arguments as JSON. Only username and
+        API key authentication is supported.
+    """
+    default_endpoint_url = API_PUBLIC_ENDPOINT_REST
+
+    def __call__(self, request):
+        """ Makes the API call described by a :class:`Request` """
+        url_parts = [request.endpoint_url, request.service]
+        if request.identifier is not None:
+            url_parts.append(str(request.identifier))
+        url = '%s/%s.json' % ('/'.join(url_parts), request.method)
+
+        start = time.time()
+        params = {}
+        if request.mask is not None:
+            params['objectMask'] = format_mask(request.mask)
+
+        if request.filter is not None:
+            params['objectFilter'] = json.dumps(request.filter)
+
+        if request.limit:
+            params['resultLimit'] = '%d,%d' % (request.offset or 0,
+                                               request.limit)
+
+        auth = None
+        credentials = request.headers.get('authenticate') or {}
+        if 'username' in credentials and 'apiKey' in credentials:
+            auth = (credentials['username'], credentials['apiKey'])
+
+        http_method = 'GET'
+        body = None
+        if request.args:
+            http_method = 'POST'
+            body = json.dumps({'parameters': list(request.args)})
+        request.serialize_time = time.time() - start
+        request.request_bytes = len(body or '')
+        _instrument(request, 'after_serialize')
+
+        session = request.session or requests.Session()
+        LOGGER.info('%s %s', http_method, url)
+        LOGGER.debug(params)
+        LOGGER.debug(body)
+        try:
+            start = time.time()
+            resp = session.request(http_method, url,
+                                   params=params,
+                                   data=body,
+                                   auth=auth,
+                                   headers=request.transport_headers,
+                                   timeout=request.timeout,
+                                   proxies=_proxies_dict(request.proxy))
+            _record_response(request, resp, start, False)
+            LOGGER.debug(resp.content)
+            resp.raise_for_status()
+
+            start = time.time()
+            result = json.loads(resp.text)
+            request.parse_time = time.time() - start
+            _instrument(request, 'after_parse')
+        except requests.HTTPError as ex:
+            try:
+                content = json.loads(ex.response.text)
+            except ValueError:
+                raise TransportError(ex.response.status_code, str(ex))
+            raise SoftLayerAPIError(content.get('code'), content.get('error'))
+        except requests.Timeout as ex:
+            raise TransportTimeout(0, str(ex))
+        except requests.RequestException as ex:
+            raise TransportError(0, str(ex))
+
+        if request.stream:
+            # JSON isn't parsed incrementally, but keep the same interface
+            return iter(result if isinstance(result, list) else [result])
+        return result
+
+    def __repr__(self):
+        return "<RestTransport>"
+
+
+TRANSPORTS = {
+    'xmlrpc': XmlRpcTransport,
+    'rest': RestTransport,
+}
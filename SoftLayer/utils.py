@@ -5,9 +5,14 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import random
 import re
+import time
+
 import six
 
+from SoftLayer.cache import freeze
+
 UUID_RE = re.compile(r'^[0-9a-f\-]{36}$', re.I)
 KNOWN_OPERATIONS = ['<=', '>=', '<', '>', '~', '!~', '*=', '^=', '$=', '_=']
 
@@ -105,6 +110,250 @@ def query_filter(query):
     return {'operation': query}
 
 
+DATE_FORMAT = '%m/%d/%Y %H:%M:%S'
+
+
+def _format_date(value):
+    """ Formats a date or datetime the way object filters expect it """
+    if hasattr(value, 'strftime'):
+        return value.strftime(DATE_FORMAT)
+    return value
+
+
+def _copy(value):
+    """ Copies nested dicts and lists """
+    if isinstance(value, dict):
+        return dict((key, _copy(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class Filter(object):
+    """ An immutable object filter. Conditions are added with the builder
+        methods, each of which returns a new filter, so filters can be kept
+        in constants and extended for each call. The conditions of a filter
+        must all match (and). A condition on a property replaces any earlier
+        condition on the same property.
+
+        The dict form is compiled once per filter. Filters can be compared,
+        hashed and passed as ``filter`` to any API call.
+
+    :param base: an optional dict filter or :class:`Filter` to start from
+
+    Usage:
+
+        >>> from SoftLayer.utils import Filter
+        >>> guests = Filter().where('virtualGuests.hostname', 'web*')
+        >>> guests.where_in('virtualGuests.id', [1, 2, 3]).to_dict()
+        {'virtualGuests': {'hostname': {'operation': '^= web'},
+                           'id': {'operation': 'in', 'options': [
+                               {'name': 'data', 'value': [1, 2, 3]}]}}}
+
+    """
+
+    def __init__(self, base=None):
+        # Conditions keyed by the property path, as tuples
+        self._conditions = {}
+        self._order = ()
+        self._compiled = None
+        self._key = None
+        if isinstance(base, Filter):
+            self._conditions.update(base._conditions)
+            self._order = base._order
+        elif base:
+            self._load(base, ())
+
+    def _load(self, value, path):
+        """ Adds the conditions of a dict filter """
+        for name, item in value.items():
+            if isinstance(item, dict) and 'operation' not in item:
+                self._load(item, path + (name,))
+            else:
+                self._conditions[path + (name,)] = _copy(item)
+
+    @staticmethod
+    def _path(path):
+        """ Converts a dotted property path into a tuple """
+        if isinstance(path, string_types):
+            return tuple(path.split('.'))
+        return tuple(path)
+
+    def _with(self, path, condition):
+        """ Returns a copy of the filter with the condition added """
+        result = Filter(self)
+        result._conditions[self._path(path)] = condition
+        return result
+
+    def where(self, path, value):
+        """ Returns a filter that also requires the property to match the
+            value, as :func:`query_filter` understands it. A dict value is
+            used as the condition as it is.
+
+        :param string path: a dotted property path.
+                            E.G.: 'virtualGuests.datacenter.name'
+        :param value: the value or query. E.G.: 'dal05', '*web*', '> 4'
+        """
+        if not isinstance(value, dict):
+            value = query_filter(value)
+        return self._with(path, _copy(value))
+
+    def where_in(self, path, values):
+        """ Returns a filter that also requires the property to be one of
+            the values. A single condition is sent for the whole set,
+            however large; duplicates are removed.
+
+        :param string path: a dotted property path. E.G.: 'virtualGuests.id'
+        :param values: the values to match
+        """
+        unique = []
+        seen = set()
+        for value in values:
+            if value not in seen:
+                seen.add(value)
+                unique.append(value)
+        return self._with(path, {'operation': 'in', 'options': [
+            {'name': 'data', 'value': unique}]})
+
+    def where_not(self, path, value):
+        """ Returns a filter that also requires the property to differ from
+            the value
+
+        :param string path: a dotted property path
+        :param value: the value the property must not have
+        """
+        return self._with(path, {'operation': '!= %s' % value})
+
+    def between(self, path, start, end):
+        """ Returns a filter that also requires the date property to be
+            between two dates
+
+        :param string path: a dotted property path.
+                            E.G.: 'tickets.createDate'
+        :param start: a datetime, or a string like '03/01/2013 0:0:0'
+        :param end: a datetime, or a string like '03/15/2013 23:59:59'
+        """
+        return self._with(path, {'operation': 'betweenDate', 'options': [
+            {'name': 'startDate', 'value': [_format_date(start)]},
+            {'name': 'endDate', 'value': [_format_date(end)]}]})
+
+    def after(self, path, date):
+        """ Returns a filter that also requires the date property to be
+            after the date
+
+        :param string path: a dotted property path
+        :param date: a datetime, or a string like '03/01/2013 0:0:0'
+        """
+        return self._with(path, {'operation': 'greaterThanDate', 'options': [
+            {'name': 'date', 'value': [_format_date(date)]}]})
+
+    def before(self, path, date):
+        """ Returns a filter that also requires the date property to be
+            before the date
+
+        :param string path: a dotted property path
+        :param date: a datetime, or a string like '03/01/2013 0:0:0'
+        """
+        return self._with(path, {'operation': 'lessThanDate', 'options': [
+            {'name': 'date', 'value': [_format_date(date)]}]})
+
+    def get(self, path):
+        """ Returns the condition on the property, or None when there isn't
+            one
+
+        :param string path: a dotted property path
+        """
+        return _copy(self._conditions.get(self._path(path)))
+
+    def order_by(self, path, direction='ASC'):
+        """ Returns a filter that also sorts the results by the property.
+            Properties given in later calls break ties of earlier ones.
+
+        :param string path: a dotted property path. E.G.: 'virtualGuests.id'
+        :param string direction: 'ASC' or 'DESC'
+        """
+        result = Filter(self)
+        path = self._path(path)
+        result._order = tuple(
+            (p, d) for p, d in self._order if p != path) + ((path, direction),)
+        return result
+
+    def merge(self, other):
+        """ Returns a filter with the conditions of both filters. The other
+            filter's conditions win when both have one for a property.
+
+        :param other: a dict filter or :class:`Filter`
+        """
+        result = Filter(self)
+        other = Filter(other)
+        result._conditions.update(other._conditions)
+        if other._order:
+            paths = set(path for path, _ in other._order)
+            result._order = tuple((p, d) for p, d in self._order
+                                  if p not in paths) + other._order
+        return result
+
+    __and__ = merge
+
+    def _compile(self):
+        """ Builds the dict form of the filter """
+        compiled = {}
+        for path, condition in self._conditions.items():
+            node = compiled
+            for name in path[:-1]:
+                node = node.setdefault(name, {})
+            node[path[-1]] = _copy(condition)
+
+        for position, (path, direction) in enumerate(self._order):
+            node = compiled
+            for name in path[:-1]:
+                node = node.setdefault(name, {})
+            condition = node.setdefault(path[-1], {'operation': 'orderBy'})
+            options = condition.setdefault('options', [])
+            options.append({'name': 'sort', 'value': [direction]})
+            if len(self._order) > 1:
+                options.append({'name': 'sortOrder', 'value': [position + 1]})
+        return compiled
+
+    def to_dict(self):
+        """ Returns the filter as a dict, ready to be sent to the API """
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return _copy(self._compiled)
+
+    def _get_key(self):
+        """ Returns a hashable form of the filter """
+        if self._key is None:
+            self._key = (frozenset((path, freeze(condition)) for path,
+                                   condition in self._conditions.items()),
+                         self._order)
+        return self._key
+
+    def __eq__(self, other):
+        if isinstance(other, Filter):
+            return self._get_key() == other._get_key()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash(self._get_key())
+
+    def __bool__(self):
+        return bool(self._conditions or self._order)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "Filter(%r)" % (self.to_dict(),)
+
+
 class IdentifierMixin(object):
     """ This mixin provides an interface to provide multiple methods for
         converting an 'indentifier' to an id """
@@ -146,3 +395,135 @@ def resolve_ids(identifier, resolvers):
             return ids
 
     return []
+
+
+def is_ready(instance, pending=False):
+    """ Returns True if a CCI or server has finished provisioning and isn't
+        currently reloading the OS. With pending=True, it must not have any
+        active transaction either.
+
+    :param dict instance: the CCI or server, with its provisionDate,
+                          activeTransaction and lastOperatingSystemReload
+    :param bool pending: whether any active transaction counts as not ready
+    """
+    last_reload = lookup(instance, 'lastOperatingSystemReload', 'id')
+    active_transaction = lookup(instance, 'activeTransaction', 'id')
+
+    reloading = all((
+        active_transaction,
+        last_reload,
+        last_reload == active_transaction
+    ))
+
+    # only check for outstanding transactions if requested
+    outstanding = False
+    if pending:
+        outstanding = active_transaction
+
+    return bool(instance.get('provisionDate')
+                and not reloading and not outstanding)
+
+
+class Poller(object):
+    """ Schedules the checks of something that is being waited for, like an
+        instance being provisioned. Checks are made often at first, in an
+        optional fast phase, and then further and further apart, up to
+        ``max_interval``, until ``timeout`` seconds have passed. A little
+        jitter keeps many waiters from checking in lockstep. The last check
+        is made right at the timeout.
+
+        Iterating over a poller yields the number of each check, waiting
+        between checks, and stops when the time is up.
+
+    :param float timeout: (optional) seconds to keep checking for. Without
+                          one, checks go on until the deadline expires.
+    :param float interval: seconds between the first checks after the fast
+                           phase
+    :param float max_interval: the longest time between two checks. It is
+                               never less than ``interval``.
+    :param float backoff: how much longer each wait is than the one before
+    :param float jitter: up to this fraction of each wait is added or taken
+                         away at random
+    :param float fast_period: seconds to check every ``fast_interval`` for
+                              at first
+    :param float fast_interval: seconds between checks in the fast phase
+    :param deadline: (optional) a :class:`SoftLayer.deadline.Deadline`. No
+                     checks are made once it expires or is cancelled.
+
+    Usage:
+
+        >>> from SoftLayer.utils import Poller
+        >>> poller = Poller(timeout=600, interval=5, max_interval=60,
+        ...                 fast_period=30, fast_interval=1)
+        >>> poller.poll(lambda: guest_is_ready(guest_id))
+        True
+
+    """
+
+    def __init__(self, timeout=None, interval=1.0, max_interval=30.0,
+                 backoff=1.5, jitter=0.1, fast_period=0.0, fast_interval=1.0,
+                 deadline=None):
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.fast_period = fast_period
+        self.fast_interval = fast_interval
+        self.deadline = deadline
+
+    def get_interval(self, elapsed, check):
+        """ Returns the number of seconds to wait before the next check
+
+        :param float elapsed: seconds since the first check
+        :param int check: the number of checks after the fast phase so far
+        """
+        if elapsed < self.fast_period:
+            interval = self.fast_interval
+        else:
+            interval = min(self.max_interval,
+                           self.interval * self.backoff ** max(0, check - 1))
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return min(self.max_interval, interval)
+
+    def __iter__(self):
+        start = time.time()
+        check = 0
+        slow_checks = 0
+        while True:
+            if self.deadline is not None and self.deadline.expired:
+                return
+            check += 1
+            yield check
+
+            elapsed = time.time() - start
+            if elapsed >= self.fast_period:
+                slow_checks += 1
+            wait = self.get_interval(elapsed, slow_checks)
+            if self.timeout is not None:
+                if elapsed >= self.timeout:
+                    return
+                wait = min(wait, self.timeout - elapsed)
+
+            if self.deadline is None:
+                time.sleep(wait)
+            elif not self.deadline.sleep(wait):
+                return
+
+    def poll(self, check):
+        """ Calls check until it returns a true value, which is returned.
+            Returns the last value it returned when the time is up.
+
+        :param check: a callable without arguments
+        """
+        result = None
+        for _ in self:
+            result = check()
+            if result:
+                break
+        return result
+
+    def __repr__(self):
+        return "<Poller: timeout=%r, interval=%r, max_interval=%r>" \
+            % (self.timeout, self.interval, self.max_interval)
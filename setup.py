@@ -3,6 +3,7 @@ import os
 
 try:
     from setuptools import setup
+    from setuptools.command.build_py import build_py
 except ImportError:
     print("Distribute is required for install:")
     print("    http://python-distribute.org/distribute_setup.py")
@@ -24,6 +25,22 @@ requires = [
 
 if sys.version_info < (2, 7):
     requires.append('importlib')
+    requires.append('ordereddict')
+
+if sys.version_info < (3, 2):
+    requires.append('futures')
+
+
+class BuildPy(build_py):
+    """ Leaves out the asyncio client, which needs Python 3.6+ """
+
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info < (3, 6):
+            modules = [(pkg, module, path) for pkg, module, path in modules
+                       if (pkg, module) != ('SoftLayer', 'aio')]
+        return modules
+
 
 description = "A library for SoftLayer's API"
 
@@ -58,9 +75,10 @@ setup(
         ],
     },
     package_data={
-        'SoftLayer': ['tests/fixtures/*.conf'],
+        'SoftLayer': ['tests/fixtures/*.conf', 'tests/fixtures/*.csv'],
     },
     test_suite='nose.collector',
+    cmdclass={'build_py': BuildPy},
     install_requires=requires,
     classifiers=[
         'Environment :: Console',
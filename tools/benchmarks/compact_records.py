@@ -0,0 +1,51 @@
+"""
+    Compact records benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Compares the memory taken by a large getVirtualGuests result kept as
+    dictionaries and as compact records. Requires Python 3.4+ (tracemalloc).
+
+    Usage: python tools/benchmarks/compact_records.py [records]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import gc
+import sys
+import tracemalloc
+
+from SoftLayer.records import compact
+from SoftLayer.tests.fixtures import Account
+from SoftLayer.transports import parse_xml_rpc_response
+
+from response_decoding import make_response
+
+
+def measure(build):
+    """ Returns the result of build() and the bytes it holds on to """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(records=50000):
+    """ Runs the benchmark and prints the results """
+    payload = make_response(Account.getVirtualGuests, records)
+
+    rows, dicts_size = measure(lambda: parse_xml_rpc_response(payload))
+    rows, compact_size = measure(lambda: compact(parse_xml_rpc_response(
+        payload)))
+    assert rows == parse_xml_rpc_response(payload)
+
+    print('%-10s %8s %12s %12s' % ('result', 'records', 'MiB', 'bytes/row'))
+    for name, size in [('dicts', dicts_size), ('compact', compact_size)]:
+        print('%-10s %8d %12.1f %12.0f'
+              % (name, records, size / 1024.0 / 1024, size / records))
+    print('compact records take %.0f%% less memory'
+          % (100 - 100.0 * compact_size / dicts_size))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,56 @@
+"""
+    Connection reuse benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Compares per-call latency of a new HTTP session per call against the
+    client's pooled session, using a local stand-in XML-RPC server.
+
+    Usage: python tools/benchmarks/connection_reuse.py [calls]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import sys
+import time
+
+import SoftLayer
+from SoftLayer.transports import make_xml_rpc_api_call
+from standin import StandInServer
+
+
+def per_call_latency(func, calls):
+    """ Runs func `calls` times and returns the mean latency in ms """
+    start = time.time()
+    for _ in range(calls):
+        func()
+    return (time.time() - start) / calls * 1000
+
+
+def main(calls=500):
+    """ Runs the benchmark and prints the results """
+    with StandInServer() as server:
+        client = SoftLayer.Client(username='bench', api_key='bench',
+                                  endpoint_url=server.endpoint_url)
+        uri = server.endpoint_url + 'SoftLayer_Account'
+
+        def fresh_session():
+            " One session per call, as before pooling "
+            make_xml_rpc_api_call(uri, 'getObject', headers={})
+
+        def pooled_session():
+            " The client's long-lived session "
+            client['Account'].getObject()
+
+        # Warm up both paths so the first connection isn't counted
+        fresh_session()
+        pooled_session()
+
+        fresh = per_call_latency(fresh_session, calls)
+        pooled = per_call_latency(pooled_session, calls)
+
+    print('calls per run:       %d' % calls)
+    print('new session / call:  %.3f ms' % fresh)
+    print('pooled session:      %.3f ms' % pooled)
+    print('speedup:             %.2fx' % (fresh / pooled))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
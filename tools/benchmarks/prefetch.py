@@ -0,0 +1,41 @@
+"""
+    Page prefetching benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Measures the wall-clock time of paging through a large listing with
+    Client.iter_call, sequentially and with several pages in flight, against
+    a local stand-in XML-RPC server that adds latency to every call.
+
+    Usage: python tools/benchmarks/prefetch.py [records] [latency_ms]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import sys
+import time
+
+import SoftLayer
+from standin import StandInServer, make_records, paginated
+
+
+def main(records=5000, latency_ms=50):
+    """ Runs the benchmark and prints the results """
+    responder = paginated(make_records(records))
+    with StandInServer(responder, latency=latency_ms / 1000.0) as server:
+        client = SoftLayer.Client(username='bench', api_key='bench',
+                                  endpoint_url=server.endpoint_url)
+        print('%d records, chunk=100, %dms latency per call'
+              % (records, latency_ms))
+
+        baseline = None
+        for prefetch in (None, 2, 4, 8):
+            start = time.time()
+            count = sum(1 for _ in client.iter_call(
+                'Account', 'getVirtualGuests', prefetch=prefetch))
+            elapsed = time.time() - start
+            baseline = baseline or elapsed
+            assert count == records
+            print('prefetch=%-5s %7.3fs  %5.2fx'
+                  % (prefetch, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+"""
+    Request encoding benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Measures how many XML-RPC requests per second xmlrpc_client.dumps and
+    the caching XmlRpcEncoder encode for small, typical calls.
+
+    Usage: python tools/benchmarks/request_encoding.py [number] [repeat]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import sys
+import timeit
+
+from SoftLayer.managers.cci import DEFAULT_INSTANCE_MASK
+from SoftLayer.transports import XmlRpcEncoder
+from SoftLayer.utils import xmlrpc_client
+
+
+def calls():
+    """ Returns (name, method, args, headers) for each benchmarked call """
+    auth = {'authenticate': {'username': 'SL123456',
+                             'apiKey': 'a' * 64}}
+    get_object = dict(auth)
+    get_object['SoftLayer_Virtual_GuestInitParameters'] = {'id': 1234}
+    get_object['SoftLayer_ObjectMask'] = {
+        'mask': str(DEFAULT_INSTANCE_MASK)}
+
+    mask_only = dict(auth)
+    mask_only['SoftLayer_ObjectMask'] = {
+        'mask': 'mask[id,hostname,domain,datacenter.name]'}
+    mask_only['resultLimit'] = {'limit': 100, 'offset': 0}
+
+    set_tags = dict(auth)
+    set_tags['SoftLayer_Virtual_GuestInitParameters'] = {'id': 1234}
+
+    return [
+        ('getObject by id', 'getObject', (), get_object),
+        ('paged list', 'getVirtualGuests', (), mask_only),
+        ('setTags', 'setTags', ('web,db',), set_tags),
+    ]
+
+
+def stdlib_dumps(method, args, headers):
+    """ Encodes a request like make_xml_rpc_api_call used to """
+    params = [{'headers': headers}]
+    params.extend(args)
+    return xmlrpc_client.dumps(tuple(params), methodname=method,
+                               allow_none=True)
+
+
+def main(number=20000, repeat=5):
+    """ Runs the benchmark and prints the results """
+    encoder = XmlRpcEncoder()
+    print('%-20s %-10s %12s' % ('call', 'encoder', 'calls/sec'))
+    for name, method, args, headers in calls():
+        assert encoder.dumps(method, args, headers) \
+            == stdlib_dumps(method, args, headers)
+        for label, dumps in [('stdlib', stdlib_dumps),
+                             ('cached', encoder.dumps)]:
+            best = min(timeit.repeat(
+                lambda: dumps(method, args, headers),
+                number=number, repeat=repeat))
+            print('%-20s %-10s %12.0f' % (name, label, number / best))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
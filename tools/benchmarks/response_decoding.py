@@ -0,0 +1,68 @@
+"""
+    Response decoding benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Compares the time xmlrpc_client.loads and parse_xml_rpc_response take to
+    decode synthetic getVirtualGuests and getHardware responses of 10,000
+    and 100,000 records built from the test fixtures.
+
+    Usage: python tools/benchmarks/response_decoding.py [repeat] [records...]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import copy
+import sys
+import timeit
+
+from SoftLayer.tests.fixtures import Account
+from SoftLayer.transports import parse_xml_rpc_response
+from SoftLayer.utils import xmlrpc_client
+
+FIXTURES = [
+    ('Account.getVirtualGuests', Account.getVirtualGuests),
+    ('Account.getHardware', Account.getHardware),
+]
+
+
+def make_response(fixture, records):
+    """ Returns an encoded response of the given number of records, each a
+        copy of a fixture record with a unique id and hostname """
+    result = []
+    for i in range(records):
+        record = copy.deepcopy(fixture[i % len(fixture)])
+        record['id'] = i
+        record['hostname'] = 'host%d' % i
+        result.append(record)
+    return xmlrpc_client.dumps((result,), methodresponse=True,
+                               allow_none=True).encode('utf-8')
+
+
+def decoders():
+    """ Returns (name, decode) for each decoder """
+    return [
+        ('xmlrpc_client.loads',
+         lambda payload: xmlrpc_client.loads(payload)[0][0]),
+        ('parse_xml_rpc_response',
+         lambda payload: parse_xml_rpc_response(payload, intern_keys=False)),
+        ('  with interned keys', parse_xml_rpc_response),
+    ]
+
+
+def main(repeat=3, *records):
+    """ Runs the benchmark and prints the results """
+    print('%-26s %8s %-24s %10s %12s'
+          % ('fixture', 'records', 'decoder', 'ms', 'records/sec'))
+    for name, fixture in FIXTURES:
+        for count in records or (10000, 100000):
+            payload = make_response(fixture, count)
+            expected = xmlrpc_client.loads(payload)[0][0]
+            for decoder, decode in decoders():
+                assert decode(payload) == expected
+                seconds = min(timeit.repeat(
+                    lambda: decode(payload), number=1, repeat=repeat))
+                print('%-26s %8d %-24s %10.1f %12.0f'
+                      % (name, count, decoder, seconds * 1000,
+                         count / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
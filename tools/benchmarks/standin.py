@@ -0,0 +1,134 @@
+"""
+    Stand-in SoftLayer XML-RPC server for benchmarks
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Serves SoftLayer-style XML-RPC calls from a local thread so the
+    benchmarks in this directory can measure client-side behavior without
+    touching the real API.
+
+    :license: MIT, see LICENSE for more details.
+"""
+import multiprocessing
+import threading
+import time
+
+from six.moves import socketserver
+from six.moves.xmlrpc_server import (  # pylint: disable=F0401
+    SimpleXMLRPCServer, SimpleXMLRPCRequestHandler)
+
+
+def make_records(count, start=0):
+    """ Builds a list of guest-like records to serve
+
+    :param int count: number of records
+    :param int start: id of the first record
+    """
+    return [{
+        'id': i,
+        'hostname': 'host%d' % i,
+        'domain': 'example.com',
+        'fullyQualifiedDomainName': 'host%d.example.com' % i,
+        'primaryIpAddress': '10.0.%d.%d' % (i // 256 % 256, i % 256),
+        'maxCpu': 2,
+        'maxMemory': 2048,
+        'datacenter': {'id': 3, 'name': 'dal05'},
+        'status': {'keyName': 'ACTIVE', 'name': 'Active'},
+    } for i in range(start, start + count)]
+
+
+def paginated(records):
+    """ Returns a responder that pages through records using the resultLimit
+        header, the way list methods on the real API do.
+    """
+    def responder(_service, _method, headers, _args):
+        " Returns one page of records "
+        limit = headers.get('resultLimit')
+        if not limit:
+            return records
+        offset = limit.get('offset', 0)
+        return records[offset:offset + limit['limit']]
+    return responder
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    """ Dispatches every call to the server's responder and keeps the
+        connection open between requests. """
+    protocol_version = 'HTTP/1.1'
+    rpc_paths = ()
+
+    def _dispatch(self, method, params):
+        " Hands the call to the responder along with the service name "
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        headers = (params[0] if params else {}).get('headers') or {}
+        service = self.path.strip('/').split('/')[-1]
+        return self.server.responder(service, method, headers, params[1:])
+
+    def log_message(self, *_):
+        " Keep benchmark output quiet "
+
+
+class StandInServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    """ A threaded XML-RPC server bound to an ephemeral local port
+
+    :param responder: callable taking (service, method, headers, args)
+    :param float latency: seconds to sleep before answering each call
+    """
+    daemon_threads = True
+
+    def __init__(self, responder=None, latency=0.0):
+        SimpleXMLRPCServer.__init__(self, ('127.0.0.1', 0),
+                                    requestHandler=_RequestHandler,
+                                    logRequests=False, allow_none=True)
+        self.responder = responder or (lambda *_: {'id': 1})
+        self.latency = latency
+        self.thread = None
+
+    @property
+    def endpoint_url(self):
+        """ The base URL to hand to SoftLayer.Client """
+        return 'http://%s:%d/' % self.server_address
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve(queue, responder, latency):
+    """ Child process entry point for StandInProcess """
+    server = StandInServer(responder, latency)
+    queue.put(server.endpoint_url)
+    server.serve_forever()
+
+
+class StandInProcess(object):
+    """ Runs a StandInServer in a child process, so that the server's own
+        memory and CPU use stay out of the benchmark's measurements.
+
+    :param responder: callable taking (service, method, headers, args)
+    :param float latency: seconds to sleep before answering each call
+    """
+
+    def __init__(self, responder=None, latency=0.0):
+        self.responder = responder
+        self.latency = latency
+        self.process = None
+        self.endpoint_url = None
+
+    def __enter__(self):
+        queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_serve, args=(queue, self.responder, self.latency))
+        self.process.daemon = True
+        self.process.start()
+        self.endpoint_url = queue.get()
+        return self
+
+    def __exit__(self, *_):
+        self.process.terminate()
+        self.process.join()
@@ -0,0 +1,51 @@
+"""
+    Streaming response benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Compares peak Python memory and time of consuming a large listing with
+    a regular call and with stream=True, against a local stand-in XML-RPC
+    server. Requires Python 3.4+ for tracemalloc.
+
+    Usage: python tools/benchmarks/streaming.py [records]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import sys
+import time
+import tracemalloc
+
+import SoftLayer
+from standin import StandInProcess, make_records
+
+
+def measure(func):
+    """ Returns (seconds, peak MiB) for consuming func()'s results """
+    tracemalloc.start()
+    start = time.time()
+    count = 0
+    for _ in func():
+        count += 1
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main(records=20000):
+    """ Runs the benchmark and prints the results """
+    data = make_records(records)
+    with StandInProcess(lambda *_: data) as server:
+        client = SoftLayer.Client(username='bench', api_key='bench',
+                                  endpoint_url=server.endpoint_url)
+        account = client['Account']
+
+        for name, func in (
+                ('full response', account.getVirtualGuests),
+                ('stream=True', lambda: account.getVirtualGuests(
+                    stream=True))):
+            count, elapsed, peak = measure(func)
+            assert count == records
+            print('%-14s %7.3fs  peak %7.2f MiB' % (name, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,64 @@
+"""
+    Transport codec benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Compares encode time, decode time and payload size of the XML-RPC and
+    JSON (REST) wire formats for responses taken from the test fixtures.
+    List fixtures are repeated to reach a realistic response size.
+
+    Usage: python tools/benchmarks/transport_codecs.py [records] [repeat]
+
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+import sys
+import timeit
+
+from SoftLayer.tests.fixtures import Account, Hardware_Server, \
+    Product_Package, Virtual_Guest
+from SoftLayer.utils import xmlrpc_client
+
+FIXTURES = [
+    ('Account.getVirtualGuests', Account.getVirtualGuests),
+    ('Account.getHardware', Account.getHardware),
+    ('Account.getTickets', Account.getTickets),
+    ('Product_Package.getCategories', Product_Package.getCategories),
+    ('Virtual_Guest.getObject', Virtual_Guest.getObject),
+    ('Hardware_Server.getObject', Hardware_Server.getObject),
+]
+
+
+def codecs():
+    """ Returns (name, encode, decode) for each wire format """
+    return [
+        ('xmlrpc',
+         lambda result: xmlrpc_client.dumps((result,), methodresponse=True,
+                                            allow_none=True).encode('utf-8'),
+         lambda payload: xmlrpc_client.loads(payload)[0][0]),
+        ('json',
+         lambda result: json.dumps(result).encode('utf-8'),
+         lambda payload: json.loads(payload.decode('utf-8'))),
+    ]
+
+
+def main(records=1000, repeat=5):
+    """ Runs the benchmark and prints the results """
+    print('%-30s %-7s %10s %10s %10s'
+          % ('fixture', 'codec', 'encode ms', 'decode ms', 'bytes'))
+    for name, fixture in FIXTURES:
+        result = fixture
+        if isinstance(fixture, list):
+            result = (fixture * (records // len(fixture) + 1))[:records]
+
+        for codec, encode, decode in codecs():
+            payload = encode(result)
+            assert decode(payload) == json.loads(json.dumps(result))
+            encode_ms = min(timeit.repeat(
+                lambda: encode(result), number=1, repeat=repeat)) * 1000
+            decode_ms = min(timeit.repeat(
+                lambda: decode(payload), number=1, repeat=repeat)) * 1000
+            print('%-30s %-7s %10.3f %10.3f %10d'
+                  % (name, codec, encode_ms, decode_ms, len(payload)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])